@@ -3,13 +3,18 @@ import pandas as pd
 import requests
 import geopandas as gpd
 from datetime import datetime, timedelta
-from bs4 import BeautifulSoup
 from PIL import Image
 from streamlit_folium import st_folium
 from obspy.geodetics import locations2degrees, degrees2kilometers
 import folium
+from monev.faults import fault_layer
+from monev.feeds import LIVE, load_feed
+from monev.geometry import warm_registry
+from monev.matching import best_match
+from monev.tiles import TILE_ATTR, folium_tiles
 
 st.set_page_config(page_title="EQ Analysis", layout="wide", page_icon="🌏")
+warm_registry()  # region shapefiles -> memory once per server process
 
 # --- Utility Functions ---
 def fetch_text_data(url, delimiter='|'):
@@ -17,15 +22,8 @@ def fetch_text_data(url, delimiter='|'):
     lines = response.text.strip().split('\n')
     return [line.split(delimiter) for line in lines if delimiter in line]
 
-def extract_xml_tag(soup, tag):
-    return [float(x.text) if tag == 'mag' else x.text for x in soup.find_all(tag)]
-
 def to_float(lst): return [float(x) for x in lst]
 
-def match_event(df, t_ref, time_column='date_time', tol_sec=60):
-    matched = df[df[time_column].apply(lambda t: abs((t_ref - t).total_seconds()) < tol_sec)]
-    return matched.iloc[0] if not matched.empty else None
-
 def geo_distance(x0, y0, x1, y1):
     return round(degrees2kilometers(locations2degrees(x0, y0, x1, y1)), 2)
 
@@ -50,20 +48,11 @@ usgs['depth'] = usgs.geometry.z
 usgs['mag'] = usgs['mag']
 
 # --- BMKG Data ---
-soup = BeautifulSoup(requests.get("https://bmkg-content-inatews.storage.googleapis.com/live30event.xml").text, 'html')
-bmkg_df = pd.DataFrame({
-    'eventid': extract_xml_tag(soup, 'eventid'),
-    'waktu': extract_xml_tag(soup, 'waktu'),
-    'lat': extract_xml_tag(soup, 'lintang'),
-    'lon': extract_xml_tag(soup, 'bujur'),
-    'mag': to_float(extract_xml_tag(soup, 'mag')),
-    'depth': extract_xml_tag(soup, 'dalam'),
-    'area': [x.split('\n')[9] for x in extract_xml_tag(soup, 'gempa')]
-})
-
-bmkg_df['waktu'] = pd.to_datetime(bmkg_df['waktu'])
+bmkg_df = load_feed(LIVE)
+if bmkg_df.empty:
+    st.error("⚠️ Gagal memuat feed live30event BMKG.")
+    st.stop()
 bmkg_df = bmkg_df[bmkg_df['mag'] >= 5]
-bmkg_df.columns = ['eventid', 'waktu', 'lat', 'lon', 'mag', 'depth', 'area']
 
 # --- Reference Event ---
 x0 = float(bmkg_df['lon'].iloc[0])
@@ -74,18 +63,16 @@ x0, y0, m0, d0 = map(float, bmkg_df.loc[bmkg_df.index[0], ['lon', 'lat', 'mag',
 #x0, y0, m0, d0 = map(float, [bmkg_df['lon'][0], bmkg_df['lat'][0], bmkg_df['mag'][0], bmkg_df['depth'][0]])
 t_ref = bmkg_df['waktu'].iloc[0]
 
-gfz_match = match_event(gfz_df, t_ref)  # uses default 'date_time'
-usgs_match = match_event(usgs, t_ref, time_column='time_usgs')  # specify USGS time column
+gfz_match = best_match(gfz_df, t_ref)  # uses default 'date_time'
+usgs_match = best_match(usgs, t_ref, time_column='time_usgs')  # specify USGS time column
 
 # ... [imports and existing code above remain unchanged] ...
 # --- Map Visualization ---
-tiles = "https://services.arcgisonline.com/arcgis/rest/services/Ocean/World_Ocean_Base/MapServer/tile/{z}/{y}/{x}"
-m = folium.Map((y0, x0), tiles=tiles, attr="ESRI", zoom_start=8)
+m = folium.Map((y0, x0), tiles=folium_tiles(), attr=TILE_ATTR, zoom_start=8)
 
-folium.GeoJson(
-    requests.get("https://bmkg-content-inatews.storage.googleapis.com/indo_faults_lines.geojson").json(),
-    style_function=lambda feature: {"color": "orange", "weight": 1}
-).add_to(m)
+faults = fault_layer(zoom=8)
+if faults is not None:
+    faults.add_to(m)
 
 def add_marker_with_label(lat, lon, label, color, text):
     # Main icon marker
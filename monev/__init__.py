@@ -0,0 +1,5 @@
+"""Shared data loaders and helpers for the EQ Monev Streamlit pages."""
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+CACHE_DIR = ROOT / "cache"
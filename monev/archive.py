@@ -0,0 +1,70 @@
+"""🗃️ Append-only Parquet archive of qc.txt snapshots.
+
+qc.txt only covers a rolling window, so every fresh download is merged
+into ``ARCHIVE_DIR/year=YYYY/month=MM/part.parquet`` (deduplicated on
+``event_id``, newest snapshot wins). Queries only open the partitions of
+the requested months and let Parquet row-group statistics skip the rest.
+"""
+import threading
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+
+from monev import CACHE_DIR
+
+ARCHIVE_DIR = CACHE_DIR / "qc_archive"
+ARCHIVE_ROW_GROUP = 2000  # rows per row group; rows are sorted by date_time
+
+_lock = threading.Lock()
+
+
+def _partition(year, month):
+    return ARCHIVE_DIR / f"year={year}" / f"month={month:02d}" / "part.parquet"
+
+
+def ingest(df):
+    """Merge a parsed qc.txt frame into the archive."""
+    df = df.dropna(subset=['date_time'])
+    keys = [df['date_time'].dt.year, df['date_time'].dt.month]
+    with _lock:
+        for (year, month), part in df.groupby(keys):
+            path = _partition(year, month)
+            if path.exists():
+                part = pd.concat([pd.read_parquet(path), part], ignore_index=True)
+            part = part.drop_duplicates('event_id', keep='last').sort_values('date_time')
+
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = path.with_suffix('.tmp')
+            pq.write_table(pa.Table.from_pandas(part, preserve_index=False), tmp,
+                           row_group_size=ARCHIVE_ROW_GROUP)
+            tmp.replace(path)
+
+
+def _between(name, low, high):
+    return (ds.field(name) >= low) & (ds.field(name) <= high)
+
+
+def query_archive(start, end, south=-90.0, north=90.0, west=-180.0, east=180.0,
+                  mmin=-10.0, mmax=10.0, columns=None):
+    """Archived events inside the time, bounding-box and magnitude window."""
+    start, end = pd.Timestamp(start), pd.Timestamp(end)
+    months = pd.period_range(start.to_period('M'), end.to_period('M'), freq='M')
+    paths = [str(p) for p in (_partition(m.year, m.month) for m in months) if p.exists()]
+    if not paths:
+        return pd.DataFrame(columns=columns)
+
+    dataset = ds.dataset(paths, format='parquet')
+    time_type = dataset.schema.field('date_time').type
+    where = (
+        _between('date_time', pa.scalar(start, type=time_type), pa.scalar(end, type=time_type))
+        & _between('fixedLat', south, north)
+        & _between('fixedLon', west, east)
+        & _between('mag', mmin, mmax)
+    )
+    df = dataset.to_table(columns=columns, filter=where).to_pandas()
+    if 'event_id' in df:
+        # an event whose origin time moved across a month boundary sits in two partitions
+        df = df.drop_duplicates('event_id', keep='last')
+    return df.reset_index(drop=True)
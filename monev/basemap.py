@@ -0,0 +1,164 @@
+"""🖼️ Cached static background for the island / PGR seismicity maps.
+
+The region outlines, borders and 10m coastlines of a map depend only on the
+layer, its colours, the extent and the projection, so they are rendered once
+into an RGBA raster of the axes area. The raster is kept in memory and under
+``BASEMAP_DIR`` (keyed by those inputs and the shapefile signature), and
+``base_map`` returns a fresh figure with the raster as its bottom image, so a
+rerun only draws the event scatter on top.
+
+Rendering points cartopy at ``NATURAL_EARTH_DIR`` (its
+``pre_existing_data_dir``). The shapefiles are not shipped with the repo;
+fill that directory once per deploy, on a machine with network access::
+
+    python -m monev.basemap fetch-ne
+
+Until then the maps fail with an error saying so, instead of cartopy
+quietly downloading the data on the first render.
+"""
+import argparse
+import hashlib
+import json
+import logging
+
+import cartopy
+import cartopy.crs as ccrs
+import cartopy.feature as cfeature
+import matplotlib.pyplot as plt
+import numpy as np
+import streamlit as st
+from matplotlib.colors import to_hex
+from PIL import Image
+
+from monev import CACHE_DIR, ROOT
+from monev.geometry import GEOMETRY_SETS, projected_geometries, source_signature
+
+BASEMAP_DIR = CACHE_DIR / "basemap"
+BASEMAP_VERSION = 1
+NATURAL_EARTH_DIR = ROOT / "natural_earth"
+NATURAL_EARTH = [('10m', 'physical', 'coastline')] + [
+    (res, 'cultural', 'admin_0_boundary_lines_land') for res in ('10m', '50m', '110m')]  # BORDERS scales with extent
+INDONESIA_EXTENT = (85, 145, -15, 10)
+
+log = logging.getLogger(__name__)
+
+
+def missing_natural_earth():
+    """Shapefiles of ``NATURAL_EARTH`` not (yet) in ``NATURAL_EARTH_DIR``, in cartopy's layout."""
+    return [path for path in (NATURAL_EARTH_DIR / 'shapefiles' / 'natural_earth' / category
+                              / f'ne_{resolution}_{name}.shp'
+                              for resolution, category, name in NATURAL_EARTH)
+            if not path.exists()]
+
+
+def use_offline_natural_earth():
+    """Point cartopy at the Natural Earth files in ``NATURAL_EARTH_DIR`` (also used by the focal maps).
+
+    Raises FileNotFoundError naming the missing shapefiles and the command that fetches them.
+    """
+    missing = missing_natural_earth()
+    if missing:
+        raise FileNotFoundError(
+            f"Data Natural Earth belum tersedia di {NATURAL_EARTH_DIR} "
+            f"({', '.join(path.name for path in missing)}); jalankan `python -m monev.basemap fetch-ne`")
+    cartopy.config['pre_existing_data_dir'] = NATURAL_EARTH_DIR
+
+
+def _figure(dpi, central_longitude, extent):
+    projection = ccrs.PlateCarree(central_longitude=central_longitude)
+    fig = plt.figure(dpi=dpi)
+    ax = fig.add_subplot(111, projection=projection)
+    ax.set_extent(extent)
+    return fig, ax, projection
+
+
+def _render(layer, colors, extent, central_longitude, dpi):
+    use_offline_natural_earth()
+    fig, ax, projection = _figure(dpi, central_longitude, extent)
+    geometries = projected_geometries(layer, central_longitude)
+    for region, color in zip(GEOMETRY_SETS[layer], colors):
+        if geometries.get(region):
+            ax.add_geometries(geometries[region], projection, facecolor="white", edgecolor=color, linewidth=0.5)
+    ax.add_feature(cfeature.BORDERS, linestyle='-', linewidth=0.5, alpha=0.5)
+    ax.coastlines(resolution='10m', color='black', linestyle='-', linewidth=0.5, alpha=0.5)
+    ax.spines['geo'].set_visible(False)
+
+    fig.canvas.draw()
+    x0, y0, x1, y1 = np.round(ax.get_window_extent().extents).astype(int)
+    height = int(fig.canvas.get_width_height()[1])
+    raster = np.asarray(fig.canvas.buffer_rgba())[height - y1:height - y0, x0:x1].copy()
+    plt.close(fig)
+    return raster
+
+
+@st.cache_resource(show_spinner=False)
+def base_layer(layer, colors, extent=INDONESIA_EXTENT, central_longitude=120.0, dpi=300):
+    """RGBA raster of the axes area: region outlines (edge ``colors``), borders and coastlines."""
+    key = json.dumps([BASEMAP_VERSION, cartopy.__version__, layer, list(colors), list(extent),
+                      central_longitude, dpi, source_signature(layer)])
+    path = BASEMAP_DIR / f"{layer}-{hashlib.sha1(key.encode()).hexdigest()[:16]}.png"
+    if path.exists():
+        try:
+            return np.asarray(Image.open(path).convert('RGBA'))
+        except OSError:
+            log.exception("Cache basemap %s rusak, render ulang", path.name)
+
+    raster = _render(layer, colors, extent, central_longitude, dpi)
+    try:
+        BASEMAP_DIR.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix('.tmp')
+        Image.fromarray(raster).save(tmp, format='PNG')
+        tmp.replace(path)
+    except OSError:
+        log.exception("Gagal menyimpan cache basemap %s", path.name)
+    return raster
+
+
+def base_map(layer, colors, extent=INDONESIA_EXTENT, central_longitude=120.0, dpi=300):
+    """(fig, ax) with the cached background of ``layer``; plot events in ``ax.projection``."""
+    colors = tuple(to_hex(c) for c in colors)
+    raster = base_layer(layer, colors, tuple(extent), central_longitude, dpi)
+    fig, ax, _ = _figure(dpi, central_longitude, extent)
+    bounds = ax.get_extent()
+    ax.imshow(raster, extent=bounds, origin='upper', interpolation='nearest', zorder=0)
+    ax.set_extent(bounds, crs=ax.projection)
+    return fig, ax
+
+
+def fetch_natural_earth():
+    """Download the Natural Earth shapefiles the maps use into ``NATURAL_EARTH_DIR``."""
+    from cartopy.io import shapereader
+
+    cartopy.config['data_dir'] = NATURAL_EARTH_DIR
+    return [shapereader.natural_earth(resolution=resolution, category=category, name=name)
+            for resolution, category, name in NATURAL_EARTH]
+
+
+def layer_colors(layer):
+    """Edge / marker colours of a layer's regions, as used by the seismicity maps."""
+    if layer == 'island':
+        return ['r', 'g', 'b', 'y', 'c', 'm', 'purple', 'orange']
+    return list(plt.get_cmap('tab10', len(GEOMETRY_SETS[layer])).colors)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m monev.basemap', description=__doc__.splitlines()[0])
+    sub = parser.add_subparsers(dest='command', required=True)
+    sub.add_parser('fetch-ne', help='download the Natural Earth coastlines and borders')
+    sub.add_parser('warm', help='render every layer background into the cache')
+    args = parser.parse_args(argv)
+
+    if args.command == 'fetch-ne':
+        try:
+            for path in fetch_natural_earth():
+                print(path)
+        except OSError as exc:  # URLError is an OSError
+            parser.exit(1, f"Gagal mengunduh data Natural Earth: {exc}\n")
+    else:
+        for layer in ('island', 'pgr', 'pgr_lama'):
+            base_layer(layer, tuple(to_hex(c) for c in layer_colors(layer)))
+            print(f"basemap {layer} siap")
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
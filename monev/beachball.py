@@ -0,0 +1,302 @@
+"""🏐 Batched focal-mechanism beachballs for cartopy maps.
+
+obspy's ``beach()`` builds one PatchCollection per event. Here the
+compressional and dilatational quadrants of each mechanism (rounded to whole
+degrees) are computed once from the nodal-plane geometry, in NumPy, as
+unit-radius paths on a lower-hemisphere equal-area projection and cached; a
+whole catalog is then placed with one vectorized scale + offset of all
+vertices and drawn as one dilatational and one compressional PatchCollection.
+
+``beachball_pngs`` serves the small PNGs of the report table. Images are
+content-addressed by (strike, dip, rake, colour, size): hits come from a
+bounded in-memory LRU, then from ``IMAGE_DIR``; misses are rendered in a
+process pool and returned as bytes, so no per-request files are written.
+"""
+import hashlib
+import logging
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from multiprocessing import get_context
+
+import numpy as np
+from matplotlib.collections import PatchCollection
+from matplotlib.colors import to_hex
+from matplotlib.figure import Figure
+from matplotlib.patches import PathPatch
+from matplotlib.path import Path
+from obspy.imaging.beachball import beachball
+
+from monev import CACHE_DIR
+
+UNIT_CACHE_SIZE = 8192
+ARC_POINTS = 48  # vertices per nodal-plane segment or rim arc of a quadrant
+IMAGE_DIR = CACHE_DIR / "beachball"
+IMAGE_VERSION = 1
+MEMORY_BYTES = 32 * 1024 ** 2
+DISK_BYTES = 256 * 1024 ** 2
+POOL_WORKERS = min(4, os.cpu_count() or 1)
+INLINE_MISSES = 4  # fewer misses than this are rendered in-process
+
+log = logging.getLogger(__name__)
+_lock = threading.Lock()
+_memory = OrderedDict()
+_memory_bytes = 0
+_pool = None
+
+
+def _fault_vectors(strike, dip, rake):
+    """Unit fault normal (pointing into the hanging wall) and slip vector, (north, east, down)."""
+    s, d, r = np.radians([strike, dip, rake])
+    normal = np.array([-np.sin(d) * np.sin(s), np.sin(d) * np.cos(s), -np.cos(d)])
+    slip = np.array([np.cos(r) * np.cos(s) + np.cos(d) * np.sin(r) * np.sin(s),
+                     np.cos(r) * np.sin(s) - np.cos(d) * np.sin(r) * np.cos(s),
+                     -np.sin(r) * np.sin(d)])
+    return normal, slip
+
+
+def _project(rays):
+    """(east, north) on the unit disc of lower-hemisphere unit vectors (equal-area)."""
+    rays = np.atleast_2d(rays)
+    return rays[:, [1, 0]] / np.sqrt(1 + rays[:, 2:3])
+
+
+def _plane_basis(normal):
+    """Orthonormal (rim, down-dip) vectors spanning the (non-horizontal) plane of ``normal``."""
+    rim = np.cross(normal, [0.0, 0.0, 1.0])
+    rim /= np.linalg.norm(rim)
+    dip = np.cross(normal, rim)
+    dip /= np.linalg.norm(dip)
+    return rim, dip if dip[2] >= 0 else -dip
+
+
+def _closed(parts):
+    verts = np.concatenate(parts + [parts[0][:1]])
+    codes = np.full(len(verts), Path.LINETO, dtype=Path.code_type)
+    codes[0], codes[-1] = Path.MOVETO, Path.CLOSEPOLY
+    return verts, codes
+
+
+@lru_cache(maxsize=UNIT_CACHE_SIZE)
+def unit_shape(strike, dip, rake):
+    """Compressional and dilatational quadrants of a unit-radius beachball at the origin.
+
+    Returns ((vertices, codes) compressional, (vertices, codes) dilatational),
+    each one compound path of two quadrants; x is east and y north.
+    """
+    normal, slip = _fault_vectors(strike, dip, rake)
+    if abs(np.cross(normal, slip)[2]) < 1e-6:
+        # horizontal null axis (pure dip-slip or a horizontal plane): rim ends of both planes
+        # coincide, so nudge the mechanism by an invisible amount to order them like its neighbours
+        normal, slip = _fault_vectors(strike, dip + (0.05 if dip < 45 else -0.05), rake + 0.05)
+    null = np.cross(normal, slip)
+    null /= np.linalg.norm(null)
+    null = null if null[2] >= 0 else -null
+    t = np.linspace(0.0, 1.0, ARC_POINTS)
+
+    # rim ends (alpha = 0 / pi) of both nodal planes and where each trace meets the null axis
+    ends = []
+    for plane in (normal, slip):
+        rim, down = _plane_basis(plane)
+        cross = np.clip(np.arctan2(null @ down, null @ rim), 0.0, np.pi)
+        for end in (0.0, np.pi):
+            alpha = end + (cross - end) * t  # rim end -> null axis
+            trace = _project(np.cos(alpha)[:, None] * rim + np.sin(alpha)[:, None] * down)
+            ends.append((np.arctan2(*trace[0]) % (2 * np.pi), trace))
+    ends.sort(key=lambda e: e[0])
+
+    # quadrant between consecutive rim ends: rim arc, in along the next trace, out along this one
+    quadrants = []
+    for i, (start, trace) in enumerate(ends):
+        stop, next_trace = ends[(i + 1) % 4]
+        arc = (stop - start + 1e-9) % (2 * np.pi) - 1e-9  # coinciding ends span nothing, not a full turn
+        azimuth = start + arc * t
+        quadrants.append(_closed([np.column_stack([np.sin(azimuth), np.cos(azimuth)]), next_trace, trace[::-1]]))
+
+    # the quadrant around the T axis is compressional; polarity flips across every nodal plane
+    tension = normal + slip
+    tension = tension if tension[2] >= 0 else -tension
+    tension = tension / np.linalg.norm(tension) + [0.0, 0.0, 0.05]  # nudged off the rim
+    inside = _project(tension / np.linalg.norm(tension))[0]
+    found = next((i for i, (v, c) in enumerate(quadrants) if Path(v, c).contains_point(inside)), 0)
+    sets = ([], [])  # compressional, dilatational
+    for i, quadrant in enumerate(quadrants):
+        sets[(i - found) % 2].append(quadrant)
+    return tuple(
+        (np.concatenate([v for v, _ in paths]), np.concatenate([c for _, c in paths])) for paths in sets
+    )
+
+
+def beach_collections(strike, dip, rake, x, y, width, facecolor, bgcolor='w',
+                      linewidth=0.5, edgecolor='k', alpha=0.625, zorder=10):
+    """Two PatchCollections (dilatational, compressional) drawing a beachball per event.
+
+    ``x``/``y`` are centres and ``width`` the diameter, both in axes data
+    units; ``facecolor`` (compressional quadrants) is one colour or one per
+    event, ``bgcolor`` fills the dilatational quadrants. Events with a
+    missing nodal plane are skipped.
+    """
+    strike, dip, rake, x, y = (np.asarray(a, dtype=float) for a in (strike, dip, rake, x, y))
+    facecolor = np.broadcast_to(np.asarray(facecolor, dtype=object), strike.shape)
+    ok = np.isfinite(strike) & np.isfinite(dip) & np.isfinite(rake) & np.isfinite(x) & np.isfinite(y)
+    if not ok.any():
+        return []
+    keys = np.rint(np.column_stack([strike[ok], dip[ok], rake[ok]])).astype(int)
+    shapes = [unit_shape(*key) for key in map(tuple, keys)]
+    centres = np.column_stack([x[ok], y[ok]])
+
+    collections = []
+    for polarity, fill in ((1, [bgcolor] * len(shapes)), (0, list(facecolor[ok]))):
+        unit, codes = zip(*(shape[polarity] for shape in shapes))
+        counts = [len(v) for v in unit]
+        # one vectorized scale + offset for every vertex of the layer
+        verts = np.concatenate(unit) * (width / 2.0)
+        verts += np.repeat(centres, counts, axis=0)
+        parts = np.split(verts, np.cumsum(counts)[:-1])
+        col = PatchCollection([PathPatch(Path(v, c)) for v, c in zip(parts, codes)])
+        col.set_facecolors(fill)
+        col.set_edgecolor(edgecolor)
+        col.set_linewidth(linewidth)
+        col.set_alpha(alpha)
+        col.set_zorder(zorder + len(collections) * 0.01)
+        collections.append(col)
+    return collections
+
+
+def add_beachballs(ax, lon, lat, strike, dip, rake, width, facecolor, data_crs=None, **kwargs):
+    """Project all centres in one call and add the batched beachballs to a cartopy ``ax``."""
+    import cartopy.crs as ccrs
+
+    xyz = ax.projection.transform_points(data_crs or ccrs.PlateCarree(),
+                                         np.asarray(lon, dtype=float), np.asarray(lat, dtype=float))
+    for col in beach_collections(strike, dip, rake, xyz[:, 0], xyz[:, 1], width, facecolor, **kwargs):
+        ax.add_collection(col)
+
+
+def render_png(strike, dip, rake, color, size):
+    """PNG bytes of one ``size`` x ``size`` px beachball (also the pool worker)."""
+    fig = Figure(figsize=(size / 100, size / 100), dpi=100)
+    fig.subplots_adjust(left=0, bottom=0, right=1, top=1)
+    return beachball([strike, dip, rake], facecolor=color, linewidth=1, fig=fig, format='png')
+
+
+def _key(strike, dip, rake, color, size):
+    """(content key, normalized render arguments) of one image."""
+    args = (round(float(strike), 1) % 360, round(float(dip), 1), round(float(rake), 1),
+            to_hex(color), int(size))
+    return hashlib.sha1(repr((IMAGE_VERSION,) + args).encode()).hexdigest(), args
+
+
+def _remember(key, png):
+    global _memory_bytes
+    with _lock:
+        if key in _memory:
+            _memory.move_to_end(key)
+            return
+        _memory[key] = png
+        _memory_bytes += len(png)
+        while _memory_bytes > MEMORY_BYTES and len(_memory) > 1:
+            _memory_bytes -= len(_memory.popitem(last=False)[1])
+
+
+def _recall(key):
+    with _lock:
+        png = _memory.get(key)
+        if png is not None:
+            _memory.move_to_end(key)
+            return png
+    path = IMAGE_DIR / f"{key}.png"
+    try:
+        png = path.read_bytes()
+    except OSError:
+        return None
+    os.utime(path)  # mtime doubles as last use for pruning
+    _remember(key, png)
+    return png
+
+
+def _store(key, png):
+    _remember(key, png)
+    try:
+        IMAGE_DIR.mkdir(parents=True, exist_ok=True)
+        tmp = IMAGE_DIR / f"{key}.{os.getpid()}.{threading.get_ident()}.tmp"
+        tmp.write_bytes(png)
+        tmp.replace(IMAGE_DIR / f"{key}.png")
+    except OSError:
+        log.exception("Gagal menyimpan gambar beachball %s", key)
+
+
+def _prune_disk():
+    """Drop the least recently used files once ``IMAGE_DIR`` exceeds ``DISK_BYTES``."""
+    try:
+        files = [(e.stat().st_mtime, e.stat().st_size, e.path)
+                 for e in os.scandir(IMAGE_DIR) if e.name.endswith('.png')]
+    except OSError:
+        return
+    total = sum(size for _, size, _ in files)
+    for _, size, path in sorted(files):
+        if total <= DISK_BYTES:
+            break
+        try:
+            os.remove(path)
+        except OSError:
+            continue
+        total -= size
+
+
+def _executor():
+    global _pool
+    with _lock:
+        if _pool is None:
+            # spawn: forking the multi-threaded Streamlit server is not safe
+            _pool = ProcessPoolExecutor(POOL_WORKERS, mp_context=get_context('spawn'))
+        return _pool
+
+
+def _render_all(jobs):
+    """{key: png} for ``jobs`` ({key: args}), in the pool when worth it."""
+    if POOL_WORKERS > 1 and len(jobs) >= INLINE_MISSES:
+        try:
+            keys = list(jobs)
+            pngs = _executor().map(render_png, *zip(*jobs.values()), chunksize=8)
+            return dict(zip(keys, pngs))
+        except Exception:
+            log.exception("Pool render beachball gagal, render di proses utama")
+    return {key: render_png(*args) for key, args in jobs.items()}
+
+
+def beachball_pngs(strike, dip, rake, color, size=100):
+    """PNG bytes per event (None where a nodal plane is missing).
+
+    ``color`` is one colour or one per event; ``size`` is the edge in pixels.
+    """
+    strike, dip, rake = (np.asarray(a, dtype=float) for a in (strike, dip, rake))
+    color = np.broadcast_to(np.asarray(color, dtype=object), strike.shape)
+    keys, jobs, found = [], {}, {}
+    for s, d, r, c in zip(strike, dip, rake, color):
+        if not (np.isfinite(s) and np.isfinite(d) and np.isfinite(r)):
+            keys.append(None)
+            continue
+        key, args = _key(s, d, r, c, size)
+        keys.append(key)
+        if key in found or key in jobs:
+            continue
+        png = _recall(key)
+        if png is None:
+            jobs[key] = args
+        else:
+            found[key] = png
+
+    if jobs:
+        for key, png in _render_all(jobs).items():
+            _store(key, png)
+            found[key] = png
+        _prune_disk()
+    return [found.get(key) if key else None for key in keys]
+
+
+def beachball_png(strike, dip, rake, color='r', size=100):
+    """PNG bytes of a single beachball (None when the nodal plane is incomplete)."""
+    return beachball_pngs([strike], [dip], [rake], color, size)[0]
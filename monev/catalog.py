@@ -0,0 +1,95 @@
+"""🔎 Shared loader for the BMKG QC catalog (qc.txt).
+
+qc.txt is downloaded and parsed at most once per ``QC_TTL`` seconds for the
+whole Streamlit server process; every page and session reuses that frame.
+"""
+import logging
+
+import pandas as pd
+import requests
+import streamlit as st
+from bs4 import BeautifulSoup
+
+from monev.archive import ingest, query_archive
+from monev.coords import coords
+
+QC_URL = "http://202.90.198.41/qc.txt"
+QC_TTL = 300  # seconds between two downloads of qc.txt
+QC_COLUMNS = ['event_id', 'date_time', 'mode', 'status', 'phase', 'mag', 'type_mag',
+              'n_mag', 'azimuth', 'rms', 'lat', 'lon', 'depth', 'type_event', 'remarks']
+
+
+def split_qc(text):
+    """Split raw qc.txt (plain, or wrapped in an HTML <p>) into rows of fields."""
+    text = text.strip()
+    if "|" not in text:
+        soup = BeautifulSoup(text, 'html.parser')
+        text = soup.p.text if soup.p and soup.p.text else ""
+    return [line.split('|') for line in text.split('\n') if line]
+
+
+def parse_qc(text):
+    """Parse qc.txt into a typed catalog DataFrame."""
+    rows = split_qc(text)[1:-2]  # drop header and the two footer lines
+    if not rows:
+        raise ValueError("qc.txt contains no catalog rows")
+
+    df = pd.DataFrame(rows).reindex(columns=range(len(QC_COLUMNS)))
+    df.columns = QC_COLUMNS
+    df['event_id'] = df['event_id'].str.strip()
+    df['fixedLat'] = coords(df['lat'], axis='lat')
+    df['fixedLon'] = coords(df['lon'], axis='lon')
+    df['fixedDepth'] = pd.to_numeric(df['depth'].str.replace('km', ''), errors='coerce')
+    df['mag'] = pd.to_numeric(df['mag'], errors='coerce')
+    df['sizemag'] = df['mag'] * 1000
+    df['date_time'] = pd.to_datetime(df['date_time'], errors='coerce')
+    return df
+
+
+@st.cache_resource(ttl=QC_TTL, show_spinner=False)
+def _qc_frame(url):
+    response = requests.get(url, timeout=30)
+    response.raise_for_status()
+    df = parse_qc(response.text)
+    try:
+        ingest(df)
+    except Exception:  # the live catalog still works without the archive
+        logging.getLogger(__name__).exception("qc.txt archive ingest failed")
+    return df
+
+
+def load_qc(url=QC_URL):
+    """Return the qc.txt catalog, or an empty DataFrame if it can't be fetched.
+
+    The parsed frame is shared by every session, so callers get a shallow
+    copy: filter it and add columns freely, but never modify values in place.
+    Failed downloads are not cached and are retried on the next call.
+    """
+    try:
+        return _qc_frame(url).copy(deep=False)
+    except Exception:
+        return pd.DataFrame()
+
+
+def query_qc(start, end, south=-90.0, north=90.0, west=-180.0, east=180.0, mmin=-10.0, mmax=10.0):
+    """Catalog events inside a time, bounding-box and magnitude window (inclusive).
+
+    Reads the local year/month archive, which reaches back further than the
+    rolling qc.txt window; falls back to filtering the live frame in memory.
+    Returns None when neither source is available.
+    """
+    live = load_qc()  # refreshes qc.txt, and with it the archive, once per QC_TTL
+    try:
+        df = query_archive(start, end, south, north, west, east, mmin, mmax)
+    except Exception:
+        df = pd.DataFrame()
+    if not df.empty:
+        return df
+    if live.empty:
+        return None
+    return live[
+        live['date_time'].between(start, end) &
+        live['fixedLat'].between(south, north) &
+        live['fixedLon'].between(west, east) &
+        live['mag'].between(mmin, mmax)
+    ]
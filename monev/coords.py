@@ -0,0 +1,68 @@
+"""🧭 Vectorized parsing of BMKG coordinate strings into signed decimal degrees.
+
+Handles every encoding used by the feeds and uploads: N/S/E/W suffixes
+(``3.45 S``), Indonesian LU/LS/BT/BB (``3.45 LS``, ``128.1 BT``), a separate
+direction column next to a bare number, comma decimals (``3,45``) and plain
+signed numbers. A hemisphere letter sets the sign of the absolute value;
+without one the number keeps its own sign.
+"""
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+
+NEGATIVE = ['S', 'W', 'LS', 'BB']
+POSITIVE = ['N', 'E', 'LU', 'BT']
+AXIS_DIRECTIONS = {'lat': {'N', 'S', 'LU', 'LS'}, 'lon': {'E', 'W', 'BT', 'BB'}}
+AXIS_LIMIT = {'lat': 90.0, 'lon': 180.0}
+TEXT = pd.ArrowDtype(pa.string())  # str.extract runs in pyarrow compute, ~5x faster
+
+_COORD = (r'^(?P<num>[-+]?\s*(?:\d+(?:[.,]\d*)?|[.,]\d+))\s*°?\s*'
+          r'(?P<dir>LS|LU|BT|BB|[NSEW])?$')
+
+
+def parse_coords(values, direction=None, axis=None):
+    """Return (float64 array of signed degrees, number of malformed values).
+
+    ``direction`` is an optional same-length sequence of hemisphere codes
+    (the Excel layout); it takes precedence over a suffix on the value.
+    With ``axis`` ('lat' / 'lon') a direction of the wrong axis or a value
+    beyond ±90 / ±180 counts as malformed. Malformed values become NaN;
+    missing / blank values become NaN without being counted.
+    """
+    values = pd.Series(values).reset_index(drop=True)
+    if pd.api.types.is_numeric_dtype(values):
+        num = values.to_numpy(dtype=float)
+        present = ~np.isnan(num)
+        code = pd.Series('', index=values.index)
+        bad = np.zeros(len(values), dtype=bool)
+    else:
+        text = values.astype(TEXT).str.strip().str.upper()
+        present = (text.notna() & (text != '')).to_numpy()
+        parts = text.str.extract(_COORD)
+        num = (parts['num'].str.replace(r'\s', '', regex=True).str.replace(',', '.')
+               .astype(float).to_numpy(dtype=float, na_value=np.nan))
+        code = parts['dir'].fillna('')
+        bad = present & np.isnan(num)
+
+    if direction is not None:
+        given = pd.Series(direction).reset_index(drop=True).astype(TEXT).str.strip().str.upper()
+        given = given.where(given.isin(NEGATIVE + POSITIVE))
+        code = given.fillna(code)
+        unknown = pd.Series(direction).reset_index(drop=True).notna() & given.isna()
+        bad |= present & unknown.to_numpy()
+
+    code = code.fillna('').to_numpy(dtype=object, na_value='')
+    signed = np.where(np.isin(code, NEGATIVE), -np.abs(num),
+                      np.where(np.isin(code, POSITIVE), np.abs(num), num))
+
+    if axis is not None:
+        wrong_axis = (code != '') & ~np.isin(code, list(AXIS_DIRECTIONS[axis]))
+        bad |= present & (wrong_axis | (np.abs(signed) > AXIS_LIMIT[axis]))
+
+    signed[bad] = np.nan
+    return signed, int(bad.sum())
+
+
+def coords(values, direction=None, axis=None):
+    """Signed degrees only (malformed values as NaN), for column assignment."""
+    return parse_coords(values, direction, axis)[0]
@@ -0,0 +1,121 @@
+"""🪨 Cached, multi-resolution Indonesian fault-line overlay for the folium maps.
+
+The InaTEWS fault GeoJSON is mirrored to ``FAULTS_DIR`` and revalidated
+(ETag / If-Modified-Since) at most every ``FAULTS_REVALIDATE`` seconds. For
+every entry of ``FAULT_LEVELS`` a Douglas–Peucker simplified copy is
+precomputed and stored next to it, and each map embeds the coarsest copy
+that still looks right at its zoom instead of the full-resolution lines.
+"""
+import json
+import logging
+import os
+import threading
+import time
+
+import folium
+import numpy as np
+import shapely
+import streamlit as st
+
+from monev import CACHE_DIR
+from monev.mirror import fetch_conditional
+
+FAULTS_URL = "https://bmkg-content-inatews.storage.googleapis.com/indo_faults_lines.geojson"
+FAULTS_DIR = CACHE_DIR / "faults"
+FAULTS_FILE = FAULTS_DIR / "indo_faults_lines.geojson"
+FAULTS_REVALIDATE = 24 * 3600
+FAULTS_RETRY = 300  # seconds before a failed load is tried again
+FAULTS_SCHEMA = 1
+# minimum map zoom -> (Douglas-Peucker tolerance in degrees, coordinate decimals);
+# the tolerance is about one pixel two zoom levels deeper, so zooming in a bit stays smooth
+FAULT_LEVELS = {0: (0.02, 3), 5: (0.005, 4), 8: (0.0008, 4), 11: (0.0, 6)}
+FAULT_STYLE = {"color": "orange", "weight": 1}
+
+log = logging.getLogger(__name__)
+_lock = threading.Lock()
+_failed_at = None  # time of the last failed load, to not retry it on every rerun
+
+
+def sync_faults():
+    """Path of the local fault GeoJSON, revalidated upstream when stale (None if never fetched)."""
+    with _lock:
+        fresh = FAULTS_FILE.exists() and time.time() - FAULTS_FILE.stat().st_mtime < FAULTS_REVALIDATE
+        if not fresh:
+            try:
+                if not fetch_conditional(FAULTS_URL, FAULTS_FILE, timeout=20):
+                    os.utime(FAULTS_FILE)  # 304: restart the revalidation clock
+            except Exception:
+                log.exception("Gagal memperbarui data sesar, memakai salinan lokal")
+    return FAULTS_FILE if FAULTS_FILE.exists() else None
+
+
+def _level_path(zoom, source):
+    stat = source.stat()
+    return FAULTS_DIR / f"faults.z{zoom}.v{FAULTS_SCHEMA}.{stat.st_size}-{stat.st_mtime_ns}.json"
+
+
+def simplify_collection(collection, tolerance, decimals):
+    """Lines of a FeatureCollection simplified with Douglas–Peucker, properties dropped."""
+    geoms = np.array([shapely.geometry.shape(f['geometry']) if f.get('geometry') else None
+                      for f in collection.get('features', [])], dtype=object)
+    geoms = geoms[~shapely.is_missing(geoms)]
+    if tolerance:
+        geoms = shapely.simplify(geoms, tolerance, preserve_topology=False)
+    geoms = shapely.set_precision(geoms, 10.0 ** -decimals)
+    geoms = geoms[~shapely.is_empty(geoms)]
+    return {
+        'type': 'FeatureCollection',
+        'features': [{'type': 'Feature', 'properties': {}, 'geometry': shapely.geometry.mapping(g)}
+                     for g in geoms],
+    }
+
+
+def _build_levels(source):
+    collection = json.loads(source.read_text(encoding='utf-8'))
+    for zoom, (tolerance, decimals) in FAULT_LEVELS.items():
+        path = _level_path(zoom, source)
+        if path.exists():
+            continue
+        for old in FAULTS_DIR.glob(f"faults.z{zoom}.v*.json"):
+            old.unlink(missing_ok=True)
+        text = json.dumps(simplify_collection(collection, tolerance, decimals), separators=(',', ':'))
+        tmp = path.with_suffix('.tmp')
+        tmp.write_text(text, encoding='utf-8')
+        tmp.replace(path)
+
+
+@st.cache_resource(ttl=FAULTS_REVALIDATE, show_spinner=False)
+def fault_levels():
+    """{min zoom: GeoJSON text} of every simplification level.
+
+    Raises when the data is unavailable, so a failure is not cached for the TTL.
+    """
+    source = sync_faults()
+    if source is None:
+        raise FileNotFoundError(f"data sesar belum pernah terunduh dari {FAULTS_URL}")
+    _build_levels(source)
+    return {zoom: _level_path(zoom, source).read_text(encoding='utf-8') for zoom in FAULT_LEVELS}
+
+
+def fault_geojson(zoom):
+    """GeoJSON text of the coarsest level suited to ``zoom`` (None when unavailable)."""
+    global _failed_at
+    if _failed_at is not None and time.time() - _failed_at < FAULTS_RETRY:
+        return None
+    try:
+        levels = fault_levels()
+    except Exception:
+        log.exception("Gagal menyiapkan data sesar, dicoba lagi dalam %d detik", FAULTS_RETRY)
+        _failed_at = time.time()
+        return None
+    _failed_at = None
+    usable = [z for z in levels if z <= zoom] or [min(levels)]
+    return levels[max(usable)]
+
+
+def fault_layer(zoom, name="Fault Lines", **kwargs):
+    """``folium.GeoJson`` of the fault lines for a map opened at ``zoom`` (None when unavailable)."""
+    data = fault_geojson(zoom)
+    if data is None:
+        return None
+    return folium.GeoJson(data, name=name, style_function=lambda feature: FAULT_STYLE, **kwargs)
@@ -0,0 +1,102 @@
+"""📰 Client for the InaTEWS XML event feeds (live30event, last30event, last30feltevent).
+
+Each feed is downloaded once per ``FEED_TTL`` and shared by every page. The
+XML is streamed through lxml ``iterparse`` one ``<gempa>`` element at a time,
+so every record keeps its own fields together (no zipping of independent
+tag lists), and the records are turned into a typed DataFrame.
+"""
+import io
+import logging
+
+import pandas as pd
+import requests
+import streamlit as st
+from lxml import etree
+
+from monev.coords import coords
+from monev.timeparse import WIB, combine_date_time, parse_times
+
+FEED_URL = "https://bmkg-content-inatews.storage.googleapis.com/{}.xml"
+FEED_TTL = 60
+LIVE, LAST, FELT = 'live30event', 'last30event', 'last30feltevent'
+LIVE_AREA_CHILD = 8  # live30event carries the region as the 9th child of <gempa>
+
+log = logging.getLogger(__name__)
+
+
+def _local(tag):
+    return etree.QName(tag).localname.lower() if isinstance(tag, str) else ''
+
+
+def parse_feed(content):
+    """Records (one dict of child tag -> text per ``<gempa>``) from feed XML bytes."""
+    records = []
+    for _, elem in etree.iterparse(io.BytesIO(content), events=('end',), recover=True):
+        if _local(elem.tag) != 'gempa':
+            continue
+        children = [child for child in elem if isinstance(child.tag, str)]
+        record = {_local(child.tag): (child.text or '').strip() for child in children}
+        record['_children'] = [(child.text or '').strip() for child in children]
+        records.append(record)
+        elem.clear()
+        while elem.getprevious() is not None:
+            del elem.getparent()[0]
+    return records
+
+
+def _number(values):
+    return pd.to_numeric(values.str.replace(r'[^\d.,+-]', '', regex=True).str.replace(',', '.'),
+                         errors='coerce').astype(float)
+
+
+def typed_feed(name, records):
+    """Typed DataFrame for ``records`` of feed ``name``; times are tz-aware WIB.
+
+    ``waktu`` of the live feed is written in UTC (it is matched against the
+    GFZ / USGS origin times), so it is read as UTC and converted to WIB.
+    """
+    raw = pd.DataFrame(records)
+    if raw.empty:
+        return raw
+    if name == LIVE:
+        if 'area' not in raw:
+            raw['area'] = [c[LIVE_AREA_CHILD] if len(c) > LIVE_AREA_CHILD else None for c in raw['_children']]
+        df = pd.DataFrame({
+            'eventid': raw['eventid'],
+            'waktu': parse_times(raw['waktu'], default_tz='UTC', tz=WIB),
+            'lat': coords(raw['lintang'], axis='lat'),
+            'lon': coords(raw['bujur'], axis='lon'),
+            'mag': _number(raw['mag']),
+            'depth': _number(raw['dalam']),
+            'area': raw['area'],
+        })
+        return df
+
+    df = pd.DataFrame({
+        'datetime': combine_date_time(raw['date'], raw['time'], tz=WIB),
+        'timesent': parse_times(raw['timesent'], tz=WIB),
+        'lat': coords(raw['latitude'], axis='lat'),
+        'lon': coords(raw['longitude'], axis='lon'),
+        'mag': _number(raw['magnitude']),
+        'depth': _number(raw['depth']),
+        'area': raw.get('area'),
+        'date': raw['date'],
+        'time': raw['time'],
+        'latitude': raw['latitude'],
+        'longitude': raw['longitude'],
+    })
+    if 'felt' in raw:
+        df['felt'] = raw['felt']
+    return df
+
+
+@st.cache_data(ttl=FEED_TTL, show_spinner=False)
+def load_feed(name):
+    """Typed DataFrame of feed ``name``, or an empty DataFrame when it cannot be fetched."""
+    try:
+        response = requests.get(FEED_URL.format(name), timeout=30)
+        response.raise_for_status()
+        return typed_feed(name, parse_feed(response.content))
+    except Exception:
+        log.exception("Gagal memuat feed %s", name)
+        return pd.DataFrame()
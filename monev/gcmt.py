@@ -0,0 +1,79 @@
+"""🌎 Local mirror of the Global CMT NDK catalog.
+
+Each NDK file is downloaded once into ``GCMT_DIR`` and its parsed events
+are stored next to it as Parquet. Only monthly files younger than
+``GCMT_RECENT_MONTHS`` are revalidated (ETag / If-Modified-Since); older
+months and the bulk files never change upstream.
+"""
+import datetime
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+import streamlit as st
+
+from monev import CACHE_DIR
+from monev.mirror import fetch_conditional
+from monev.ndk import parse_ndk
+
+GCMT_URL = "https://www.ldeo.columbia.edu/~gcmt/projects/CMT/catalog"
+GCMT_DIR = CACHE_DIR / "gcmt"
+GCMT_BULK = [
+    "jan76_dec20.ndk",
+    "PRE1976/deep_1962-1976.ndk",
+    "PRE1976/intdep_1962-1975.ndk",
+]
+GCMT_RECENT_MONTHS = 3  # monthly files this young are revalidated upstream
+GCMT_SCHEMA = 2         # bump whenever parse_ndk output changes
+GCMT_WORKERS = 4
+
+MONTHS = ["jan", "feb", "mar", "apr", "may", "jun",
+          "jul", "aug", "sep", "oct", "nov", "dec"]
+
+
+def monthly_files(start, end):
+    """Relative paths of the NEW_MONTHLY files from ``start`` to ``end``."""
+    return [f"NEW_MONTHLY/{p.year}/{MONTHS[p.month - 1]}{p.year % 100:02d}.ndk"
+            for p in pd.period_range(start, end, freq="M")]
+
+
+def _is_recent(relpath, today):
+    if not relpath.startswith("NEW_MONTHLY/"):
+        return False
+    year = int(relpath.split("/")[1])
+    month = MONTHS.index(relpath.rsplit("/", 1)[1][:3]) + 1
+    return (today.year - year) * 12 + today.month - month < GCMT_RECENT_MONTHS
+
+
+def sync_file(relpath, today=None):
+    """Make sure ``relpath`` is mirrored and parsed; return its Parquet path."""
+    today = today or datetime.date.today()
+    local = GCMT_DIR / relpath
+    parquet = local.with_name(f"{local.stem}.v{GCMT_SCHEMA}.parquet")
+
+    changed = False
+    if not local.exists() or _is_recent(relpath, today):
+        changed = fetch_conditional(f"{GCMT_URL}/{relpath}", local)
+    if changed or not parquet.exists():
+        parse_ndk(local.read_text(encoding="ascii", errors="replace")).to_parquet(parquet, index=False)
+    return parquet
+
+
+def _try_sync(relpath):
+    try:
+        return sync_file(relpath)
+    except Exception:
+        # not published yet (future month) or upstream unreachable
+        local = GCMT_DIR / relpath
+        parquet = local.with_name(f"{local.stem}.v{GCMT_SCHEMA}.parquet")
+        return parquet if parquet.exists() else None
+
+
+@st.cache_data(ttl=3600, show_spinner="Memuat katalog Global CMT...")
+def load_gcmt(start=datetime.datetime(2021, 1, 1), end=datetime.datetime(2025, 11, 1)):
+    """GCMT events from the bulk files plus the monthly files ``start``–``end``."""
+    files = monthly_files(start, end) + GCMT_BULK
+    with ThreadPoolExecutor(max_workers=GCMT_WORKERS) as pool:
+        paths = [p for p in pool.map(_try_sync, files) if p is not None]
+    if not paths:
+        return parse_ndk("")
+    return pd.concat([pd.read_parquet(p) for p in paths], ignore_index=True)
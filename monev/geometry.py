@@ -0,0 +1,143 @@
+"""📐 Process-wide registry of region geometries (islands, PGR, legacy pgr, provinces).
+
+Each set is read from its shapefiles once per process, reprojected to
+EPSG:4326, repaired with ``make_valid`` and kept in memory together with
+copies pre-projected for the cartopy maps. The repaired geometries are also
+written as WKB to ``GEOMETRY_DIR`` so a cold start skips fiona entirely; the
+cache is keyed by the size and mtime of the source files.
+"""
+import json
+import logging
+import threading
+
+import geopandas as gpd
+import numpy as np
+import pyarrow as pa
+import pyarrow.parquet as pq
+import shapely
+import streamlit as st
+
+from monev import CACHE_DIR, ROOT
+
+GEOMETRY_DIR = CACHE_DIR / "geometry"
+GEOMETRY_SCHEMA = 1
+
+ISLANDS = ['Sumatra', 'Jawa', 'Bali-A', 'Nustra', 'Kalimantan', 'Sulawesi', 'Maluku', 'Papua']
+
+GEOMETRY_SETS = {
+    'island': {name: ROOT / f"{name}_Area.shp" for name in ISLANDS},
+    'pgr': {f"PGR{i}": ROOT / "pages" / "fileSHP" / f"PGR{i}.shp" for i in range(1, 12)},
+    'pgr_lama': {f"pgr{i}": ROOT / "pages" / "fileSHP_Lama" / f"pgr{i}.shp" for i in range(1, 11)},
+    'provinsi': {"Batas Provinsi": ROOT / "Batas Provinsi.shp"},
+}
+
+log = logging.getLogger(__name__)
+_lock = threading.Lock()
+
+
+def _signature(paths):
+    """Size and mtime of every shapefile component, so any edit invalidates the cache."""
+    sig = {}
+    for path in paths:
+        for part in sorted(path.parent.glob(path.stem + ".*")):
+            stat = part.stat()
+            sig[part.name] = [stat.st_size, stat.st_mtime_ns]
+    return sig
+
+
+def _cache_path(name):
+    return GEOMETRY_DIR / f"{name}.v{GEOMETRY_SCHEMA}.parquet"
+
+
+def _read_cache(name, sig):
+    path = _cache_path(name)
+    if not path.exists():
+        return None
+    table = pq.read_table(path)
+    meta = table.schema.metadata or {}
+    if json.loads(meta.get(b'sources', b'null')) != sig:
+        return None
+    return (np.array(table.column('name').to_pylist(), dtype=object),
+            shapely.from_wkb(table.column('wkb').to_numpy(zero_copy_only=False)))
+
+
+def _write_cache(name, sig, names, geoms):
+    GEOMETRY_DIR.mkdir(parents=True, exist_ok=True)
+    table = pa.table({'name': list(names), 'wkb': list(shapely.to_wkb(geoms))})
+    table = table.replace_schema_metadata({'sources': json.dumps(sig)})
+    tmp = _cache_path(name).with_suffix('.tmp')
+    pq.write_table(table, tmp)
+    tmp.replace(_cache_path(name))
+
+
+def _read_shapefiles(name):
+    names, geoms = [], []
+    for region, path in GEOMETRY_SETS[name].items():
+        try:
+            shapes = gpd.read_file(path).to_crs("EPSG:4326").geometry.to_numpy()
+        except Exception:
+            log.exception("Gagal memuat shapefile %s", path)
+            continue
+        invalid = ~shapely.is_valid(shapes)
+        if invalid.any():
+            log.info("Memperbaiki %d geometri tidak valid di %s", invalid.sum(), path.name)
+            shapes[invalid] = shapely.make_valid(shapes[invalid])
+        shapes = shapes[~shapely.is_missing(shapes) & ~shapely.is_empty(shapes)]
+        names += [region] * len(shapes)
+        geoms += list(shapes)
+    return np.array(names, dtype=object), np.array(geoms, dtype=object)
+
+
+def source_signature(name):
+    """Size and mtime of the shapefiles behind a set (cache key for derived products)."""
+    return _signature([p for p in GEOMETRY_SETS[name].values() if p.exists()])
+
+
+@st.cache_resource
+def region_set(name):
+    """(region names, repaired EPSG:4326 geometries) of a set, in set order."""
+    sig = source_signature(name)
+    with _lock:
+        try:
+            cached = _read_cache(name, sig)
+        except Exception:
+            log.exception("Cache geometri %s rusak, membaca ulang shapefile", name)
+            cached = None
+        if cached is not None:
+            return cached
+        names, geoms = _read_shapefiles(name)
+        try:
+            _write_cache(name, sig, names, geoms)
+        except Exception:
+            log.exception("Gagal menyimpan cache geometri %s", name)
+        return names, geoms
+
+
+def region_geometries(name):
+    """{region: [geometries]} of a set in EPSG:4326, for plotting with ``ccrs.PlateCarree()``."""
+    names, geoms = region_set(name)
+    return {region: list(geoms[names == region]) for region in GEOMETRY_SETS[name]}
+
+
+@st.cache_resource
+def projected_geometries(name, central_longitude=120.0):
+    """Region geometries pre-projected to ``PlateCarree(central_longitude)``.
+
+    Pass the same projection object as the geometries' crs to
+    ``ax.add_geometries`` so cartopy draws them without reprojecting; the
+    objects stay alive across reruns, so its path cache keeps hitting too.
+    """
+    import cartopy.crs as ccrs
+
+    projection = ccrs.PlateCarree(central_longitude=central_longitude)
+    source = ccrs.PlateCarree()
+    return {
+        region: [projection.project_geometry(geom, source) for geom in geoms]
+        for region, geoms in region_geometries(name).items()
+    }
+
+
+def warm_registry():
+    """Load every geometry set (main script start-up, so pages find them in memory)."""
+    for name in GEOMETRY_SETS:
+        region_set(name)
@@ -0,0 +1,147 @@
+"""📍 Event marker layer for the folium maps: one GeoJSON FeatureCollection, styled in the browser.
+
+Instead of one ``folium.Marker`` / ``CircleMarker`` (each with its own popup
+HTML) per row, the events are serialized once as compact GeoJSON carrying
+only the fields the style and popup need. Leaflet's ``pointToLayer`` turns
+them into circle markers coloured and sized from those properties, popups
+are built on click, and a markercluster group merges points at low zoom.
+"""
+import numpy as np
+import pandas as pd
+from folium.elements import JSCSSMixin
+from folium.map import Layer
+from folium.plugins import MarkerCluster
+from jinja2 import Template
+
+DEPTH_EDGES = [60, 300]
+DEPTH_COLORS = ['red', 'yellow', 'green']
+DEPTH_INCLUSIVE = [False, True]  # shallow < 60 km, intermediate <= 300 km, as in the catalog statistics
+CLUSTER_OPTIONS = {'disableClusteringAtZoom': 7, 'maxClusterRadius': 40, 'chunkedLoading': True}
+COORD_DECIMALS = 4
+
+
+def _rule(spec):
+    """Style value for the template: a constant, or {field, edges, colors, inclusive} / {field, scale, power}."""
+    if isinstance(spec, tuple) and len(spec) in (3, 4) and isinstance(spec[1], (list, tuple)):
+        field, edges, colors, inclusive = spec if len(spec) == 4 else (*spec, True)
+        if isinstance(inclusive, bool):
+            inclusive = [inclusive] * len(edges)
+        return {'field': field, 'edges': list(edges), 'colors': list(colors), 'inclusive': list(inclusive)}
+    if isinstance(spec, tuple):
+        field, scale, power = spec
+        return {'field': field, 'scale': scale, 'power': power}
+    return spec
+
+
+def _values(series):
+    if pd.api.types.is_numeric_dtype(series):
+        values = series.astype(float).round(3).to_numpy()
+        return [None if np.isnan(v) else v for v in values.tolist()]
+    return [None if pd.isna(v) else str(v) for v in series.tolist()]
+
+
+def depth_rule(field):
+    """``fill_color`` rule colouring events by the numeric depth (km) in ``field``."""
+    return (field, DEPTH_EDGES, DEPTH_COLORS, DEPTH_INCLUSIVE)
+
+
+def feature_collection(df, lat, lon, fields):
+    """GeoJSON FeatureCollection of the rows with coordinates, keeping only ``fields``."""
+    df = df[df[lat].notna() & df[lon].notna()]
+    x = df[lon].astype(float).round(COORD_DECIMALS).tolist()
+    y = df[lat].astype(float).round(COORD_DECIMALS).tolist()
+    columns = {field: _values(df[field]) for field in dict.fromkeys(fields)}
+    props = [dict(zip(columns, row)) for row in zip(*columns.values())] if columns else [{}] * len(x)
+    return {
+        'type': 'FeatureCollection',
+        'features': [{'type': 'Feature', 'geometry': {'type': 'Point', 'coordinates': [lon_, lat_]},
+                      'properties': p} for lon_, lat_, p in zip(x, y, props)],
+    }
+
+
+class EventLayer(JSCSSMixin, Layer):
+    """Circle markers for earthquake events from one GeoJSON payload.
+
+    ``color`` / ``fill_color`` are a colour or ``(field, edges, colors[, inclusive])``
+    (value <= edges[i], or < where ``inclusive`` is False for that edge, takes
+    colors[i], the rest the last colour; see ``depth_rule``); ``radius``
+    is pixels or ``(field, scale, power)`` giving ``scale * value ** power``.
+    ``popup`` is a list of ``(label, field)`` (label None shows the bare
+    value); ``tooltip`` a field name.
+    """
+    _template = Template(u"""
+        {% macro script(this, kwargs) %}
+            var {{ this.get_name() }} = (function () {
+                var style = {{ this.style|tojson }};
+                function esc(v) {
+                    return String(v).replace(/[&<>"']/g, function (c) {
+                        return {'&': '&amp;', '<': '&lt;', '>': '&gt;', '"': '&quot;', "'": '&#39;'}[c];
+                    });
+                }
+                function resolve(rule, p, fallback) {
+                    if (rule === null || typeof rule !== 'object') { return rule === null ? fallback : rule; }
+                    var v = p[rule.field];
+                    if (v === null || v === undefined) { return fallback; }
+                    if (rule.edges) {
+                        for (var i = 0; i < rule.edges.length; i++) {
+                            if (rule.inclusive[i] ? v <= rule.edges[i] : v < rule.edges[i]) {
+                                return rule.colors[i];
+                            }
+                        }
+                        return rule.colors[rule.edges.length];
+                    }
+                    return rule.scale * Math.pow(Math.max(v, 0), rule.power);
+                }
+                var events = L.geoJson({{ this.data|tojson }}, {
+                    pointToLayer: function (feature, latlng) {
+                        var p = feature.properties;
+                        var options = Object.assign({}, style.options, {
+                            color: resolve(style.color, p, '#3388ff'),
+                            fillColor: resolve(style.fill_color, p, resolve(style.color, p, '#3388ff')),
+                            radius: resolve(style.radius, p, 5)
+                        });
+                        var marker = L.circleMarker(latlng, options);
+                        if (style.popup.length) {
+                            marker.bindPopup(function () {
+                                return style.popup.map(function (item) {
+                                    var v = esc(p[item[1]] === null ? '-' : p[item[1]]);
+                                    return item[0] === null ? v : '<b>' + esc(item[0]) + ':</b> ' + v;
+                                }).join('<br>');
+                            }, {maxWidth: 300});
+                        }
+                        if (style.tooltip) { marker.bindTooltip(esc(p[style.tooltip])); }
+                        return marker;
+                    }
+                });
+                {%- if this.cluster %}
+                var group = L.markerClusterGroup({{ this.cluster|tojson }});
+                {%- else %}
+                var group = L.featureGroup();
+                {%- endif %}
+                group.addLayer(events);
+                return group;
+            })();
+            {{ this._parent.get_name() }}.addLayer({{ this.get_name() }});
+        {% endmacro %}
+        """)
+
+    default_js = MarkerCluster.default_js
+    default_css = MarkerCluster.default_css
+
+    def __init__(self, df, lat, lon, color='crimson', fill_color=None, radius=6, popup=(), tooltip=None,
+                 cluster=True, name='Gempabumi', overlay=True, control=True, show=True, **options):
+        super().__init__(name=name, overlay=overlay, control=control, show=show)
+        self._name = 'EventLayer'
+        rules = [_rule(color), _rule(fill_color), _rule(radius)]
+        fields = [r['field'] for r in rules if isinstance(r, dict)]
+        for field in fields:
+            if not pd.api.types.is_numeric_dtype(df[field]):
+                raise TypeError(f"EventLayer: kolom '{field}' untuk warna/ukuran harus numerik, bukan {df[field].dtype}")
+        fields += [field for _, field in popup] + ([tooltip] if tooltip else [])
+        self.data = feature_collection(df, lat, lon, fields)
+        self.style = {
+            'color': rules[0], 'fill_color': rules[1], 'radius': rules[2],
+            'popup': [list(item) for item in popup], 'tooltip': tooltip,
+            'options': {'weight': 1, 'fillOpacity': 0.7, **options},
+        }
+        self.cluster = dict(CLUSTER_OPTIONS) if cluster is True else cluster
@@ -0,0 +1,112 @@
+"""🔗 Event matching between catalogs on sorted origin-time arrays.
+
+Both catalogs are reduced to int64 epoch-nanosecond arrays; the right-hand
+catalog is sorted once and every left event finds its candidate window with
+``searchsorted``. Candidates are screened by optional distance / magnitude
+tolerances and paired one-to-one, closest first.
+"""
+import numpy as np
+import pandas as pd
+
+EARTH_RADIUS_KM = 6371.0
+ROLES = ('lat', 'lon', 'depth', 'mag')
+MATCH_COLUMNS = ['left', 'right', 'dt_s', 'dist_km', 'dmag', 'ddepth']
+
+
+def _epoch_ns(values):
+    """Origin times as int64 ns since epoch (UTC); naive values are taken as UTC."""
+    t = pd.to_datetime(pd.Series(values), errors='coerce')
+    if t.dt.tz is not None:
+        t = t.dt.tz_convert('UTC').dt.tz_localize(None)
+    t = t.astype('datetime64[ns]')
+    return t.to_numpy().view('int64'), t.isna().to_numpy()
+
+
+def _role(df, cols, role):
+    name = cols.get(role, role)
+    if name not in df.columns:
+        return np.full(len(df), np.nan)
+    return pd.to_numeric(df[name], errors='coerce').to_numpy(dtype=float)
+
+
+def haversine_km(lat0, lon0, lat1, lon1):
+    """Great-circle distance in km between (arrays of) points in degrees."""
+    lat0, lon0, lat1, lon1 = map(np.radians, (lat0, lon0, lat1, lon1))
+    a = (np.sin((lat1 - lat0) / 2) ** 2
+         + np.cos(lat0) * np.cos(lat1) * np.sin((lon1 - lon0) / 2) ** 2)
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.clip(a, 0.0, 1.0)))
+
+
+def match_events(left, right, left_time, right_time, tol_s=60.0, max_km=None,
+                 max_dmag=None, left_cols=None, right_cols=None):
+    """One-to-one best matches of ``left`` events in ``right``.
+
+    Pairs must lie within ``tol_s`` seconds and, when given, within ``max_km``
+    and ``max_dmag``. ``left_cols`` / ``right_cols`` map the roles lat, lon,
+    depth and mag to column names (default: the role names themselves).
+    Returns the index labels of both sides plus residuals (right - left):
+    ``dt_s``, ``dist_km``, ``dmag`` and ``ddepth``, ordered by left position.
+    """
+    left_cols, right_cols = left_cols or {}, right_cols or {}
+    t_left, nat_left = _epoch_ns(left[left_time])
+    t_right, nat_right = _epoch_ns(right[right_time])
+
+    # sort the valid right-hand times once; NaT rows never match
+    r_pos = np.flatnonzero(~nat_right)
+    r_pos = r_pos[np.argsort(t_right[r_pos], kind='stable')]
+    r_sorted = t_right[r_pos]
+
+    l_pos = np.flatnonzero(~nat_left)
+    tol_ns = int(tol_s * 1e9)
+    lo = np.searchsorted(r_sorted, t_left[l_pos] - tol_ns, side='left')
+    hi = np.searchsorted(r_sorted, t_left[l_pos] + tol_ns, side='right')
+    counts = hi - lo
+    if not counts.sum():
+        return pd.DataFrame(columns=MATCH_COLUMNS)
+
+    # expand every left event into its candidate window (no Python loop)
+    li = np.repeat(l_pos, counts)
+    offsets = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+    ri = r_pos[np.repeat(lo, counts) + offsets]
+
+    dt_s = (t_right[ri] - t_left[li]) / 1e9
+    dist = haversine_km(_role(left, left_cols, 'lat')[li], _role(left, left_cols, 'lon')[li],
+                        _role(right, right_cols, 'lat')[ri], _role(right, right_cols, 'lon')[ri])
+    dmag = _role(right, right_cols, 'mag')[ri] - _role(left, left_cols, 'mag')[li]
+    ddepth = _role(right, right_cols, 'depth')[ri] - _role(left, left_cols, 'depth')[li]
+
+    keep = np.ones(len(li), dtype=bool)
+    if max_km is not None:
+        keep &= dist <= max_km
+    if max_dmag is not None:
+        keep &= np.abs(dmag) <= max_dmag
+    li, ri, dt_s, dist, dmag, ddepth = (a[keep] for a in (li, ri, dt_s, dist, dmag, ddepth))
+
+    # greedy one-to-one assignment, closest pair first
+    score = np.abs(dt_s) / tol_s
+    if max_km is not None:
+        score = score + np.nan_to_num(dist, nan=max_km) / max_km
+    used_left, used_right, chosen = set(), set(), []
+    for k in np.argsort(score, kind='stable'):
+        if li[k] in used_left or ri[k] in used_right:
+            continue
+        used_left.add(li[k])
+        used_right.add(ri[k])
+        chosen.append(k)
+    chosen = np.array(sorted(chosen, key=lambda k: li[k]), dtype=int)
+
+    return pd.DataFrame({
+        'left': left.index[li[chosen]],
+        'right': right.index[ri[chosen]],
+        'dt_s': dt_s[chosen],
+        'dist_km': dist[chosen],
+        'dmag': dmag[chosen],
+        'ddepth': ddepth[chosen],
+    })
+
+
+def best_match(df, t_ref, time_column='date_time', tol_s=60.0):
+    """Row of ``df`` closest in time to ``t_ref`` within ``tol_s``, or None."""
+    ref = pd.DataFrame({'t': [t_ref]})
+    pairs = match_events(ref, df, 't', time_column, tol_s=tol_s)
+    return None if pairs.empty else df.loc[pairs['right'].iloc[0]]
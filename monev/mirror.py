@@ -0,0 +1,40 @@
+"""🌐 Conditional-GET helper for keeping local copies of remote files fresh."""
+import json
+
+import requests
+
+
+def _meta_path(path):
+    return path.with_name(path.name + '.meta.json')
+
+
+def fetch_conditional(url, path, timeout=60):
+    """Download ``url`` to ``path`` unless the server reports it unchanged.
+
+    The ETag / Last-Modified headers of the last download are kept next to
+    the file and sent back as If-None-Match / If-Modified-Since. Returns True
+    when the local copy was (re)written, False on 304 Not Modified.
+    """
+    meta_path = _meta_path(path)
+    headers = {}
+    if path.exists() and meta_path.exists():
+        meta = json.loads(meta_path.read_text())
+        if meta.get('etag'):
+            headers['If-None-Match'] = meta['etag']
+        if meta.get('last_modified'):
+            headers['If-Modified-Since'] = meta['last_modified']
+
+    response = requests.get(url, headers=headers, timeout=timeout)
+    if response.status_code == 304:
+        return False
+    response.raise_for_status()
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(path.name + '.tmp')
+    tmp.write_bytes(response.content)
+    tmp.replace(path)
+    meta_path.write_text(json.dumps({
+        'etag': response.headers.get('ETag'),
+        'last_modified': response.headers.get('Last-Modified'),
+    }))
+    return True
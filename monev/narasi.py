@@ -0,0 +1,199 @@
+"""📝 Press-release narratives (``{time_narasi}_narasi.txt``) with a persistent store.
+
+A published narrative never changes, so every one that was downloaded is
+kept in ``NARASI_DB`` keyed by ``time_narasi`` (the WIB ``timesent`` as
+``YYYYmmddHHMMSS``). Only keys missing from the store are fetched, at most
+``NARASI_CONCURRENCY`` at a time from asyncio over one pooled session, and
+the store doubles as a long-term archive beyond the 30-event feed window.
+
+``parse_narratives`` turns the HTML into plain text and pulls the event
+parameters out of every narrative with one named-group pattern applied
+column-wise; results are cached by narrative hash.
+"""
+import asyncio
+import hashlib
+import html
+import logging
+import re
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import closing
+
+import pandas as pd
+import requests
+from requests.adapters import HTTPAdapter
+
+from monev import CACHE_DIR
+from monev.timeparse import WIB
+
+NARASI_URL = "https://bmkg-content-inatews.storage.googleapis.com/{}_narasi.txt"
+NARASI_DB = CACHE_DIR / "narasi" / "narasi.sqlite"
+NARASI_CONCURRENCY = 8
+NARASI_TIMEOUT = 10
+KEY_FORMAT = "%Y%m%d%H%M%S"
+PARSE_CACHE_SIZE = 20000  # parsed narratives kept in memory
+PARSER_VERSION = 1
+
+_NUMBER = r'\d+(?:[.,]\d+)?'
+# every field is an optional lookahead from the start, so their order in the text does not matter
+NARASI_RE = re.compile(
+    rf'^(?=(?:.*?(?i:magnitudo)\s*M?\s*(?P<mag>{_NUMBER}))?)'
+    rf'(?=(?:.*?(?P<lat>{_NUMBER})\s*°\s*(?P<lat_hemi>L[US])\b)?)'
+    rf'(?=(?:.*?(?P<lon>{_NUMBER})\s*°\s*(?P<lon_hemi>B[TB])\b)?)'
+    rf'(?=(?:.*?(?i:kedalaman)\s*(?P<depth>{_NUMBER})\s*km)?)'
+    r'(?=(?:.*?(?P<mmi>\b[IVX]+(?:\s*-\s*[IVX]+)?)\s*MMI)?)'
+    r'(?=(?:.*?(?P<tsunami>(?i:tidak\s+berpotensi\s+tsunami|berpotensi\s+tsunami)))?)',
+    re.DOTALL)
+PARAM_COLUMNS = ['lat', 'lon', 'depth', 'mag', 'mmi', 'tsunami', 'parsed']
+
+log = logging.getLogger(__name__)
+_lock = threading.Lock()
+_parsed = OrderedDict()  # sha1 of the narrative -> (narasi_text, *PARAM_COLUMNS)
+
+_DDL = """
+CREATE TABLE IF NOT EXISTS narasi (
+    time_narasi TEXT PRIMARY KEY,   -- WIB timesent, YYYYmmddHHMMSS
+    html        TEXT NOT NULL,
+    fetched_at  REAL NOT NULL
+);
+"""
+
+
+def _connect():
+    NARASI_DB.parent.mkdir(parents=True, exist_ok=True)
+    con = sqlite3.connect(NARASI_DB, timeout=30)
+    con.executescript(_DDL)
+    return con
+
+
+def _get(session, key):
+    try:
+        response = session.get(NARASI_URL.format(key), timeout=NARASI_TIMEOUT)
+        response.raise_for_status()
+    except requests.RequestException as exc:
+        log.warning("Narasi %s tidak tersedia: %s", key, exc)
+        return None
+    return response.text.strip() or None
+
+
+async def _fetch_all(keys):
+    """{key: narrative text or None}, fetched with at most ``NARASI_CONCURRENCY`` requests in flight."""
+    loop = asyncio.get_running_loop()
+    semaphore = asyncio.Semaphore(NARASI_CONCURRENCY)
+    # own executor: the default one is sized by CPU count, not by how many requests we allow
+    with requests.Session() as session, ThreadPoolExecutor(NARASI_CONCURRENCY, thread_name_prefix='narasi') as pool:
+        session.mount('https://', HTTPAdapter(pool_connections=1, pool_maxsize=NARASI_CONCURRENCY))
+
+        async def fetch(key):
+            async with semaphore:
+                return await loop.run_in_executor(pool, _get, session, key)
+
+        texts = await asyncio.gather(*(fetch(key) for key in keys))
+    return dict(zip(keys, texts))
+
+
+def fetch_narratives(keys):
+    """{time_narasi: raw narrative} for ``keys``; only the ones not in the store are downloaded.
+
+    Keys whose narrative is not (yet) published are left out and tried again
+    on the next call.
+    """
+    keys = list(dict.fromkeys(k for k in keys if k))
+    if not keys:
+        return {}
+    with closing(_connect()) as con:
+        found = dict(con.execute(
+            f"SELECT time_narasi, html FROM narasi WHERE time_narasi IN ({','.join('?' * len(keys))})", keys))
+    missing = [k for k in keys if k not in found]
+    if missing:
+        fetched = {k: text for k, text in asyncio.run(_fetch_all(missing)).items() if text is not None}
+        if fetched:
+            now = time.time()
+            with _lock, closing(_connect()) as con, con:
+                con.executemany("INSERT OR REPLACE INTO narasi VALUES (?, ?, ?)",
+                                [(k, text, now) for k, text in fetched.items()])
+        found.update(fetched)
+    return found
+
+
+def narasi_archive(start, end):
+    """time_narasi, timesent (WIB) and narasi_html of every stored narrative between ``start`` and ``end``."""
+    def key(t):
+        t = pd.Timestamp(t)
+        return (t.tz_convert(WIB) if t.tzinfo else t).strftime(KEY_FORMAT)
+
+    with closing(_connect()) as con:
+        df = pd.read_sql_query(
+            "SELECT time_narasi, html AS narasi_html FROM narasi "
+            "WHERE time_narasi BETWEEN ? AND ? ORDER BY time_narasi",
+            con, params=(key(start), key(end)))
+    df.insert(1, 'timesent', pd.to_datetime(df['time_narasi'], format=KEY_FORMAT).dt.tz_localize(WIB))
+    return df
+
+
+def html_to_text(narasi_html):
+    """Plain text of a Series of narrative HTML (None where missing), one line per text node."""
+    text = narasi_html.astype(object).where(narasi_html.notna(), None).astype('string')
+    text = text.str.replace(r'</?strong>', '', regex=True).str.replace(r'<[^>]*>', '\n', regex=True)
+    text = text.map(html.unescape, na_action='ignore').astype('string')
+    text = text.str.replace(r'\s*\n\s*', '\n', regex=True).str.strip()
+    text = (text.str.replace(r'((?<=\()\n)|(\n(?=\W))|( (?=[,.;:)]))|((?<=[(] ))', '', regex=True)
+                .str.replace(r'((?<=\W)\n)|(\n(?=TIDAK BERPOTENSI TSUNAMI))', ' ', regex=True)
+                .str.replace('* ', '\n', regex=False))
+    return text.astype(object).where(text.notna(), None)
+
+
+def _number(values):
+    return pd.to_numeric(values.str.replace(',', '.', regex=False), errors='coerce')
+
+
+def _extract(narasi_html):
+    """narasi_text and ``PARAM_COLUMNS`` of every narrative, parsed column-wise."""
+    text = html_to_text(narasi_html)
+    found = text.astype('string').str.extract(NARASI_RE)
+    params = pd.DataFrame({
+        'narasi_text': text,
+        'lat': _number(found['lat']).where(found['lat_hemi'] != 'LS', -_number(found['lat'])),
+        'lon': _number(found['lon']).where(found['lon_hemi'] != 'BB', -_number(found['lon'])),
+        'depth': _number(found['depth']),
+        'mag': _number(found['mag']),
+        'mmi': found['mmi'].str.replace(r'\s+', '', regex=True).astype(object),
+        'tsunami': found['tsunami'].str.lower().str.startswith('tidak')
+                                   .map({True: 'Tidak berpotensi', False: 'Berpotensi'}).astype(object),
+    }, index=narasi_html.index)
+    params['parsed'] = params[['lat', 'lon', 'depth', 'mag']].notna().all(axis=1)
+    return params
+
+
+def parse_narratives(narasi_html):
+    """narasi_text and ``PARAM_COLUMNS`` per narrative of a Series of HTML (same index).
+
+    ``lat``/``lon`` are signed degrees (LS / BB negative), ``mmi`` the first
+    felt intensity (e.g. ``III-IV``) and ``tsunami`` the stated potential.
+    ``parsed`` is False when any of lat/lon/depth/mag could not be read.
+    """
+    keys = narasi_html.map(
+        lambda h: hashlib.sha1(f"{PARSER_VERSION}:{h}".encode()).hexdigest() if isinstance(h, str) else None)
+    with _lock:
+        cached = {k: _parsed[k] for k in keys.dropna().unique() if k in _parsed}
+        for k in cached:
+            _parsed.move_to_end(k)
+    todo = keys.notna() & ~keys.isin(list(cached))
+    if todo.any():
+        fresh = _extract(narasi_html[todo])
+        rows = dict(zip(keys[todo], fresh.itertuples(index=False, name=None)))
+        cached.update(rows)
+        with _lock:
+            _parsed.update(rows)
+            while len(_parsed) > PARSE_CACHE_SIZE:
+                _parsed.popitem(last=False)
+    empty = (None,) * len(PARAM_COLUMNS) + (False,)  # missing narrative
+    columns = ['narasi_text'] + PARAM_COLUMNS
+    df = pd.DataFrame([cached.get(k, empty) for k in keys], columns=columns, index=narasi_html.index)
+    for col in ('lat', 'lon', 'depth', 'mag'):
+        df[col] = pd.to_numeric(df[col]).astype(float)
+    df['parsed'] = df['parsed'].astype(bool)
+    return df
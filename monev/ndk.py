@@ -0,0 +1,103 @@
+"""🌎 Parser for Global CMT catalog files in NDK format (5 lines per event).
+
+Every event is decoded in one pass: the file is laid out as an
+``(events, 5, 80)`` byte array and each fixed-width field is sliced for
+all events at once. Column positions follow the GCMT "ndk_explained"
+format description.
+"""
+import numpy as np
+import pandas as pd
+
+NDK_WIDTH = 80
+_POW10 = 10.0 ** np.arange(NDK_WIDTH)
+TENSOR = ['Mrr', 'Mtt', 'Mpp', 'Mrt', 'Mrp', 'Mtp']
+
+# (column, line, start, stop) of the numeric fields
+NDK_FIELDS = [
+    ('Lat', 0, 27, 33), ('Lon', 0, 34, 41), ('Depth', 0, 42, 47),
+    ('Mag_mb', 0, 48, 51), ('Mag_Ms', 0, 52, 55),
+    ('HalfDuration', 1, 75, 80),
+    ('CentroidShift', 2, 9, 18), ('CentroidLat', 2, 22, 29),
+    ('CentroidLon', 2, 34, 42), ('CentroidDepth', 2, 47, 53),
+    ('Exponent', 3, 0, 2),
+] + [(name, 3, 2 + 13 * k, 9 + 13 * k) for k, name in enumerate(TENSOR)] + [
+    ('T_val', 4, 3, 11), ('T_pl', 4, 11, 14), ('T_az', 4, 14, 18),
+    ('N_val', 4, 18, 26), ('N_pl', 4, 26, 29), ('N_az', 4, 29, 33),
+    ('P_val', 4, 33, 41), ('P_pl', 4, 41, 44), ('P_az', 4, 44, 48),
+    ('Moment', 4, 48, 56),
+    ('S1', 4, 56, 60), ('D1', 4, 60, 63), ('R1', 4, 63, 68),
+    ('S2', 4, 68, 72), ('D2', 4, 72, 75), ('R2', 4, 75, 80),
+]
+# (column, line, start, stop) of the text fields
+NDK_TEXT = [
+    ('Catalog', 0, 0, 4), ('Region', 0, 56, 80),
+    ('Event', 1, 0, 16), ('DepthType', 2, 58, 63),
+]
+
+
+def _block(txt):
+    data = np.frombuffer((txt.rstrip("\n") + "\n").encode("ascii", "replace"), dtype="S1")
+    if data.size % (NDK_WIDTH + 1) == 0:
+        rows = data.reshape(-1, NDK_WIDTH + 1)
+        if (rows[:, NDK_WIDTH] == b"\n").all() and rows.shape[0] % 5 == 0:
+            return rows[:, :NDK_WIDTH].reshape(-1, 5, NDK_WIDTH)
+
+    # ragged lines (trailing blanks stripped, stray empty lines): pad them
+    lines = [line for line in txt.splitlines() if line.strip()]
+    n = len(lines) // 5
+    raw = "".join(line[:NDK_WIDTH].ljust(NDK_WIDTH) for line in lines[:n * 5])
+    return np.frombuffer(raw.encode("ascii", "replace"), dtype="S1").reshape(n, 5, NDK_WIDTH)
+
+
+def _raw(block, line, start, stop):
+    return np.ascontiguousarray(block[:, line, start:stop]).view(f"S{stop - start}").ravel()
+
+
+def _num(block, line, start, stop):
+    try:
+        return _raw(block, line, start, stop).astype(float)
+    except ValueError:  # blank or garbled values somewhere in the column
+        return _fixed_point(block, line, start, stop)
+
+
+def _fixed_point(block, line, start, stop):
+    """Decode a fixed-point column digit by digit; blanks and garbage become NaN."""
+    chars = np.ascontiguousarray(block[:, line, start:stop]).view(np.uint8).astype(np.int16) - ord("0")
+    digit = (chars >= 0) & (chars <= 9)
+    dot = chars == ord(".") - ord("0")
+    minus = chars == ord("-") - ord("0")
+    known = digit | dot | minus | (chars == ord(" ") - ord("0")) | (chars == ord("+") - ord("0"))
+
+    # weight each digit by 10 ** (digits to its right), then shift the point
+    right = np.cumsum(digit[:, ::-1], axis=1)[:, ::-1] - digit
+    value = (np.where(digit, chars, 0) * _POW10[right]).sum(axis=1)
+    decimals = (digit & (np.cumsum(dot, axis=1) > 0)).sum(axis=1)
+    value = np.where(minus.any(axis=1), -value, value) / _POW10[decimals]
+
+    valid = digit.any(axis=1) & known.all(axis=1) & (dot.sum(axis=1) <= 1)
+    return np.where(valid, value, np.nan)
+
+
+def _str(block, line, start, stop):
+    return pd.Series(_raw(block, line, start, stop).astype("U")).str.strip().to_numpy()
+
+
+def parse_ndk(txt):
+    """Parse NDK text into one row per event with every catalog field.
+
+    Besides the hypocentre (``Datetime``, ``Lat``, ``Lon``, ``Depth``,
+    ``Mag_mb``, ``Mag_Ms``) this gives the centroid, the moment tensor
+    mantissas ``Mrr``..``Mtp`` with their ``Exponent`` (dyne-cm), scalar
+    moment ``M0``, ``Mw``, both nodal planes and the T/N/P principal axes.
+    """
+    block = _block(txt)
+    df = pd.DataFrame({name: _num(block, *pos) for name, *pos in NDK_FIELDS})
+    for name, *pos in NDK_TEXT:
+        df[name] = _str(block, *pos)
+
+    stamp = _raw(block, 0, 5, 26).astype("U")  # "yyyy/mm/dd hh:mm:ss.s"
+    df.insert(0, 'Datetime', pd.to_datetime(stamp, format="%Y/%m/%d %H:%M:%S.%f", errors="coerce"))
+    df['CentroidTime'] = df['Datetime'] + pd.to_timedelta(df['CentroidShift'], unit="s")
+    df['M0'] = df['Moment'] * 10.0 ** df['Exponent']
+    df['Mw'] = (2.0 / 3.0) * (np.log10(df['M0']) - 16.1)
+    return df
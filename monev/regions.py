@@ -0,0 +1,67 @@
+"""🗺️ Region assignment for earthquake catalogs (island, PGR, legacy pgr).
+
+Every layer's polygons come from the geometry registry and are indexed in
+an STRtree; a catalog is labelled with a single bulk ``query`` per layer
+instead of one ``GeoDataFrame.clip`` per polygon. PGR polygons are buffered and overlap, so
+besides first-match label columns there is ``region_members``, which repeats
+an event once for every region it falls in (the old per-region clip counts).
+"""
+import numpy as np
+import pandas as pd
+import shapely
+import streamlit as st
+
+from monev.geometry import GEOMETRY_SETS, region_set
+
+ISLAND_LABELS = ['SUMATRA', 'JAWA', 'BALI', 'NUSA TENGGARA', 'KALIMANTAN', 'SULAWESI', 'MALUKU', 'PAPUA']
+
+REGION_LAYERS = {layer: GEOMETRY_SETS[layer] for layer in ('island', 'pgr', 'pgr_lama')}
+
+
+@st.cache_resource
+def region_index(layer):
+    """(region names, STRtree of prepared polygons) for a layer, in layer order."""
+    names, geoms = region_set(layer)
+    tree = shapely.STRtree(geoms)
+    shapely.prepare(tree.geometries)
+    return names, tree
+
+
+def region_hits(lon, lat, layer):
+    """Positional (event, region name) pairs for events inside a layer's polygons.
+
+    Boundary points count as inside, as with ``GeoDataFrame.clip``.
+    """
+    names, tree = region_index(layer)
+    points = shapely.points(np.asarray(lon, dtype=float), np.asarray(lat, dtype=float))
+    # bbox candidates from the tree, then the exact test against prepared polygons
+    event, poly = tree.query(points)
+    inside = shapely.intersects(tree.geometries[poly], points[event])
+    event, poly = event[inside], poly[inside]
+    # a region made of several polygons must not count an event twice
+    order = pd.Categorical(names[poly], categories=list(REGION_LAYERS[layer]))
+    pairs = pd.DataFrame({'event': event, 'region': order}).drop_duplicates()
+    return pairs.sort_values(['region', 'event'], kind='stable').reset_index(drop=True)
+
+
+def label_regions(df, lon='fixedLon', lat='fixedLat', layers=tuple(REGION_LAYERS)):
+    """Copy of ``df`` with one label column per layer (first region in layer order, else NaN)."""
+    out = df.copy()
+    for layer in layers:
+        hits = region_hits(df[lon], df[lat], layer).drop_duplicates('event')
+        label = pd.Series(pd.Categorical([None] * len(df), categories=list(REGION_LAYERS[layer])))
+        label.iloc[hits['event'].to_numpy()] = hits['region'].values
+        out[layer] = label.values
+    return out
+
+
+def region_members(df, layer, lon='fixedLon', lat='fixedLat'):
+    """Events of ``df`` repeated once per region of ``layer`` they fall in.
+
+    The ``layer`` column is categorical in layer order, so
+    ``groupby(layer, observed=False)`` yields every region, empty ones included.
+    """
+    hits = region_hits(df[lon], df[lat], layer)
+    members = df.iloc[hits['event'].to_numpy()].copy()
+    members[layer] = hits['region'].values
+    return members
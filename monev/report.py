@@ -0,0 +1,108 @@
+"""📄 Focal-mechanism PDF report, built on demand off the Streamlit script thread.
+
+``submit_report`` queues the build in a small thread pool and returns a key;
+the page polls ``report_job(key)`` and serves the bytes once the future is
+done, so a rerun never waits for the PDF. Identical tables share one job.
+The document is written in memory; beachballs come from the image cache
+in chunks of ``CHUNK_ROWS`` rows and fpdf2 embeds each distinct image once,
+so thousands of rows stay cheap.
+"""
+import hashlib
+import io
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+from fpdf import FPDF
+
+from monev.beachball import beachball_pngs
+
+REPORT_COLUMNS = {
+    'Tanggal': 15, 'Waktu': 15, 'Magnitude': 18, 'Type Magnitude': 22,
+    'Latitude': 20, 'Longitude': 20, 'Depth': 12,
+    'Strike NP1': 15, 'Dip NP1': 12, 'Rake NP1': 15,
+    'Strike NP2': 15, 'Dip NP2': 12, 'Rake NP2': 15,
+    'Remark': 50,
+}
+FOCAL_WIDTH = 20
+ROW_HEIGHT = 10
+CHUNK_ROWS = 250
+REPORT_WORKERS = 2
+MAX_JOBS = 16  # finished reports kept for download
+
+_lock = threading.Lock()
+_jobs = OrderedDict()
+_pool = ThreadPoolExecutor(REPORT_WORKERS, thread_name_prefix='focal-report')
+
+
+def _text(value):
+    # core fonts are latin-1 only
+    return str(value)[:30].encode('latin-1', 'replace').decode('latin-1')
+
+
+class FocalPDF(FPDF):
+    """Landscape table that repeats its header row on every page."""
+
+    def header(self):
+        self.set_font("helvetica", size=8)
+        for col, width in REPORT_COLUMNS.items():
+            self.cell(width, ROW_HEIGHT, col, border=1, align='C')
+        self.cell(FOCAL_WIDTH, ROW_HEIGHT, "Beachball", border=1, align='C')
+        self.ln()
+
+
+def build_focal_report(df, colors):
+    """PDF bytes of the focal table ``df`` with one beachball per row in ``colors``."""
+    pdf = FocalPDF(orientation='L')
+    pdf.set_auto_page_break(auto=True, margin=10)
+    pdf.add_page()
+    colors = np.asarray(colors, dtype=object)
+
+    for start in range(0, len(df), CHUNK_ROWS):
+        chunk = df.iloc[start:start + CHUNK_ROWS]
+        images = beachball_pngs(chunk['Strike NP1'], chunk['Dip NP1'], chunk['Rake NP1'],
+                                colors[start:start + CHUNK_ROWS])
+        values = chunk[list(REPORT_COLUMNS)].itertuples(index=False, name=None)
+        for row, png in zip(values, images):
+            if pdf.will_page_break(ROW_HEIGHT):
+                pdf.add_page()
+            for value, width in zip(row, REPORT_COLUMNS.values()):
+                pdf.cell(width, ROW_HEIGHT, _text(value), border=1, align='C')
+            if png:
+                x, y = pdf.get_x(), pdf.get_y()
+                pdf.cell(FOCAL_WIDTH, ROW_HEIGHT, '', border=1)
+                pdf.image(io.BytesIO(png), x + 2, y + 2, h=ROW_HEIGHT - 2)
+            else:
+                pdf.cell(FOCAL_WIDTH, ROW_HEIGHT, "N/A", border=1, align='C')
+            pdf.ln()
+    return bytes(pdf.output())
+
+
+def report_key(df, colors):
+    """Content hash of the table and its colours."""
+    digest = hashlib.sha1(pd.util.hash_pandas_object(df[list(REPORT_COLUMNS)], index=False).to_numpy())
+    digest.update(repr(list(colors)).encode())
+    return digest.hexdigest()
+
+
+def submit_report(df, colors):
+    """Start (or reuse) the build of this report; returns its key. A failed build is started again."""
+    key = report_key(df, colors)
+    with _lock:
+        job = _jobs.get(key)
+        if job is not None and not (job.done() and job.exception() is not None):
+            _jobs.move_to_end(key)
+            return key
+        _jobs[key] = _pool.submit(build_focal_report, df.copy(), list(colors))
+        done = [k for k, job in _jobs.items() if job.done()]
+        for k in done[:max(0, len(_jobs) - MAX_JOBS)]:
+            del _jobs[k]
+    return key
+
+
+def report_job(key):
+    """Future of a submitted report, or None when it was never started or has expired."""
+    with _lock:
+        return _jobs.get(key)
@@ -0,0 +1,94 @@
+"""📡 Pager for the RTSP InaTEWS public bulletin list (publicbull.php).
+
+Pages are fetched newest-first, a few at a time over one pooled session,
+and paging stops as soon as a page reaches bulletins older than the
+requested start time. Parsed pages are cached by their HTML content, so
+older pages (which never change) are only parsed once.
+"""
+import logging
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+import requests
+import streamlit as st
+from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
+
+from monev.coords import coords
+
+RTSP_URL = "https://rtsp.bmkg.go.id/publicbull.php?halaman={}"
+RTSP_PAGES = 14    # pages available on publicbull.php
+RTSP_WORKERS = 4   # pages fetched concurrently
+RTSP_COLUMNS = ['date_time', 'mag', 'depth', 'lat', 'lon', 'typ', 'num_bull', 'evt_group']
+
+log = logging.getLogger(__name__)
+
+
+@st.cache_resource(show_spinner=False)
+def _session():
+    session = requests.Session()
+    session.mount("https://", HTTPAdapter(pool_connections=1, pool_maxsize=RTSP_WORKERS))
+    return session
+
+
+def _fetch(page):
+    """HTML of bulletin page ``page``, or None if it could not be downloaded."""
+    try:
+        response = _session().get(RTSP_URL.format(page), timeout=30)
+        response.raise_for_status()
+    except requests.RequestException as exc:
+        log.warning("Halaman RTSP %s tidak tersedia: %s", page, exc)
+        return None
+    return response.text
+
+
+@st.cache_data(show_spinner=False, max_entries=4 * RTSP_PAGES)
+def parse_rtsp_page(html):
+    """Parse one bulletin page into a DataFrame (date_time is naive WIB)."""
+    soup = BeautifulSoup(html, 'html')
+    rows = soup.find_all("td", {"class": "txt11pxarialb"})
+    data = [div.text for row in rows for div in row.find_all('div')]
+    chunks = [data[i:i + 9] for i in range(0, len(data), 9)]
+    records = []
+    for row in chunks:
+        try:
+            records.append({
+                'date_time': f"{row[0]} {row[1]}",
+                'mag': float(row[2]),
+                'depth': float(row[3]),
+                'lat': row[4],
+                'lon': row[5],
+                'typ': row[6], 'num_bull': row[7], 'evt_group': row[8]
+            })
+        except (IndexError, ValueError):
+            continue
+    df = pd.DataFrame(records, columns=RTSP_COLUMNS)
+    df['lat'] = coords(df['lat'], axis='lat')
+    df['lon'] = coords(df['lon'], axis='lon')
+    return df.dropna(subset=['lat', 'lon']).reset_index(drop=True)
+
+
+def fetch_bulletins(since=None, pages=RTSP_PAGES, workers=RTSP_WORKERS):
+    """Fetch bulletins from the newest page back to ``since`` (naive WIB time).
+
+    Pages are requested ``workers`` at a time; paging stops after the first
+    batch whose oldest bulletin predates ``since``, that comes back empty, or
+    in which a page could not be downloaded (the pages that did load are kept).
+    """
+    frames = []
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        for first in range(1, pages + 1, workers):
+            batch = range(first, min(first + workers, pages + 1))
+            htmls = list(pool.map(_fetch, batch))
+            parsed = [parse_rtsp_page(html) for html in htmls if html is not None]
+            frames.extend(parsed)
+            if not parsed or None in htmls:
+                break
+
+            oldest = pd.to_datetime(parsed[-1]['date_time'], errors='coerce').min()
+            if pd.isnull(oldest) or (since is not None and oldest < since):
+                break
+
+    if not frames:
+        return pd.DataFrame(columns=RTSP_COLUMNS)
+    return pd.concat(frames, ignore_index=True)
@@ -0,0 +1,93 @@
+"""🗄️ Persistent store for SeisCOMP processing history (history.{eventid}.txt).
+
+A finalized event's history file never changes, so it is downloaded once,
+kept on disk under ``HISTORY_DIR`` and served from there on later runs.
+Missing files are fetched in parallel with bounded concurrency.
+"""
+import re
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+import numpy as np
+import pandas as pd
+import requests
+
+from monev import CACHE_DIR
+
+HISTORY_URL = "https://bmkg-content-inatews.storage.googleapis.com/history.{}.txt"
+HISTORY_DIR = CACHE_DIR / "seiscomp_history"
+HISTORY_WORKERS = 8
+FINAL_AFTER = pd.Timedelta(days=1)  # events older than this have a final history file
+HISTORY_COLUMNS = ['event_id', 'tstamp_process', 'time_process (minutes)', 'error']
+
+
+def parse_history(text):
+    """Return (timestamp, processing minutes) from the first ``ts|elapse`` row."""
+    rows = [line.split("|") for line in text.strip().split("\n") if "|" in line]
+    if not rows or len(rows[0]) < 2:
+        raise ValueError("no 'timestamp|elapse' row in history file")
+    ts_raw, elapse_raw = rows[0][0].strip(), rows[0][1].strip()
+    return pd.to_datetime(ts_raw, errors='coerce'), float(elapse_raw) if elapse_raw else np.nan
+
+
+def _download(event_id):
+    response = requests.get(HISTORY_URL.format(event_id), timeout=15)
+    response.raise_for_status()
+    return response.text
+
+
+def _store(path, text):
+    tmp = path.with_suffix('.tmp')
+    tmp.write_text(text, encoding='utf-8')
+    tmp.replace(path)
+
+
+def load_history(events, workers=HISTORY_WORKERS):
+    """Processing timestamp and time for each event in ``events``.
+
+    ``events`` needs ``event_id`` and ``date_time`` (UTC) columns. Events
+    whose history can't be fetched or parsed get NaN values and the reason in
+    the ``error`` column instead of silently becoming zero. Only history
+    files that parse are kept on disk.
+    """
+    HISTORY_DIR.mkdir(parents=True, exist_ok=True)
+    final_before = pd.Timestamp.now(tz='UTC').tz_localize(None) - FINAL_AFTER
+    origin = dict(zip(events['event_id'], events['date_time']))
+
+    texts, errors, misses = {}, {}, []
+    for eid in origin:
+        if not re.fullmatch(r'[\w.-]+', eid):
+            errors[eid] = "invalid event_id"
+            continue
+        path = HISTORY_DIR / f"{eid}.txt"
+        if path.exists():
+            texts[eid] = path.read_text(encoding='utf-8')
+        else:
+            misses.append(eid)
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = {pool.submit(_download, eid): eid for eid in misses}
+        for future in as_completed(futures):
+            eid = futures[future]
+            try:
+                texts[eid] = future.result()
+            except Exception as exc:
+                errors[eid] = f"download failed: {exc}"
+
+    rows, downloaded = [], set(misses)
+    for eid in origin:
+        tstamp, minutes = pd.NaT, np.nan
+        if eid in texts:
+            path = HISTORY_DIR / f"{eid}.txt"
+            try:
+                tstamp, minutes = parse_history(texts[eid])
+            except ValueError as exc:
+                errors[eid] = str(exc)
+                path.unlink(missing_ok=True)  # never keep a bad copy; download again next run
+            else:
+                if eid in downloaded and pd.notnull(origin[eid]) and origin[eid] < final_before:
+                    _store(path, texts[eid])
+        rows.append((eid, tstamp, minutes, errors.get(eid)))
+    out = pd.DataFrame(rows, columns=HISTORY_COLUMNS)
+    out['tstamp_process'] = pd.to_datetime(out['tstamp_process'])
+    out['time_process (minutes)'] = out['time_process (minutes)'].astype(float)
+    return out
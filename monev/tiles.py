@@ -0,0 +1,241 @@
+"""🗺️ Local disk cache of the ESRI Ocean basemap tiles.
+
+Every z/x/y tile is fetched from ESRI once and kept under ``TILE_DIR``; the
+store is capped at ``TILE_CAP_BYTES`` and evicts the least recently used
+tiles (file mtime is touched on every hit). A small HTTP server on
+``127.0.0.1:TILE_PORT`` serves the store so contextily reads tiles from
+disk. Folium maps run in the browser, so they keep using ESRI unless
+``MONEV_TILE_URL`` points them at a reachable instance of that server.
+When the port is already taken by a server on the same store (e.g. a
+standalone ``python -m monev.tiles serve``) the app reuses it.
+
+Seed the Indonesia bbox before going offline::
+
+    python -m monev.tiles seed --zooms 3-8
+"""
+import argparse
+import logging
+import math
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import requests
+
+from monev import CACHE_DIR
+
+TILE_URL = "https://services.arcgisonline.com/arcgis/rest/services/Ocean/World_Ocean_Base/MapServer/tile/{z}/{y}/{x}"
+TILE_ATTR = "ESRI"
+TILE_DIR = CACHE_DIR / "tiles" / "esri-ocean"
+TILE_CAP_BYTES = int(os.environ.get("MONEV_TILE_CAP_MB", 1024)) * 1024 ** 2
+TILE_PORT = int(os.environ.get("MONEV_TILE_PORT", 8765))
+TILE_WORKERS = 8
+SEED_BBOX = (90.0, -15.0, 145.0, 10.0)  # west, south, east, north
+SEED_ZOOMS = range(3, 9)
+PING_PATH = '/ping'  # answers with the store directory, to recognise a server already running on it
+
+log = logging.getLogger(__name__)
+_lock = threading.Lock()
+_usage = None  # bytes on disk, counted once then kept up to date
+_server = None
+
+
+def _path(z, x, y):
+    return TILE_DIR / str(z) / str(x) / f"{y}.png"
+
+
+def _prune():
+    """Evict least recently used tiles until the store is under ``TILE_CAP_BYTES``."""
+    global _usage
+    files = []
+    for root, _, names in os.walk(TILE_DIR):
+        for name in names:
+            if name.endswith('.png'):
+                stat = os.stat(os.path.join(root, name))
+                files.append((stat.st_mtime, stat.st_size, os.path.join(root, name)))
+    total = sum(size for _, size, _ in files)
+    target = TILE_CAP_BYTES * 0.9  # leave headroom so we do not prune on every write
+    for _, size, path in sorted(files):
+        if total <= target:
+            break
+        try:
+            os.remove(path)
+        except OSError:
+            continue
+        total -= size
+    _usage = total
+
+
+def _account(size):
+    global _usage
+    with _lock:
+        if _usage is None:
+            _prune()  # the first count from disk already includes the tile just written
+            return
+        _usage += size
+        if _usage > TILE_CAP_BYTES:
+            _prune()
+
+
+def get_tile(z, x, y, timeout=20):
+    """PNG bytes of tile z/x/y from disk, fetched from ESRI on a miss (None if unavailable)."""
+    path = _path(z, x, y)
+    try:
+        data = path.read_bytes()
+        os.utime(path)
+        return data
+    except OSError:
+        pass
+    try:
+        response = requests.get(TILE_URL.format(z=z, x=x, y=y), timeout=timeout)
+        response.raise_for_status()
+    except requests.RequestException as exc:
+        log.warning("Tile %s/%s/%s tidak tersedia: %s", z, x, y, exc)
+        return None
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f"{path.name}.{threading.get_ident()}.tmp")
+    tmp.write_bytes(response.content)
+    tmp.replace(path)
+    _account(len(response.content))
+    return response.content
+
+
+def tiles_in_bbox(west, south, east, north, zoom):
+    """(z, x, y) of every web-mercator tile covering the bbox at ``zoom``."""
+    n = 2 ** zoom
+
+    def col(lon):
+        return min(n - 1, max(0, int((lon + 180.0) / 360.0 * n)))
+
+    def row(lat):
+        lat = math.radians(max(-85.0511, min(85.0511, lat)))
+        return min(n - 1, max(0, int((1 - math.asinh(math.tan(lat)) / math.pi) / 2 * n)))
+
+    return [(zoom, x, y) for x in range(col(west), col(east) + 1) for y in range(row(north), row(south) + 1)]
+
+
+def seed(bbox=SEED_BBOX, zooms=SEED_ZOOMS, workers=TILE_WORKERS):
+    """Fetch every tile of ``bbox`` at ``zooms`` into the store; returns (tiles, failed)."""
+    tiles = [t for z in zooms for t in tiles_in_bbox(*bbox, z)]
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        failed = sum(data is None for data in pool.map(lambda t: get_tile(*t), tiles))
+    return len(tiles), failed
+
+
+class _TileHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path == PING_PATH:
+            body = str(TILE_DIR.resolve()).encode()
+            self.send_response(200)
+            self.send_header('Content-Type', 'text/plain; charset=utf-8')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+            return
+        try:
+            z, x, y = (int(p) for p in self.path.split('?')[0].strip('/').removesuffix('.png').split('/'))
+        except ValueError:
+            self.send_error(404)
+            return
+        data = get_tile(z, x, y)
+        if data is None:
+            self.send_error(502)
+            return
+        self.send_response(200)
+        self.send_header('Content-Type', 'image/png')
+        self.send_header('Content-Length', str(len(data)))
+        self.send_header('Cache-Control', 'public, max-age=604800')
+        self.send_header('Access-Control-Allow-Origin', '*')
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, *args):
+        pass
+
+
+def _url(host, port):
+    return f"http://{host}:{port}/{{z}}/{{x}}/{{y}}.png"
+
+
+def _serves_store(host, port):
+    """True when ``host:port`` is a tile server on this ``TILE_DIR``."""
+    try:
+        response = requests.get(f"http://{host}:{port}{PING_PATH}", timeout=2)
+    except requests.RequestException:
+        return False
+    return response.ok and response.text == str(TILE_DIR.resolve())
+
+
+def start_server(host='127.0.0.1', port=TILE_PORT):
+    """Start the tile server once per process; returns its ``{z}/{x}/{y}`` URL template.
+
+    If the port is held by a tile server on the same store, that one is used
+    instead; any other bind failure raises ``OSError``.
+    """
+    global _server
+    with _lock:
+        if _server is None:
+            try:
+                _server = ThreadingHTTPServer((host, port), _TileHandler)
+            except OSError:
+                if _serves_store(host, port):
+                    log.info("Memakai server tile yang sudah berjalan di %s:%s", host, port)
+                    return _url(host, port)
+                raise
+            _server.daemon_threads = True
+            threading.Thread(target=_server.serve_forever, name='tile-server', daemon=True).start()
+        host, port = _server.server_address[:2]
+    return _url(host, port)
+
+
+def basemap_source():
+    """Tile URL for ``contextily.add_basemap``: the local store, or ESRI if it cannot start."""
+    try:
+        return start_server()
+    except OSError as exc:
+        log.warning("Server tile lokal tidak bisa dijalankan di port %s (%s); "
+                    "tile diambil langsung dari ESRI tanpa cache lokal", TILE_PORT, exc)
+        return TILE_URL
+
+
+def folium_tiles():
+    """Tile URL for folium maps (``MONEV_TILE_URL`` when the local server is exposed)."""
+    url = os.environ.get("MONEV_TILE_URL")
+    if not url:
+        return TILE_URL
+    try:
+        start_server(host=os.environ.get("MONEV_TILE_HOST", '127.0.0.1'))
+    except OSError as exc:
+        log.warning("Server tile lokal tidak bisa dijalankan di port %s (%s); "
+                    "pastikan MONEV_TILE_URL menunjuk server yang aktif", TILE_PORT, exc)
+    return url
+
+
+def _zooms(text):
+    lo, _, hi = text.partition('-')
+    return range(int(lo), int(hi or lo) + 1)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m monev.tiles', description=__doc__.splitlines()[0])
+    sub = parser.add_subparsers(dest='command', required=True)
+    p_seed = sub.add_parser('seed', help='fetch the bbox tiles into the store')
+    p_seed.add_argument('--bbox', type=float, nargs=4, default=SEED_BBOX, metavar=('W', 'S', 'E', 'N'))
+    p_seed.add_argument('--zooms', type=_zooms, default=SEED_ZOOMS, help='e.g. 3-8')
+    p_serve = sub.add_parser('serve', help='serve the store over HTTP')
+    p_serve.add_argument('--host', default='127.0.0.1')
+    p_serve.add_argument('--port', type=int, default=TILE_PORT)
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO)
+    if args.command == 'seed':
+        total, failed = seed(args.bbox, args.zooms)
+        print(f"{total - failed}/{total} tile tersimpan di {TILE_DIR}")
+        return 1 if failed else 0
+    print(start_server(args.host, args.port))
+    threading.Event().wait()
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -0,0 +1,106 @@
+"""🕒 Batch parsing of BMKG feed timestamps into tz-aware datetimes.
+
+Feed values look like ``14/07/2025 12:34:56 WIB``, ``14-07-25 12:34:56`` or
+``2025-07-14 12:34:56 UTC``. The zone suffix is split off in one vectorized
+pass, the candidate formats are ranked on a sample of the column and applied
+whole-column in that order, and only what no format matched is parsed one
+element at a time. Each value is localized to its own zone (values without
+one to ``default_tz``) before conversion, so WIB and UTC never get mixed.
+"""
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+
+WIB = 'Asia/Jakarta'
+ZONES = {'WIB': WIB, 'WITA': 'Asia/Makassar', 'WIT': 'Asia/Jayapura', 'UTC': 'UTC', 'GMT': 'UTC'}
+TIME_FORMATS = [
+    "%d/%m/%Y %H:%M:%S",
+    "%d-%m-%y %H:%M:%S",
+    "%d-%m-%Y %H:%M:%S",
+    "%d-%b-%y %H:%M:%S",
+    "%Y-%m-%d %H:%M:%S",
+    "%Y/%m/%d %H:%M:%S",
+]
+SAMPLE = 64
+YEARS = (1900, 2100)
+
+_TEXT = pd.ArrowDtype(pa.string())
+_ZONE = r'(?i)\s*\b(?P<zone>WITA|WIB|WIT|UTC|GMT)$'
+
+
+def _strptime(body, fmt):
+    """Whole-column parse with ``fmt``; null where it does not match exactly.
+
+    Arrow's strptime rolls impossible dates over (31/02 -> 03/03, always onto
+    day 1-3) and lets ``%Y`` take a two-digit year, so rows on day 1-3 or
+    outside YEARS only count as parsed when formatting them back reproduces
+    the input.
+    """
+    parsed = pc.strptime(body, format=fmt, unit='s', error_is_null=True)
+    year = pc.year(parsed)
+    suspect = pc.or_(pc.less_equal(pc.day(parsed), 3),
+                     pc.or_(pc.less(year, YEARS[0]), pc.greater(year, YEARS[1])))
+    suspect = np.flatnonzero(pc.fill_null(suspect, False).to_numpy(zero_copy_only=False))
+    if not len(suspect):
+        return parsed
+    exact = pc.equal(pc.strftime(parsed.take(suspect), format=fmt), body.take(suspect))
+    keep = np.ones(len(parsed), dtype=bool)
+    keep[suspect] = pc.fill_null(exact, False).to_numpy(zero_copy_only=False)
+    return pc.if_else(pa.array(keep), parsed, pa.scalar(None, parsed.type))
+
+
+def _element(value):
+    try:
+        return pd.to_datetime(value, dayfirst=not value[:4].isdigit())  # year-first (ISO) is never day-first
+    except (ValueError, TypeError, OverflowError):
+        return pd.NaT
+
+
+def _naive(body, formats):
+    """Naive datetimes for ``body``: best formats whole-column, then per element."""
+    values = pa.array(body.array)
+    out = pa.nulls(len(values), pa.timestamp('s'))
+    todo = pc.and_(pc.is_valid(values), pc.not_equal(values, ''))
+    sample = pc.filter(values, pc.fill_null(todo, False))[:SAMPLE]
+    hits = [_strptime(sample, fmt).null_count for fmt in formats]
+    for rank in np.argsort(hits, kind='stable'):
+        if not pc.any(todo).as_py():
+            break
+        parsed = _strptime(pc.if_else(todo, values, pa.scalar(None, pa.string())), formats[rank])
+        out = pc.coalesce(out, parsed)
+        todo = pc.and_(todo, pc.is_null(parsed))
+
+    out = pd.Series(out.to_numpy(zero_copy_only=False), index=body.index).astype('datetime64[ns]')
+    todo = pd.Series(todo.to_numpy(zero_copy_only=False), index=body.index).astype(bool)
+    if todo.any():
+        leftovers = body[todo].astype(object).map(_element)
+        out.loc[leftovers.index] = pd.to_datetime(leftovers).astype('datetime64[ns]')
+    return out
+
+
+def parse_times(values, default_tz=WIB, tz='UTC', formats=TIME_FORMATS):
+    """Parse feed timestamps into a tz-aware ``datetime64[ns, tz]`` Series.
+
+    A trailing WIB/WITA/WIT/UTC/GMT marks the zone of that value; values
+    without one are taken as ``default_tz``. Unparseable values become NaT.
+    """
+    text = pd.Series(values).reset_index(drop=True).astype(_TEXT).str.strip()
+    zone = text.str.extract(_ZONE)['zone'].str.upper()
+    body = text.str.replace(_ZONE, '', regex=True).str.strip()
+    naive = _naive(body, formats)
+
+    out = pd.Series(pd.NaT, index=naive.index, dtype=f'datetime64[ns, {tz}]')
+    zone = zone.map(ZONES).fillna(default_tz).astype(object)
+    for name in zone.unique():
+        part = naive[zone == name]
+        out.loc[part.index] = (part.dt.tz_localize(name, ambiguous='NaT', nonexistent='NaT')
+                               .dt.tz_convert(tz))
+    return out
+
+
+def combine_date_time(dates, times, **kwargs):
+    """``parse_times`` over separate date and time columns (``14-07-25`` + ``12:34:56 WIB``)."""
+    dates = pd.Series(dates).reset_index(drop=True).astype(_TEXT).str.strip()
+    times = pd.Series(times).reset_index(drop=True).astype(_TEXT).str.strip()
+    return parse_times(dates + ' ' + times, **kwargs)
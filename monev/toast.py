@@ -0,0 +1,307 @@
+"""🌊 SQLite index of the TOAST incident logs (one ``<event_id>.log`` per event).
+
+For every log under ``TOAST_DIR`` (flat or in year/month folders) the index
+keeps the event id, the first ``Incident created`` / ``Info`` line (time
+and remark) and the file's size and mtime. A refresh only stats the files
+and re-reads the new or changed ones, and time-range queries are answered
+from the indexed timestamp column. Log times are WIB and stored in UTC.
+
+Large re-reads (first run, or every log after a schema change) are split
+across a process pool; each worker returns its chunk as NumPy columns and
+logs it cannot parse are kept in the index with their error, see
+``index_errors``.
+
+``build_timeline`` goes further and extracts every line of the logs
+(memory-mapped, one compiled regex over the whole buffer) into a columnar
+table, from which ``timeline_metrics`` derives the per-event milestones.
+"""
+import datetime
+import logging
+import mmap
+import os
+import re
+import sqlite3
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import closing
+from multiprocessing import get_context
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from monev import CACHE_DIR, ROOT
+
+TOAST_DIR = ROOT / "pages" / "fileTOAST"
+TOAST_INDEX = CACHE_DIR / "toast" / "index.sqlite"
+TOAST_SCHEMA = 2
+TOAST_TTL = 60
+LOG_UTC_OFFSET = datetime.timedelta(hours=7)  # TOAST logs are written in WIB
+MARKERS = ("Incident created", "Info")
+SCAN_WORKERS = min(4, os.cpu_count() or 1)
+SCAN_CHUNK = 128  # logs per worker task
+SCAN_INLINE = 256  # fewer changed logs than this are read in-process
+
+# "2025/01/31 18:04:56.093521 [Incident:Info:toast@toast-new:Incident created] <message>"
+LINE_RE = re.compile(
+    rb'^(\d{4}/\d\d/\d\d \d\d:\d\d:\d\d\.\d+) \[([^:\]\n]+):([^:\]\n]+):[^:\]\n]*:([^\]\n]+)\] ?([^\r\n]*)',
+    re.MULTILINE)
+ORIGIN_RE = re.compile(r'OT: (?P<ot>\d{4}-\d\d-\d\d \d\d:\d\d:\d\d),\s*Lat/Lon: (?P<lat>-?[\d.]+)°/(?P<lon>-?[\d.]+)°,'
+                       r' Depth: (?P<depth>-?[\d.]+)')
+MAG_RE = re.compile(r'(?:Mag:|Magnitude updated:) (?P<mag>\d+(?:\.\d+)?)')
+MILESTONES = ('incident_created', 'first_origin', 'final_magnitude')
+TIMELINE_COLUMNS = ['event_id', 'tstamp', 'component', 'level', 'action', 'message',
+                    'ot', 'lat', 'lon', 'depth', 'mag']
+
+log = logging.getLogger(__name__)
+_lock = threading.Lock()
+_pool = None
+
+_DDL = """
+CREATE TABLE IF NOT EXISTS logs (
+    path     TEXT PRIMARY KEY,
+    event_id TEXT NOT NULL,
+    tstamp   TEXT,              -- first incident line, UTC 'YYYY-MM-DD HH:MM:SS.ffffff'
+    remark   TEXT,
+    size     INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    error    TEXT               -- why the log could not be parsed, NULL when fine
+);
+CREATE INDEX IF NOT EXISTS logs_tstamp ON logs (tstamp);
+CREATE INDEX IF NOT EXISTS logs_event ON logs (event_id);
+"""
+
+
+def _connect():
+    TOAST_INDEX.parent.mkdir(parents=True, exist_ok=True)
+    con = sqlite3.connect(TOAST_INDEX, timeout=30)
+    if con.execute("PRAGMA user_version").fetchone()[0] != TOAST_SCHEMA:
+        con.executescript(f"DROP TABLE IF EXISTS logs; PRAGMA user_version = {TOAST_SCHEMA};")
+    con.executescript(_DDL)
+    return con
+
+
+def _parse_time(text):
+    try:
+        local = datetime.datetime.strptime(text, "%Y/%m/%d %H:%M:%S.%f")
+    except ValueError:
+        local = pd.to_datetime(text, errors='coerce')
+        if pd.isna(local):
+            return None
+        local = local.to_pydatetime()
+    return (local - LOG_UTC_OFFSET).strftime("%Y-%m-%d %H:%M:%S.%f")
+
+
+def read_first_incident(path):
+    """(UTC timestamp text, remark) of the first incident line of a log; ValueError if unusable."""
+    with open(path, encoding="utf-8", errors="ignore") as f:
+        for line in f:
+            if any(marker in line for marker in MARKERS):
+                parts = line.split()
+                if len(parts) < 3:
+                    raise ValueError(f"baris incident tidak lengkap: {line.strip()[:80]!r}")
+                tstamp = _parse_time(f"{parts[0]} {parts[1]}")
+                if tstamp is None:
+                    raise ValueError(f"waktu tidak valid: {parts[0]} {parts[1]}")
+                return tstamp, parts[2]
+    raise ValueError("tidak ada baris incident")
+
+
+def read_timeline(path):
+    """(time, component, level, action, message) byte tuples of every line of a log."""
+    with open(path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return []
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buf:
+            return LINE_RE.findall(buf)
+
+
+def _decode(values, category=False):
+    series = pd.Series(values, dtype=object).str.decode('utf-8', errors='replace')
+    return series.astype('category') if category else series
+
+
+def build_timeline(paths):
+    """One row per log line of ``paths`` (``TIMELINE_COLUMNS``), times in UTC.
+
+    ``ot``/``lat``/``lon``/``depth`` are parsed from the origin payloads
+    (``Incident created``, ``Origin updated``) and ``mag`` from ``Mag:`` /
+    ``Magnitude updated:``; the other rows leave them empty.
+    """
+    event_ids, lines = [], []
+    for path in paths:
+        found = read_timeline(path)
+        event_ids += [os.path.basename(path)[:-len('.log')].strip()] * len(found)
+        lines += found
+    columns = list(zip(*lines)) or [()] * 5
+
+    df = pd.DataFrame({
+        'event_id': pd.Series(event_ids, dtype=object),
+        'tstamp': pd.to_datetime(_decode(columns[0]), format="%Y/%m/%d %H:%M:%S.%f") - LOG_UTC_OFFSET,
+        'component': _decode(columns[1], category=True),
+        'level': _decode(columns[2], category=True),
+        'action': _decode(columns[3], category=True),
+        'message': _decode(columns[4]),
+    })
+    incident = df['component'] == 'Incident'
+    origin = df.loc[incident, 'message'].str.extract(ORIGIN_RE)
+    df['ot'] = pd.to_datetime(origin['ot'], format="%Y-%m-%d %H:%M:%S")
+    for col in ('lat', 'lon', 'depth'):
+        df[col] = pd.to_numeric(origin[col])
+    df['mag'] = pd.to_numeric(df.loc[incident, 'message'].str.extract(MAG_RE)['mag'])
+    return df[TIMELINE_COLUMNS]
+
+
+def timeline_metrics(timeline):
+    """Per-event milestones of a ``build_timeline`` table.
+
+    ``incident_created``, ``first_origin`` and ``final_magnitude`` (time of the
+    last magnitude update) with their lapse after OT in minutes, the final
+    magnitude and the number of origin / magnitude updates.
+    """
+    action = timeline['action']
+    by_event = timeline.groupby('event_id', sort=False)
+    mags = timeline.dropna(subset=['mag']).groupby('event_id', sort=False)
+
+    def first_time(name):
+        return timeline[action == name].groupby('event_id', sort=False)['tstamp'].min()
+
+    metrics = pd.DataFrame({
+        'ot': by_event['ot'].first(),
+        'incident_created': first_time('Incident created'),
+        'first_origin': first_time('Origin updated'),
+        'final_magnitude': mags['tstamp'].max(),
+        'mag_final': mags['mag'].last(),
+        'n_origin_updates': (action == 'Origin updated').groupby(timeline['event_id'], sort=False).sum(),
+        'n_magnitude_updates': (action == 'Magnitude updated').groupby(timeline['event_id'], sort=False).sum(),
+    })
+    for milestone in MILESTONES:
+        metrics[f'lapse_{milestone}'] = (metrics[milestone] - metrics['ot']).dt.total_seconds() / 60
+    return metrics.rename_axis('event_id').reset_index()
+
+
+def list_logs(root):
+    """{relative path: (size, mtime_ns)} of every log under ``root``."""
+    found = {}
+    for dirpath, _, names in os.walk(root):
+        for name in names:
+            if name.endswith('.log'):
+                stat = os.stat(os.path.join(dirpath, name))
+                found[os.path.relpath(os.path.join(dirpath, name), root)] = (stat.st_size, stat.st_mtime_ns)
+    return found
+
+
+def _read_batch(root, paths):
+    """Index columns of ``paths`` (relative to ``root``) as NumPy arrays ('' for NULL text),
+    plus [(path, error)] of the logs that could not be opened."""
+    n = len(paths)
+    tstamp, remark, error = (np.full(n, '', dtype=object) for _ in range(3))
+    size, mtime_ns = np.zeros(n, dtype=np.int64), np.zeros(n, dtype=np.int64)
+    readable = np.ones(n, dtype=bool)
+    unreadable = []
+    for i, path in enumerate(paths):
+        full = os.path.join(root, path)
+        try:
+            stat = os.stat(full)
+            size[i], mtime_ns[i] = stat.st_size, stat.st_mtime_ns
+            tstamp[i], remark[i] = read_first_incident(full)
+        except OSError as exc:
+            readable[i] = False
+            unreadable.append((path, f"{type(exc).__name__}: {exc}"))
+        except ValueError as exc:
+            error[i] = str(exc)
+    batch = {'path': np.array(paths, dtype=str),
+             'event_id': np.array([os.path.basename(p)[:-len('.log')].strip() for p in paths], dtype=str),
+             'tstamp': tstamp.astype(str), 'remark': remark.astype(str),
+             'size': size, 'mtime_ns': mtime_ns, 'error': error.astype(str)}
+    return {col: values[readable] for col, values in batch.items()}, unreadable
+
+
+def _executor():
+    """The scan pool, created on first use (call with ``_lock`` held)."""
+    global _pool
+    if _pool is None:
+        # spawn: forking the multi-threaded Streamlit server is not safe
+        _pool = ProcessPoolExecutor(SCAN_WORKERS, mp_context=get_context('spawn'))
+    return _pool
+
+
+def scan_logs(root, paths):
+    """Merged ``_read_batch`` columns of ``paths`` and [(path, error)] of the unreadable logs."""
+    global _pool
+    chunks = [paths[i:i + SCAN_CHUNK] for i in range(0, len(paths), SCAN_CHUNK)] or [[]]
+    results = None
+    if SCAN_WORKERS > 1 and len(paths) >= SCAN_INLINE:
+        try:
+            results = list(_executor().map(_read_batch, [root] * len(chunks), chunks))
+        except Exception:
+            log.exception("Pool pembaca log TOAST gagal, baca di proses utama")
+            _pool.shutdown(wait=False, cancel_futures=True)
+            _pool = None
+    if results is None:
+        results = [_read_batch(root, chunk) for chunk in chunks]
+    batches, unreadable = zip(*results)
+    columns = {col: np.concatenate([b[col] for b in batches]) for col in batches[0]}
+    return columns, [item for errors in unreadable for item in errors]
+
+
+def _nullable(values):
+    return [v or None for v in values.tolist()]
+
+
+def refresh_index():
+    """Bring the index up to date with ``TOAST_DIR``; returns the number of (re)read logs."""
+    root = str(TOAST_DIR)
+    with _lock, closing(_connect()) as con, con:
+        on_disk = list_logs(root)
+        known = {path: (size, mtime) for path, size, mtime in con.execute("SELECT path, size, mtime_ns FROM logs")}
+        gone = [(path,) for path in known.keys() - on_disk.keys()]
+        changed = [path for path, sig in on_disk.items() if known.get(path) != sig]
+
+        columns, unreadable = scan_logs(root, changed)
+        for path, reason in unreadable:
+            log.warning("Gagal membaca log TOAST %s: %s", path, reason)
+        failed = int(np.count_nonzero(columns['error']))
+        if failed:
+            log.warning("%d dari %d log TOAST tidak dapat di-parse, lihat index_errors()", failed, len(changed))
+
+        con.executemany("DELETE FROM logs WHERE path = ?", gone)
+        con.executemany("INSERT OR REPLACE INTO logs VALUES (?, ?, ?, ?, ?, ?, ?)", zip(
+            columns['path'].tolist(), columns['event_id'].tolist(), _nullable(columns['tstamp']),
+            _nullable(columns['remark']), columns['size'].tolist(), columns['mtime_ns'].tolist(),
+            _nullable(columns['error'])))
+    return len(columns['path'])
+
+
+def index_errors():
+    """path, event_id and error of the indexed logs that could not be parsed."""
+    with closing(_connect()) as con:
+        return pd.read_sql_query(
+            "SELECT path, event_id, error FROM logs WHERE error IS NOT NULL ORDER BY path", con)
+
+
+@st.cache_data(ttl=TOAST_TTL, show_spinner=False)
+def query_toast(start, end):
+    """event_id, tstamp_toast (UTC) and remark_toast of incidents between ``start`` and ``end`` (UTC)."""
+    refresh_index()
+    fmt = "%Y-%m-%d %H:%M:%S.%f"
+    with closing(_connect()) as con:
+        df = pd.read_sql_query(
+            "SELECT event_id, MIN(tstamp) AS tstamp_toast, remark AS remark_toast FROM logs "
+            "WHERE tstamp BETWEEN ? AND ? GROUP BY event_id ORDER BY tstamp_toast",
+            con, params=(pd.Timestamp(start).strftime(fmt), pd.Timestamp(end).strftime(fmt)),
+        )
+    df['tstamp_toast'] = pd.to_datetime(df['tstamp_toast'], format=fmt)
+    return df
+
+
+@st.cache_data(ttl=TOAST_TTL, show_spinner=False)
+def query_toast_metrics(start, end):
+    """``timeline_metrics`` of the logs whose first incident falls between ``start`` and ``end`` (UTC)."""
+    refresh_index()
+    fmt = "%Y-%m-%d %H:%M:%S.%f"
+    with closing(_connect()) as con:
+        paths = [os.path.join(TOAST_DIR, path) for path, in con.execute(
+            "SELECT path FROM logs WHERE tstamp BETWEEN ? AND ?",
+            (pd.Timestamp(start).strftime(fmt), pd.Timestamp(end).strftime(fmt)))]
+    return timeline_metrics(build_timeline(paths))
@@ -0,0 +1,144 @@
+"""👀 Live watcher on the TOAST log directory.
+
+A daemon thread polls ``TOAST_DIR`` every ``WATCH_INTERVAL`` seconds (size
+and mtime only, no OS notification API), reads just the bytes appended to
+each log since the previous poll and folds the complete lines into an
+in-memory per-event table with the same milestones as
+``monev.toast.timeline_metrics``. ``toast_watcher`` starts one watcher per
+process; pages read ``table()`` on every autorefresh.
+"""
+import datetime
+import logging
+import os
+import threading
+
+import pandas as pd
+import streamlit as st
+
+from monev.toast import LINE_RE, LOG_UTC_OFFSET, MAG_RE, MILESTONES, ORIGIN_RE, TOAST_DIR, list_logs
+
+WATCH_INTERVAL = 2.0
+WATCH_REFRESH_MS = 5000  # page autorefresh while live mode is on
+
+log = logging.getLogger(__name__)
+
+
+def _new_event():
+    return {'ot': None, 'incident_created': None, 'first_origin': None, 'final_magnitude': None,
+            'mag_final': None, 'n_origin_updates': 0, 'n_magnitude_updates': 0, 'last_line': None}
+
+
+class ToastWatcher:
+    """Tails the logs under ``root`` and keeps the per-event latency table up to date."""
+
+    def __init__(self, root=TOAST_DIR, interval=WATCH_INTERVAL):
+        self.root = str(root)
+        self.interval = interval
+        self.version = 0  # bumped whenever the table changes
+        self.last_poll = None
+        self._files = {}  # relative path -> {'offset': bytes consumed, 'sig': (size, mtime_ns)}
+        self._events = {}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name='toast-watcher', daemon=True)
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+
+    def _run(self):
+        while True:
+            try:
+                self.poll()
+            except Exception:
+                log.exception("Pemantauan log TOAST gagal")
+            if self._stop.wait(self.interval):
+                return
+
+    def poll(self):
+        """Read what was appended to every log since the last poll; returns the number of new lines."""
+        on_disk = list_logs(self.root)
+        changes = {}
+        for path in self._files.keys() - on_disk.keys():
+            changes[path] = None
+        for path, sig in on_disk.items():
+            state = self._files.get(path)
+            if state is not None and state['sig'] == sig:
+                continue
+            restart = state is None or sig[0] < state['offset']  # new, or truncated and rewritten
+            offset = 0 if restart else state['offset']
+            try:
+                with open(os.path.join(self.root, path), 'rb') as f:
+                    f.seek(offset)
+                    data = f.read()
+            except OSError as exc:
+                log.warning("Gagal membaca log TOAST %s: %s", path, exc)
+                continue
+            complete = data.rfind(b'\n') + 1  # a partial last line is read again next poll
+            changes[path] = (restart, offset + complete, sig, LINE_RE.findall(data[:complete]))
+
+        lines = 0
+        with self._lock:
+            for path, change in changes.items():
+                event_id = os.path.basename(path)[:-len('.log')].strip()
+                if change is None:
+                    self._files.pop(path, None)
+                    self._events.pop(event_id, None)
+                    continue
+                restart, offset, sig, found = change
+                self._files[path] = {'offset': offset, 'sig': sig}
+                if restart:
+                    self._events[event_id] = _new_event()
+                self._apply(self._events.setdefault(event_id, _new_event()), found)
+                lines += len(found)
+            if changes:
+                self.version += 1
+            self.last_poll = datetime.datetime.now(datetime.timezone.utc).replace(tzinfo=None)
+        return lines
+
+    @staticmethod
+    def _apply(event, lines):
+        for stamp, component, _, action, message in lines:
+            tstamp = datetime.datetime.strptime(stamp.decode(), "%Y/%m/%d %H:%M:%S.%f") - LOG_UTC_OFFSET
+            event['last_line'] = tstamp
+            if component != b'Incident':
+                continue
+            action = action.decode()
+            text = message.decode('utf-8', errors='replace')
+            if action == 'Incident created' and event['incident_created'] is None:
+                event['incident_created'] = tstamp
+            elif action == 'Origin updated':
+                event['n_origin_updates'] += 1
+                if event['first_origin'] is None:
+                    event['first_origin'] = tstamp
+            elif action == 'Magnitude updated':
+                event['n_magnitude_updates'] += 1
+            origin = ORIGIN_RE.search(text)
+            if origin and event['ot'] is None:
+                event['ot'] = datetime.datetime.strptime(origin['ot'], "%Y-%m-%d %H:%M:%S")
+            mag = MAG_RE.search(text)
+            if mag:
+                event['mag_final'], event['final_magnitude'] = float(mag['mag']), tstamp
+
+    def table(self):
+        """Per-event milestones (``timeline_metrics`` columns plus ``last_line``), newest incident first."""
+        with self._lock:
+            df = pd.DataFrame.from_dict(self._events, orient='index', columns=list(_new_event()))
+        df = df.rename_axis('event_id').reset_index()
+        for col in ('ot', 'last_line') + MILESTONES:
+            df[col] = pd.to_datetime(df[col])
+        df['mag_final'] = pd.to_numeric(df['mag_final'])
+        for milestone in MILESTONES:
+            df[f'lapse_{milestone}'] = (df[milestone] - df['ot']).dt.total_seconds() / 60
+        return df.sort_values('incident_created', ascending=False, ignore_index=True)
+
+
+@st.cache_resource(show_spinner=False)
+def toast_watcher():
+    """The process-wide ``ToastWatcher`` on ``TOAST_DIR``, started on first use."""
+    watcher = ToastWatcher()
+    watcher.poll()  # the first page render already sees the full table
+    return watcher.start()
@@ -1,15 +1,13 @@
-import math
-
 import streamlit as st
 import pandas as pd
 from fpdf import FPDF
 from io import BytesIO
-import requests
-from bs4 import BeautifulSoup
 import datetime
-from re import findall, sub
 from math import hypot
 from calendar import monthrange
+from monev.feeds import LAST, load_feed
+from monev.narasi import fetch_narratives, narasi_archive, parse_narratives
+from monev.timeparse import WIB
 
 # 🌐 Page Config
 st.set_page_config(page_title='Earthquake Press Releases', layout='wide', page_icon='📰')
@@ -37,84 +35,51 @@ dat_sta_def = datetime.datetime(
 )
 dat_sta_str = st.sidebar.date_input("Start Date", dat_sta_def)
 dat_end_str = st.sidebar.date_input("End Date", dat_end_def)
+use_archive = st.sidebar.checkbox(
+    "Sertakan arsip narasi", value=False,
+    help="Tambahkan narasi tersimpan di luar jendela 30 event feed InaTEWS")
 #st.sidebar.text_input(
 #    'End DateTime:',
 #    datetime.datetime.today().strftime("%Y-%m-%d %H:%M:%S")
 #)
 
 try:
-    time_start = pd.to_datetime(dat_sta_str)
-    time_end   = pd.to_datetime(dat_end_str)
+    time_start = pd.to_datetime(dat_sta_str).tz_localize(WIB)
+    time_end   = pd.to_datetime(dat_end_str).tz_localize(WIB)
 except Exception:
     st.error("❌ Invalid datetime format. Please use YYYY-MM-DD HH:MM:SS")
     st.stop()
 
 # --- Helper Functions ---
-def extract_text(tag, soup):
-    return [t.text.strip() for t in soup.find_all(tag)]
-
-def parse_timesent(ts):
-    ts = ts.strip().replace('WIB','').replace('UTC','')
-    for fmt in ["%d/%m/%Y %H:%M:%S", "%d-%b-%y %H:%M:%S", "%Y-%m-%d %H:%M:%S"]:
-        try:
-            return pd.to_datetime(ts, format=fmt)
-        except:
-            continue
-    return pd.NaT
-
 def convert_datetime_column(df, source_col, target_col):
     df[target_col] = df[source_col].apply(
         lambda x: x.strftime("%Y%m%d%H%M%S") if pd.notnull(x) else None
     )
     return df
 
-def fetch_narasi_text(time_narasi):
-    url = f"https://bmkg-content-inatews.storage.googleapis.com/{time_narasi}_narasi.txt"
-    try:
-        response = requests.get(url, timeout=10)
-        response.raise_for_status()
-        return response.text.strip()
-    except Exception:
-        return None
-
-
-def html_to_text(html_content):
-    if html_content:
-        soup = BeautifulSoup(html_content, "html.parser")
-        return sub(
-            r"((?<=\W)\n)|(\n(?=TIDAK BERPOTENSI TSUNAMI))",
-            " ",
-            sub(
-                r"((?<=\()\n)|(\n(?=\W))|( (?=[,.;:)]))|((?<=[(] ))",
-                "",
-                soup.get_text(separator="\n", strip=True)
-            )
-        ).replace("* ", "\n")
-    return None
-
-
 def build_narasi_dataframe(df, time_col="time_narasi"):
-    df["narasi_html"] = df[time_col].apply(fetch_narasi_text).apply(
-        lambda x: sub(r"</?strong>", "", y) if (y := x) else x
-    )
-    df["narasi_text"] = df["narasi_html"].apply(html_to_text)
-    return df
+    narratives = fetch_narratives(df[time_col].tolist())
+    df["narasi_html"] = df[time_col].map(narratives.get)
+    return df.join(parse_narratives(df["narasi_html"]))
 
 
 # COLUMN NAMES!
 tim_co0 = "timesent"
 nar_co0 = "narasi_text"
 
-# --- Fetch and Parse XML ---
-url_pre = 'https://bmkg-content-inatews.storage.googleapis.com/last30event.xml'
-sou_pre = BeautifulSoup(requests.get(url_pre).text, 'html')
-tim_pre = extract_text(tim_co0, sou_pre)
+# --- Fetch and Parse XML (shared, typed feed; fetched once for both tables) ---
+df_feed = load_feed(LAST)
+if df_feed.empty:
+    st.error("⚠️ Gagal memuat feed InaTEWS.")
+    st.stop()
 
 # --- Build DataFrame ---
-df = pd.DataFrame({
-    tim_co0: [parse_timesent(n) for n in tim_pre]
-}).sort_values(by=tim_co0)
+df = df_feed[[tim_co0]].sort_values(by=tim_co0)
 df = convert_datetime_column(df, tim_co0, "time_narasi")
+if use_archive:
+    df_archive = narasi_archive(time_start, time_end)[[tim_co0, "time_narasi"]]
+    df_archive = df_archive[~df_archive["time_narasi"].isin(df["time_narasi"])]
+    df = pd.concat([df_archive, df], ignore_index=True).sort_values(by=tim_co0)
 df = build_narasi_dataframe(df, time_col="time_narasi")
 
 # --- Filter by Time Range ---
@@ -132,50 +97,29 @@ lat_co1 = "Latitude (°N)"
 lon_co1 = "Longitude (°E)"
 dep_co1 = "Depth (km)"
 mag_co1 = "Magnitude"
+mmi_co1 = "Felt (MMI)"
+tsu_co1 = "Tsunami"
 nar_co1 = "Narration Text"
 
-
-def lat_ett(data: pd.DataFrame):
-    return [
-        [(-1 if o[-1] == "S" else 1) * float(
-            sub(r"° L.", "", o).replace(",", ".")
-        ) for o in findall(r"[^ ]+ L[US]", n)][0]
-        if n is not None else math.nan for n in data[nar_co0].tolist()
-    ]
-
-
-def lon_ett(data: pd.DataFrame):
-    return [
-        [(-1 if o[-1] == "B" else 1) * float(
-            sub(r"° B.", "", o).replace(",", ".")
-        ) for o in findall(r"[^ ]+ B[TB]", n)][0]
-        if n is not None else math.nan for n in data[nar_co0].tolist()
-    ]
-
-
-def dep_ett(data: pd.DataFrame):
-    return [
-        float(findall(r"(?<=kedalaman )[^ ]+(?= km)", n)[0].replace(",", "."))
-        if n is not None else math.nan for n in data[nar_co0].tolist()
-    ]
-
-
-def mag_ett(data: pd.DataFrame):
-    return [
-        float((findall(r"magnitudo M?(?=([^.]+))", n))[0].replace(",", "."))
-        if n is not None else math.nan for n in data[nar_co0].tolist()
-    ]
-
-
-# PARSING!
-df.insert(1, lat_co1, lat_ett(df))
-df.insert(2, lon_co1, lon_ett(df))
-df.insert(3, dep_co1, dep_ett(df))
-df.insert(4, mag_co1, mag_ett(df))
+# PARSING! (lat/lon/depth/mag/MMI/tsunami come from parse_narratives)
+df = df.rename(columns={
+    "lat": lat_co1,
+    "lon": lon_co1,
+    "depth": dep_co1,
+    "mag": mag_co1,
+    "mmi": mmi_co1,
+    "tsunami": tsu_co1,
+})[[tim_co0, lat_co1, lon_co1, dep_co1, mag_co1, mmi_co1, tsu_co1, "time_narasi", "narasi_html", nar_co0, "parsed"]]
+df_unparsed = df[df["narasi_html"].notna() & ~df["parsed"]]
+if len(df_unparsed):
+    st.warning(f"⚠️ {len(df_unparsed)} narasi tidak dapat di-parse lengkap dan tidak dihitung dalam akurasi: "
+               + ", ".join(df_unparsed[tim_co0].astype(str)))
+if df["narasi_html"].isna().any():
+    st.info(f"ℹ️ {df['narasi_html'].isna().sum()} narasi belum tersedia.")
 
 # 🧾 Styled Table View
 st.subheader("🧾 Press Release InaTEWS Table View")
-df_display = df.copy().drop(columns=["time_narasi", "narasi_html"])
+df_display = df.copy().drop(columns=["time_narasi", "narasi_html", "parsed"])
 df_display.index = range(1, len(df_display) + 1)
 df_display.reset_index(inplace=True)
 df_display.rename(columns={
@@ -201,11 +145,7 @@ def generate_pdf(df):
         pdf.multi_cell(0, 8, txt=text)
         pdf.ln(1)
 
-    buffer = BytesIO()
-    pdf_bytes = pdf.output(dest='S').encode('latin1')
-    buffer.write(pdf_bytes)
-    buffer.seek(0)
-    return buffer
+    return BytesIO(bytes(pdf.output()))
 
 
 pdf_data = generate_pdf(df_display)
@@ -217,22 +157,6 @@ st.download_button(
 )
 
 
-def lat_prs(lat):
-    return -float(lat.replace('LS', '').strip()) \
-        if 'LS' in lat \
-        else float(lat.replace('LU', '').strip())
-
-
-def lon_prs(lon):
-    return -float(lon.replace('BB', '').strip()) \
-        if 'BB' in lon \
-        else float(lon.replace('BT', '').strip())
-
-
-def dep_prs(dep):
-    return float(sub(r" [Kk]m", "", dep))
-
-
 # COLUMN NAMES!
 lat_co2 = "Dis y (°N)"
 lon_co2 = "Dis x (°E)"
@@ -248,24 +172,23 @@ mag_co4 = "Dif M"
 
 # COMPARISONS!
 st.subheader("🧾 Dissemination vs. Press Release Parameter Comparison")
-url_dis = 'https://bmkg-content-inatews.storage.googleapis.com/last30event.xml'
-sou_dis = BeautifulSoup(requests.get(url_dis).text, 'html')
 dtf_dis = pd.merge(
-    left=pd.DataFrame({
-        tim_co1: [parse_timesent(n) for n in extract_text(tim_co0, sou_dis)],
-        lat_co2: [lat_prs(n) for n in extract_text('latitude', sou_dis)],
-        lon_co2: [lon_prs(n) for n in extract_text('longitude', sou_dis)],
-        dep_co2: [dep_prs(n) for n in extract_text('depth', sou_dis)],
-        mag_co2: [float(n) for n in extract_text('magnitude', sou_dis)],
-    }),
+    left=df_feed.rename(columns={
+        tim_co0: tim_co1,
+        'lat': lat_co2,
+        'lon': lon_co2,
+        'depth': dep_co2,
+        'mag': mag_co2,
+    })[[tim_co1, lat_co2, lon_co2, dep_co2, mag_co2]],
     right=df_display.rename(columns={
         lat_co1: lat_co3,
         lon_co1: lon_co3,
         dep_co1: dep_co3,
         mag_co1: mag_co3
-    }).drop(columns=[nar_co1]),
+    }).drop(columns=[nar_co1, mmi_co1, tsu_co1]),
     on=tim_co1
 ).sort_values(by=tim_co1)
+dtf_dis = dtf_dis.dropna(subset=[lat_co3, lon_co3, dep_co3, mag_co3])  # unparsed narratives are flagged above
 idc_dis = dtf_dis.pop(ind_co1)
 dtf_dis.insert(0, ind_co1, idc_dis)
 dtf_dis.insert(1, "Date Sent", dtf_dis[tim_co1].dt.date)
@@ -2,15 +2,16 @@
 # Created by Indra Gunawan
 
 import streamlit as st
-import requests, numpy as np, pandas as pd, geopandas as gpd
-from bs4 import BeautifulSoup
+import numpy as np, pandas as pd
 from PIL import Image
 import matplotlib.pyplot as plt
 import cartopy.crs as ccrs
-import cartopy
-from cartopy.io.shapereader import Reader
 import datetime
 from calendar import monthrange
+from monev.catalog import query_qc
+from monev.basemap import base_map, layer_colors
+from monev.geometry import ISLANDS
+from monev.regions import ISLAND_LABELS, region_members
 
 # 🌍 Page Config
 st.set_page_config(page_title='Earthquake Dashboard', layout='wide', page_icon='🌋')
@@ -48,59 +49,12 @@ col5, col6 = st.sidebar.columns(2)
 Mmin = float(col5.text_input('Min Mag.', '0.5'))
 Mmax = float(col6.text_input('Max Mag', '9.5'))
 
-# 🔎 Load Earthquake Catalog (with robust HTML fallback)
-@st.cache_data(show_spinner=False)
-def fetch_qc(url):
-    try:
-        response = requests.get(url)
-        text = response.text.strip()
-        if "|" in text:
-            rows = [line.split('|') for line in text.split('\n') if line]
-        else:
-            soup = BeautifulSoup(text, 'html.parser')
-            if soup.p and soup.p.text:
-                rows = [line.split('|') for line in soup.p.text.split('\n') if line]
-            else:
-                return pd.DataFrame()
-        columns = ['event_id','date_time','mode','status','phase','mag','type_mag',
-                   'n_mag','azimuth','rms','lat','lon','depth','type_event','remarks']
-        return pd.DataFrame([dict(zip(columns, row)) for row in rows[1:-2]])
-    except Exception:
-        return pd.DataFrame()
-
-df = fetch_qc("http://202.90.198.41/qc.txt")
-if df.empty:
+# 🔎 Load & Filter Earthquake Catalog (qc.txt + local year/month archive)
+df = query_qc(tim_sta, tim_end, South, North, West, East, Mmin, Mmax)
+if df is None:
     st.error("⚠️ Failed to retrieve or parse earthquake data from source.")
     st.stop()
 
-# 🔄 Data Cleaning & Conversion
-def preprocess(df):
-    lat_num = df['lat'].str.extract(r'([\d.]+)')[0].astype(float)
-    lat_sign = df['lat'].str.contains('S').apply(lambda x: -1 if x else 1)
-    df['fixedLat'] = lat_num * lat_sign
-
-    lon_num = df['lon'].str.extract(r'([\d.]+)')[0].astype(float)
-    lon_sign = df['lon'].str.contains('W').apply(lambda x: -1 if x else 1)
-    df['fixedLon'] = lon_num * lon_sign
-
-    df['fixedDepth'] = df['depth'].str.replace('km', '').astype(float)
-    df['mag'] = df['mag'].astype(float)
-    df['sizemag'] = df['mag'] * 1000
-    df['date_time'] = pd.to_datetime(df['date_time'])
-
-    return df
-
-
-df = preprocess(df)
-
-# 🧹 Filter Data
-df = df[
-    (df.date_time.between(tim_sta, tim_end)) &
-    (df.fixedLat.between(South, North)) &
-    (df.mag.between(Mmin,Mmax)) &
-    (df.fixedLon.between(West, East))
-    ]
-
 # 🗺️ Plot Map
 st.subheader("🗺️ Earthquake Map")
 st.map(df, latitude="fixedLat", longitude="fixedLon", size="sizemag", zoom=3)
@@ -211,60 +165,27 @@ fig_pie.update_layout(
 st.subheader("🥧 Magnitude Class Distribution (3D Style)")
 st.plotly_chart(fig_pie, use_container_width=True)
 
-# 📍 Load Island Shapefiles
-def load_clip(name):
-    return gpd.read_file(f"{name}_Area.shp")
-
-def clip_df(df, island):
-    geo_df = gpd.GeoDataFrame(df, geometry=gpd.points_from_xy(df.fixedLon, df.fixedLat), crs="EPSG:4326")
-    return geo_df.clip(load_clip(island))
-
-# 📍 Convert to GeoDataFrame
-gpd_seis = gpd.GeoDataFrame(df, geometry=gpd.points_from_xy(df.fixedLon, df.fixedLat), crs="EPSG:4326")
+# 📍 Assign every event to its island region(s) in one pass
+df_island = region_members(df, 'island')
 
 # 🔁 Island setup
-list_pulau = ['Sumatra','Jawa','Bali-A','Nustra','Kalimantan','Sulawesi','Maluku','Papua']
-list_color = ['r','g','b','y','c','m','purple','orange']
+list_pulau = ISLANDS
+list_color = layer_colors('island')
 projection = ccrs.PlateCarree(central_longitude=120.0)
 
-# 📦 Extract clipped coordinates per island
-def get_eq_coords(pulau_name):
-    try:
-        polygon = gpd.read_file(f"{pulau_name}_Area.shp")
-        clipped = gpd_seis.clip(polygon)
-        a = np.array(clipped.fixedLon)
-        b = np.array(clipped.fixedLat)
-        x, y, _ = projection.transform_points(ccrs.Geodetic(), a, b).T
-        return x, y
-    except Exception as e:
-        st.warning(f"Gagal memproses data untuk {pulau_name}: {e}")
-        return [], []
+# 📦 Projected coordinates per island
+def get_eq_coords(clipped):
+    x, y, _ = projection.transform_points(ccrs.Geodetic(), np.array(clipped.fixedLon), np.array(clipped.fixedLat)).T
+    return x, y
 
 # 🖼️ Set up figure
-fig = plt.figure(dpi=300)
-ax = fig.add_subplot(111, projection=projection)
-ax.set_extent((85, 145, -15, 10))
+fig, ax = base_map('island', list_color)
 
 # 🌀 Plot per island
-for i, pulau in enumerate(list_pulau):
-    x, y = get_eq_coords(pulau)
+for i, (pulau, clipped) in enumerate(df_island.groupby('island', observed=False)):
+    x, y = get_eq_coords(clipped)
     ax.scatter(x, y, s=5, color=list_color[i], marker="o", label=pulau, zorder=3)
 
-    try:
-        ax.add_geometries(
-            Reader(f"{pulau}_Area.shp").geometries(),
-            ccrs.PlateCarree(),
-            facecolor="white",
-            edgecolor=list_color[i],
-            linewidth=0.5
-        )
-    except Exception as e:
-        st.warning(f"Gagal memuat shapefile untuk {pulau}: {e}")
-
-# 🗺️ Base map features
-ax.add_feature(cartopy.feature.BORDERS, linestyle='-', linewidth=0.5, alpha=0.5)
-ax.coastlines(resolution='10m', color='black', linestyle='-', linewidth=0.5, alpha=0.5)
-
 # 📍 Custom legend below map (2-row grid)
 from matplotlib.lines import Line2D
 
@@ -298,9 +219,8 @@ def stats(df):
     ]
 
 # 🔁 Compute Stats Per Island
-regions = ['Sumatra','Jawa','Bali-A','Nustra','Kalimantan','Sulawesi','Maluku','Papua']
-labels = ['SUMATRA','JAWA','BALI','NUSA TENGGARA','KALIMANTAN','SULAWESI','MALUKU','PAPUA']
-stat_rows = [stats(clip_df(df, reg)) for reg in regions]
+labels = ISLAND_LABELS
+stat_rows = [stats(clipped) for _, clipped in df_island.groupby('island', observed=False)]
 columns = ['<60 km','60–300 km','>300 km','M<4','M4–5','M≥5','Total']
 stat_df = pd.DataFrame(stat_rows, columns=columns)
 stat_df['Wilayah'] = labels
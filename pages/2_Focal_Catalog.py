@@ -8,14 +8,19 @@ import requests, datetime
 import matplotlib.pyplot as plt
 import cartopy.crs as ccrs
 import cartopy.feature as cfeature
-import os, base64, warnings
-from obspy.imaging.beachball import beach, beachball
-from PIL import Image
-from fpdf import FPDF
+import warnings
 import folium
 from streamlit_folium import st_folium
 import contextily as cx
+from streamlit_autorefresh import st_autorefresh
+from streamlit_pdf_viewer import pdf_viewer
 from calendar import monthrange
+from monev.basemap import use_offline_natural_earth
+from monev.beachball import add_beachballs
+from monev.coords import coords
+from monev.gcmt import load_gcmt
+from monev.report import report_job, report_key, submit_report
+from monev.tiles import basemap_source
 
 warnings.filterwarnings("ignore")
 
@@ -84,14 +89,8 @@ cols = base_cols + [f'extra_{i}' for i in range(max(0, len(rows[0]) - len(base_c
 df = pd.DataFrame(rows[1:], columns=cols)
 
 
-def fix_coord(val, axis):
-    val = val.strip()
-    return -float(val.strip('S')) if val.endswith('S') else float(val.strip('N')) if axis == 'lat' else \
-        -float(val.strip('W')) if val.endswith('W') else float(val.strip('E'))
-
-
-df['fixedLat'] = df['lat'].apply(lambda x: fix_coord(x, 'lat'))
-df['fixedLon'] = df['lon'].apply(lambda x: fix_coord(x, 'lon'))
+df['fixedLat'] = coords(df['lat'], axis='lat')
+df['fixedLon'] = coords(df['lon'], axis='lon')
 df['date_time'] = pd.to_datetime(df['date_time'], errors='coerce')
 df['Tanggal'] = df['date_time'].dt.strftime('%d-%b-%y')  # Example: 04-Jun-25
 df['Waktu'] = df['date_time'].dt.strftime('%H:%M:%S')  # Example: 06:38:40
@@ -109,7 +108,7 @@ df = df[
 
 # st.dataframe(df)
 
-def get_color(depth): return 'r' if depth <= 60 else 'yellow' if depth <= 300 else 'g'
+def get_color(depth): return np.where(depth <= 60, 'r', np.where(depth <= 300, 'yellow', 'g'))
 
 
 def get_width(e, w): return max(0.3, min(1.5, 0.03 * abs(e - w)))
@@ -119,7 +118,12 @@ w = get_width(East, West)
 
 # 🗺️ BMKG Map
 st.markdown(f"### 🌋 BMKG Focal Mechanism Map\n{tim_sta} – {tim_end}")
-tls = "https://services.arcgisonline.com/arcgis/rest/services/Ocean/World_Ocean_Base/MapServer/tile/{z}/{y}/{x}"
+try:
+    use_offline_natural_earth()  # coastlines / borders of both maps
+except FileNotFoundError as exc:
+    st.error(f"❌ {exc}")
+    st.stop()
+tls = basemap_source()
 prj_map_1 = ccrs.Mercator()
 prj_dat_1 = ccrs.PlateCarree()
 fig_1 = plt.figure(dpi=300)
@@ -128,17 +132,12 @@ axi_1.set_extent((West, East, South - 0.5, North + 0.5), crs=prj_dat_1)
 axi_1.add_feature(cfeature.BORDERS, linestyle='-', linewidth=0.5, alpha=0.5)
 axi_1.coastlines(resolution='10m', color='black', linewidth=0.5, alpha=0.5)
 cx.add_basemap(axi_1, source=tls, crs=prj_map_1.proj4_init)
-for _, x in df.iterrows():
-    if pd.notnull(x["S1"]) and pd.notnull(x["D1"]) and pd.notnull(x["R1"]):
-        axi_1.add_collection(beach(
-            [x["S1"], x["D1"], x["R1"]],
-            xy=prj_map_1.transform_point(x["fixedLon"], x["fixedLat"], prj_dat_1),
-            width=int(w * 100000),
-            linewidth=0.5,
-            alpha=0.625,
-            zorder=10,
-            facecolor=get_color(x["depth"])
-        ))
+add_beachballs(
+    axi_1, df["fixedLon"], df["fixedLat"], df["S1"], df["D1"], df["R1"],
+    width=int(w * 100000),
+    facecolor=get_color(df["depth"]),
+    data_crs=prj_dat_1,
+)
 st.pyplot(fig_1)
 
 # 📊 Summary Table
@@ -153,189 +152,42 @@ st.dataframe(summary_df)
 
 # st.dataframe(df)
 
-# 📷 Generate Beachball Images
-def generate_beachballs(df, prefix="cmt"):
-    images = []
-    for idx, row in df.iterrows():
-        if all(pd.notnull(row[col]) for col in ['Strike NP1', 'Dip NP1', 'Rake NP1']):
-            mt = [row['Strike NP1'], row['Dip NP1'], row['Rake NP1']]
-            # ⚙️ High-res settings
-            fig = beachball(mt, facecolor=get_color(row['Depth']))
-            fig.set_size_inches(5, 5)  # Increase figure size
-            fig.figure.set_dpi(300)  # Higher DPI (default is ~100)
-
-            # fig = beachball(mt, facecolor=get_color(row['Depth']))
-            path = f"{prefix}_{idx}.png"
-            fig.savefig(path)
-            plt.close(fig.figure)
-            images.append(path)
-        else:
-            images.append("")
-    return images
-
-
-report_df = summary_df.copy()
-report_df.index = range(len(report_df))
-report_df['Focal'] = generate_beachballs(report_df)
-
-
-# ───────────────────────────────────────
-# 📄 Export to PDF with custom widths
-# ───────────────────────────────────────
-
-def export_to_pdf(df, filename="focal_report.pdf"):
-    pdf = FPDF(orientation='L')
-    pdf.set_auto_page_break(auto=True, margin=10)
-    pdf.add_page()
-    pdf.set_font("Arial", size=8)
-
-    cols = ['Tanggal', 'Waktu', 'Magnitude', 'Type Magnitude', 'Latitude', 'Longitude', 'Depth',
-            'Strike NP1', 'Dip NP1', 'Rake NP1', 'Strike NP2', 'Dip NP2', 'Rake NP2', 'Remark']
-    col_widths = {
-        'Tanggal': 15, 'Waktu': 15, 'Magnitude': 18, 'Type Magnitude': 22,
-        'Latitude': 20, 'Longitude': 20, 'Depth': 12,
-        'Strike NP1': 15, 'Dip NP1': 12, 'Rake NP1': 15,
-        'Strike NP2': 15, 'Dip NP2': 12, 'Rake NP2': 15,
-        'Remark': 50, 'Focal': 20
-    }
-
-    # Draw header
-    for col in cols:
-        pdf.cell(col_widths[col], 10, col, border=1, align='C')
-    pdf.cell(col_widths['Focal'], 10, "Beachball", border=1, align='C')
-    pdf.ln()
-
-    # Draw rows
-    for _, row in df.iterrows():
-        for col in cols:
-            val = str(row[col])[:30]
-            pdf.cell(col_widths[col], 10, val, border=1, align='C')
-
-        # Add beachball image
-        img_path = row['Focal']
-        if img_path and os.path.exists(img_path):
-            thumb_path = f"thumb_{os.path.basename(img_path)}"
-            img = Image.open(img_path)
-            img.thumbnail((25, 25))
-            img.save(thumb_path)
-
-            x = pdf.get_x()
-            y = pdf.get_y()
-            pdf.cell(col_widths['Focal'], 10, '', border=1)
-            pdf.image(thumb_path, x + 2, y + 2, h=8)
-        else:
-            pdf.cell(col_widths['Focal'], 10, "N/A", border=1, align='C')
-
-        pdf.ln()
-
-    pdf.output(filename)
-
-
-export_to_pdf(report_df)
-
-
-# 📎 Show PDF inline
-def show_pdf(path):
-    if os.path.exists(path):
-        with open(path, "rb") as f:
-            b64 = base64.b64encode(f.read()).decode("utf-8")
-        st.markdown(f'<iframe src="data:application/pdf;base64,{b64}" width="100%" height="900"></iframe>',
-                    unsafe_allow_html=True)
-    else:
-        st.warning("⚠️ PDF not found.")
-
-
-show_pdf("focal_report.pdf")
-
-# Show download button
-with open("focal_report.pdf", "rb") as f:
-    st.download_button("⬇️ Download PDF Report", f.read(), file_name="focal_report.pdf", mime="application/pdf")
+# 📄 PDF report, built in the background only when requested
+st.markdown("### 📄 Laporan PDF")
+report_df = summary_df.reset_index(drop=True)
+report_colors = get_color(report_df['Depth'])
+key = report_key(report_df, report_colors)
+job = report_job(key)
+if job is None:
+    if st.button("📄 Buat Laporan PDF"):
+        submit_report(report_df, report_colors)
+        st.rerun()
+elif not job.done():
+    st.info("⏳ Laporan PDF sedang dibuat, halaman akan diperbarui otomatis…")
+    st_autorefresh(interval=2000, key="focal_report_poll")
+elif job.exception() is not None:
+    st.error(f"❌ Gagal membuat laporan PDF: {job.exception()}")
+    if st.button("🔁 Coba Lagi"):
+        submit_report(report_df, report_colors)
+        st.rerun()
+else:
+    pdf_bytes = job.result()
+    st.download_button("⬇️ Download PDF Report", pdf_bytes, file_name="focal_report.pdf", mime="application/pdf")
+    with st.expander("👁️ Pratinjau PDF"):
+        pdf_viewer(pdf_bytes, height=900)
 
 # 🌐 Global CMT Section
 st.markdown(f"### 🌎 Peta Global CMT Harvard\n{cmt_start} – {cmt_end}")
 
 
-def load_cmt(url):
-    txt = requests.get(url).text
-    lines = txt.split("\n")
-    records = [lines[i:i + 5] for i in range(0, len(lines), 5)]
-    rows = []
-    for rec in records:
-        if len(rec) < 5: continue
-        dt = f"{rec[0][5:15]} {rec[0][16:26]}"
-        row = {
-            'Datetime': dt,
-            'Lat': float(rec[0][27:33]),
-            'Lon': float(rec[0][34:41]),
-            'Depth': float(rec[0][42:47]),
-            'Mag_mb': float(rec[0][48:51]),
-            'Mag_Ms': float(rec[0][52:55]),
-            'S1': float(rec[4][57:60]),
-            'D1': float(rec[4][61:64]),
-            'R1': float(rec[4][65:69])
-        }
-        rows.append(row)
-    return pd.DataFrame(rows)
-
-
-from obspy.imaging.beachball import beach
-
-
-def draw_beachballs(df, ax, projection, depth_col='Depth', lon_col='Lon', lat_col='Lat', scale=1.0):
-    for _, row in df.iterrows():
-        if all(pd.notnull(row[col]) for col in ['S1', 'D1', 'R1']):
-            x, y = projection.transform_point(row[lon_col], row[lat_col], ccrs.PlateCarree())
-            color = "r" if row[depth_col] < 60 else "y" if row[depth_col] < 300 else "g"
-            bb = beach([row['S1'], row['D1'], row['R1']],
-                       xy=(x, y), width=scale,
-                       linewidth=0.5, alpha=0.625,
-                       zorder=10, facecolor=color)
-            ax.add_collection(bb)
-
-
-from datetime import datetime, timedelta
-
-base_url = "https://www.ldeo.columbia.edu/~gcmt/projects/CMT/catalog/NEW_MONTHLY"
-
-# Define start and end
-start = datetime(2021, 1, 1)
-end = datetime(2025, 11, 1)
-
-# Month abbreviations used in filenames
-month_map = {
-    1: "jan", 2: "feb", 3: "mar", 4: "apr",
-    5: "may", 6: "jun", 7: "jul", 8: "aug",
-    9: "sep", 10: "oct", 11: "nov", 12: "dec"
-}
-
-urls_a = []
-current = start
-while current <= end:
-    year = current.year
-    month = current.month
-    # last two digits of year
-    yy = str(year)[-2:]
-    # month abbreviation
-    mm = month_map[month]
-    filename = f"{mm}{yy}.ndk"
-    url = f"{base_url}/{year}/{filename}"
-    urls_a.append(url)
-    # move to next month
-    if month == 12:
-        current = datetime(year + 1, 1, 1)
-    else:
-        current = datetime(year, month + 1, 1)
-
-# Historical bulk files
-urls_b = [
-    "https://www.ldeo.columbia.edu/~gcmt/projects/CMT/catalog/jan76_dec20.ndk",
-    "https://www.ldeo.columbia.edu/~gcmt/projects/CMT/catalog/PRE1976/deep_1962-1976.ndk",
-    "https://www.ldeo.columbia.edu/~gcmt/projects/CMT/catalog/PRE1976/intdep_1962-1975.ndk"
-]
-urls = urls_a + urls_b
-#urls = urls_a 
+def draw_beachballs(df, ax, depth_col='Depth', lon_col='Lon', lat_col='Lat', scale=1.0):
+    depth = df[depth_col]
+    add_beachballs(ax, df[lon_col], df[lat_col], df['S1'], df['D1'], df['R1'], width=scale,
+                   facecolor=np.where(depth < 60, 'r', np.where(depth < 300, 'y', 'g')))
+
 
-df_cmt = pd.concat([load_cmt(url) for url in urls])
+# 📥 Global CMT history from the local NDK mirror (bulk 1962–2020 + monthly files)
+df_cmt = load_gcmt()
 
 df_cmt['Datetime'] = pd.to_datetime(df_cmt['Datetime'], errors='coerce')
 #df_cmt = df_cmt[
@@ -365,7 +217,6 @@ cx.add_basemap(axi_2, source=tls, crs=prj_map_2.proj4_init)
 draw_beachballs(
     df_cmt,
     axi_2,
-    axi_2.projection,
     depth_col='Depth',
     lon_col='Lon',
     lat_col='Lat',
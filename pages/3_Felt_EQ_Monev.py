@@ -1,12 +1,14 @@
 
-import requests
-from bs4 import BeautifulSoup
 import pandas as pd
 import streamlit as st
 import folium
 from streamlit_folium import st_folium
 import datetime
 from calendar import monthrange
+from monev.feeds import FELT, load_feed
+from monev.markers import EventLayer, depth_rule
+from monev.timeparse import WIB
+from monev.tiles import TILE_ATTR, folium_tiles
 
 # --- Page Setup ---
 st.set_page_config(page_title='TSP Monitoring dan Evaluasi', layout='wide', page_icon="🌍")
@@ -44,88 +46,29 @@ time_end = st.sidebar.text_input('End DateTime:', yesterday_str)
 #time_start = st.sidebar.text_input('Start DateTime:', '1960-06-01 00:00:00')
 #time_end   = st.sidebar.text_input('End DateTime:', '2025-06-30 23:59:59')
 
-# --- Helper Functions ---
-def extract_text(tag): return [t.text.strip() for t in soup.find_all(tag)]
-
-def parse_date_time(date_str, time_str):
-    combo = f"{date_str.strip()} {time_str.strip().replace('WIB','').replace('UTC','')}"
-    for fmt in ["%d-%m-%y %H:%M:%S", "%d-%m-%Y %H:%M:%S", "%d-%b-%y %H:%M:%S"]:
-        try:
-            return pd.to_datetime(combo, format=fmt)
-        except ValueError:
-            continue
-    return pd.NaT
-
-
-def parse_timesent(ts):
-    ts = ts.strip().replace('WIB','').replace('UTC','')
-    for fmt in ["%d/%m/%Y %H:%M:%S", "%d-%b-%y %H:%M:%S", "%Y-%m-%d %H:%M:%S"]:
-        try: return pd.to_datetime(ts, format=fmt)
-        except: continue
-    return pd.NaT
-
-def convert_lat(lat): return -float(lat.replace('LS','').strip()) if 'LS' in lat else float(lat.replace('LU','').strip())
-def convert_lon(lon): return -float(lon.replace('BB','').strip()) if 'BB' in lon else float(lon.replace('BT','').strip())
-
-# --- Fetch and Parse XML ---
-url = 'https://bmkg-content-inatews.storage.googleapis.com/last30feltevent.xml'
-soup = BeautifulSoup(requests.get(url).text, 'html')
-
-timesent  = extract_text('timesent')
-lats      = extract_text('latitude')
-lons      = extract_text('longitude')
-mags      = extract_text('magnitude')
-depths    = extract_text('depth')
-areas  = extract_text('area')
-felts  = extract_text('felts')
-
-# --- Build DataFrame with Validated Parsing ---
-df = pd.DataFrame({
-    'timesent': [parse_timesent(ts) for ts in timesent],
-    'lat': list(map(convert_lat, lats)),
-    'lon': list(map(convert_lon, lons)),
-    'mag': mags,
-    'depth': depths
-    #'felt': felts
-})
-
-dates     = extract_text('date')
-times     = extract_text('time')
-
-def format_date_str(d):
-    parts = d.strip().split('-')  # e.g. "14-07-25"
-    if len(parts) == 3:
-        day, month, year = parts
-        year = '20' + year if len(year) == 2 else year  # Safeguard against YY
-        return f"{day}/{month}/{year}"
-    return d  # fallback
-
-# Clean time: remove "WIB" or "UTC" and strip
-clean_time = [t.replace('WIB', '').replace('UTC', '').strip() for t in times]
-clean_date = [format_date_str(d) for d in dates]
-
-# Combine and convert to datetime
-combined_dt = [f"{d} {t}" for d, t in zip(clean_date, clean_time)]
-
-df['datetime'] = pd.to_datetime(combined_dt, format="%d/%m/%Y %H:%M:%S", errors='coerce')
+# --- Fetch and Parse XML (shared, typed feed) ---
+df = load_feed(FELT)
+if df.empty:
+    st.error("⚠️ Gagal memuat feed InaTEWS.")
+    st.stop()
 
 df['lapsetime (minutes)'] = df['timesent']-df['datetime']
 df['lapsetime (minutes)'] = (df['lapsetime (minutes)'].dt.total_seconds()/60).round(2)
-df['title'] = [f'Tanggal: {d} {t}, Mag: {m}, Depth: {dp}' for d, t, m, dp in zip(dates, times, mags, depths)]
+df['title'] = 'Tanggal: ' + df['date'] + ' ' + df['time'] + ', Mag: ' + df['mag'].astype(str) + ', Depth: ' + df['depth'].astype(str)
 
 # --- Interactive Map ---
-tiles = 'https://services.arcgisonline.com/arcgis/rest/services/Ocean/World_Ocean_Base/MapServer/tile/{z}/{y}/{x}'
-map_obj = folium.Map(location=[-4, 118], tiles=tiles, attr='ESRI', zoom_start=4.5)
-for lat, lon, title in zip(df['lat'], df['lon'], df['title']):
-    folium.Marker([lat, lon], popup=title, icon=folium.Icon(color='red')).add_to(map_obj)
+map_obj = folium.Map(location=[-4, 118], tiles=folium_tiles(), attr=TILE_ATTR, zoom_start=4.5)
+EventLayer(df, 'lat', 'lon', color='black', weight=0.4,
+           fill_color=depth_rule('depth'), radius=('mag', 1, 1.25),
+           popup=[(None, 'title'), ('Wilayah', 'area'), ('Dirasakan', 'felt')]).add_to(map_obj)
 
 st.markdown("### Seismisitas 30 Kejadian Gempabumi Dirasakan terakhir (BMKG)")
 st_folium(map_obj, width=1000)
 
 # --- Date Filtering ---
 try:
-    start_dt = pd.to_datetime(time_start, errors='coerce')
-    end_dt   = pd.to_datetime(time_end, errors='coerce')
+    start_dt = pd.to_datetime(time_start).tz_localize(WIB)
+    end_dt   = pd.to_datetime(time_end).tz_localize(WIB)
     filtered = df[(df['datetime'] > start_dt) & (df['datetime'] < end_dt)]
 except:
     st.warning("🧭 Format waktu tidak valid. Pastikan input sesuai contoh: YYYY-MM-DD HH:MM:SS")
@@ -167,26 +110,6 @@ rule = alt.Chart(pd.DataFrame({'y': [threshold]})).mark_rule(
 # Compose and display
 st.altair_chart(circles + crosses + rule, use_container_width=True)
 
-response = requests.get(url)
-# Use XML-aware parser for correct tag detection
-soup = BeautifulSoup(response.text, 'xml')  # <- critical change here
-
-# Extract area safely
-areas = soup.find_all('area')
-if not areas:
-    st.warning("🚨 Tag <area> not found — check XML structure or parser type.")
-else:
-    list_areas = [a.text.strip() for a in areas]
-    df['area'] = list_areas  # assuming alignment with other fields
-
-# Extract area safely
-felts = soup.find_all('felt')
-if not areas:
-    st.warning("🚨 Tag <area> not found — check XML structure or parser type.")
-else:
-    list_felts = [a.text.strip() for a in felts]
-    df['felt'] = list_felts  # assuming alignment with other fields
-
 st.markdown("### Data Parameter Gempa dan Perbedaan Waktu Pengiriman Informasi")
 
 required_cols = ['datetime', 'timesent', 'lapsetime (minutes)','lon', 'lat', 'mag', 'depth', 'area','felt']
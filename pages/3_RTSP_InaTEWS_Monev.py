@@ -6,6 +6,8 @@ import requests, datetime
 from bs4 import BeautifulSoup
 from obspy.geodetics import degrees2kilometers
 from calendar import monthrange
+from monev.rtsp import fetch_bulletins
+from monev.matching import match_events
 
 # 🌍 Page configuration
 st.set_page_config(page_title='TSP Monitoring dan Evaluasi', layout='wide', page_icon="🌍")
@@ -40,28 +42,6 @@ tim_end = pd.to_datetime(
 
 
 # 🛠️ Utility Functions
-def fix_coord(val):
-    return -float(val[:-1]) if val[-1] in 'SW' else float(val[:-1])
-
-def fetch_rtsp_page(url):
-    soup = BeautifulSoup(requests.get(url).text, 'html')
-    rows = soup.find_all("td", {"class": "txt11pxarialb"})
-    data = [div.text for row in rows for div in row.find_all('div')]
-    chunks = [data[i:i + 9] for i in range(0, len(data), 9)]
-    records = []
-    for row in chunks:
-        try:
-            records.append({
-                'date_time': f"{row[0]} {row[1]}",
-                'mag': float(row[2]),
-                'depth': float(row[3]),
-                'lat': fix_coord(row[4]),
-                'lon': fix_coord(row[5]),
-                'typ': row[6], 'num_bull': row[7], 'evt_group': row[8]
-            })
-        except: continue
-    return pd.DataFrame(records)
-
 def normalize_bmkg_time(df):
     df['date_time'] = pd.to_datetime(df['date_time'], errors='coerce')
     df['date_time'] = df['date_time'].dt.tz_localize('Asia/Jakarta', ambiguous='NaT').dt.tz_convert('UTC')
@@ -84,9 +64,8 @@ def fetch_dissemination_times(event_groups):
         except: continue
     return pd.DataFrame(results)
 
-# 🗂 Load BMKG RTSP Pages (halaman 1-14)
-bmkg_pages = [fetch_rtsp_page(f'https://rtsp.bmkg.go.id/publicbull.php?halaman={i}') for i in range(1, 15)]
-df_rtsp = pd.concat(bmkg_pages, ignore_index=True)
+# 🗂 Load BMKG RTSP Pages (newest first, stop once past the start date)
+df_rtsp = fetch_bulletins(since=tim_sta.tz_localize(None))
 df_rtsp = normalize_bmkg_time(df_rtsp)
 
 # 🌐 Load USGS Catalog
@@ -115,32 +94,28 @@ df_rtsp_filtered = df_rtsp[(df_rtsp['date_time'] >= tim_sta) & (df_rtsp['date_ti
 df_usgs['fix_dateusgs'] = pd.to_datetime(df_usgs['time'], utc=True)
 df_usgs_filtered = df_usgs[(df_usgs['fix_dateusgs'] >= tim_sta) & (df_usgs['fix_dateusgs'] <= tim_end)]
 
-# 🔁 Comparison function (add above if not already defined)
+# 🔁 One-to-one matching on sorted origin times (closest USGS event within ±30 s)
 def compare_events(df1, df2, time_col1, time_col2, threshold_seconds=30):
-    results = []
-    for row1 in df1.itertuples(index=False):
-        t1 = getattr(row1, time_col1)
-        for row2 in df2.itertuples(index=False):
-            t2 = getattr(row2, time_col2)
-            if pd.notnull(t1) and pd.notnull(t2):
-                delta = abs((t1 - t2).total_seconds())
-                if delta <= threshold_seconds:
-                    results.append({
-                        'bmkg_time': t1,
-                        'usgs_time': t2,
-                        'time_diff_s': delta,
-                        'bmkg_mag': row1.mag,
-                        'usgs_mag': row2.mag,
-                        'bmkg_depth': row1.depth,
-                        'usgs_depth': row2.depth,
-                        'bmkg_lat': row1.lat,
-                        'usgs_lat': row2.latitude,
-                        'bmkg_lon': row1.lon,
-                        'usgs_lon': row2.longitude,
-                        'bmkg_evt_group': row1.evt_group,
-                        'usgs_place': row2.place
-                    })
-    return pd.DataFrame(results)
+    pairs = match_events(df1, df2, time_col1, time_col2, tol_s=threshold_seconds,
+                         right_cols={'lat': 'latitude', 'lon': 'longitude'})
+    bmkg = df1.loc[pairs['left']].reset_index(drop=True)
+    usgs = df2.loc[pairs['right']].reset_index(drop=True)
+    return pd.DataFrame({
+        'bmkg_time': bmkg[time_col1],
+        'usgs_time': usgs[time_col2],
+        'time_diff_s': pairs['dt_s'].abs(),
+        'bmkg_mag': bmkg['mag'],
+        'usgs_mag': usgs['mag'],
+        'bmkg_depth': bmkg['depth'],
+        'usgs_depth': usgs['depth'],
+        'bmkg_lat': bmkg['lat'],
+        'usgs_lat': usgs['latitude'],
+        'bmkg_lon': bmkg['lon'],
+        'usgs_lon': usgs['longitude'],
+        'bmkg_evt_group': bmkg['evt_group'],
+        'usgs_place': usgs['place'],
+        'distance_km': pairs['dist_km'],
+    })
 
 # ✅ Call the function to generate the comparison DataFrame
 df_comp = compare_events(df_rtsp_filtered, df_usgs_filtered, 'date_time', 'fix_dateusgs')
@@ -1,10 +1,13 @@
 import streamlit as st
 import pandas as pd
-import requests
-import os, datetime
-from bs4 import BeautifulSoup
-from pathlib import Path
+import datetime
 from calendar import monthrange
+from streamlit_autorefresh import st_autorefresh
+from monev.catalog import query_qc
+from monev.tiles import TILE_ATTR, folium_tiles
+from monev.markers import EventLayer
+from monev.toast import index_errors, query_toast, query_toast_metrics
+from monev.watcher import WATCH_REFRESH_MS, toast_watcher
 
 # --- Page Setup ---
 st.set_page_config(page_title='Kecepatan Processing Tsunami TOAST', layout='wide', page_icon="🌍")
@@ -37,171 +40,53 @@ with st.sidebar:
     South      = float(st.text_input('South:', '-13.0'))
     West       = float(st.text_input('West:', '90.0'))
     East       = float(st.text_input('East:', '142.0'))
+    live = st.toggle("🔴 Live TOAST", value=False,
+                     help="Pantau log TOAST yang sedang ditulis dan perbarui halaman otomatis")
 
-# --- Parse TOAST Logs ---
-def load_toast_logs_old(path="./pages/Log_TOAST/"):
-    event_ids, timestamps, remarks = [], [], []
-    for fname in os.listdir(path):
-        if not fname.endswith('.log'):
-            continue
-        eid = fname.split('.log')[0]
-        with open(os.path.join(path, fname)) as f:
-            lines = f.readlines()
-
-        # 🔍 Look for the first line that includes "Incident created" or similar marker
-        for line in lines:
-            if "Incident created" in line or "Info" in line:
-                parts = line.strip().split()
-                if len(parts) >= 3:
-                    ts = parts[0] + ' ' + parts[1]
-                    remark = parts[2]
-                    event_ids.append(eid)
-                    timestamps.append(ts)
-                    remarks.append(remark)
-                break  # Use only the first matching line
-    df_toast = pd.DataFrame({'event_id': event_ids, 'tstamp_toast': timestamps, 'remark_toast': remarks})
-    df_toast['tstamp_toast'] = pd.to_datetime(df_toast['tstamp_toast'], errors='coerce')
-    return df_toast
-
-
-def load_toast_logs_old(root="./pages/fileTOAST/", time_start=None, time_end=None):
-    event_ids, timestamps, remarks = [], [], []
-
-    root = Path(root)
-
-    # determine year-month range from sidebar input
-    periods = pd.period_range(
-        start=time_start.to_period("M"),
-        end=time_end.to_period("M"),
-        freq="M"
-    )
-
-    for p in periods:
-        year_dir = root / str(p.year)
-        month_dir = year_dir / f"{p.month:02d}"
-
-        if not month_dir.exists():
-            continue
-
-        for log_file in month_dir.glob("*.log"):
-            eid = log_file.stem
-
-            try:
-                with open(log_file, encoding="utf-8", errors="ignore") as f:
-                    for line in f:
-                        if "Incident created" in line or "Info" in line:
-                            parts = line.strip().split()
-                            if len(parts) >= 3:
-                                ts = parts[0] + " " + parts[1]
-                                remark = parts[2]
-
-                                event_ids.append(eid)
-                                timestamps.append(ts)
-                                remarks.append(remark)
-                            break
-            except Exception:
-                continue
-
-    df_toast = pd.DataFrame({
-        "event_id": event_ids,
-        "tstamp_toast": timestamps,
-        "remark_toast": remarks
-    })
-
-    df_toast["tstamp_toast"] = pd.to_datetime(
-        df_toast["tstamp_toast"], errors="coerce"
-    )
-
-    return df_toast
-
-def load_toast_logs(root="./pages/fileTOAST/", time_start=None, time_end=None):
-    event_ids, timestamps, remarks = [], [], []
-
-    root = Path(root)
-
-    # Read all .log files directly inside fileTOAST/
-    for log_file in root.glob("*.log"):
-        eid = log_file.stem
-
-        try:
-            with open(log_file, encoding="utf-8", errors="ignore") as f:
-                for line in f:
-                    if "Incident created" in line or "Info" in line:
-                        parts = line.strip().split()
-                        if len(parts) >= 3:
-                            ts = parts[0] + " " + parts[1]
-                            remark = parts[2]
-
-                            # Convert timestamp
-                            ts_dt = pd.to_datetime(ts, errors="coerce")
-
-                            # Filter by user-selected time range
-                            if time_start <= ts_dt <= time_end:
-                                event_ids.append(eid)
-                                timestamps.append(ts_dt)
-                                remarks.append(remark)
-                        break
-        except Exception:
-            continue
-
-    df_toast = pd.DataFrame({
-        "event_id": event_ids,
-        "tstamp_toast": timestamps,
-        "remark_toast": remarks
-    })
-
-    return df_toast
-
-
-#df_toast = load_toast_logs()
-df_toast = load_toast_logs(root="./pages/fileTOAST/",
-                           time_start=tim_sta, time_end=tim_end)
-
-df_toast['tstamp_toast'] = df_toast['tstamp_toast'] - pd.Timedelta(hours=7)
+# --- Page-wide helpers ---
+def minutes_to_hms(minutes):
+    if pd.isnull(minutes): return ''
+    total_seconds = int(minutes * 60)
+    hours = total_seconds // 3600
+    minutes = (total_seconds % 3600) // 60
+    seconds = total_seconds % 60
+    return f"{hours:02d}:{minutes:02d}:{seconds:02d}"
 
-# 🔎 Load Earthquake Catalog (with robust HTML fallback)
-#@st.cache_data(show_spinner=False)
-def fetch_qc(url):
-    try:
-        response = requests.get(url)
-        text = response.text.strip()
-        if "|" in text:
-            rows = [line.split('|') for line in text.split('\n') if line]
-        else:
-            soup = BeautifulSoup(text, 'html.parser')
-            if soup.p and soup.p.text:
-                rows = [line.split('|') for line in soup.p.text.split('\n') if line]
-            else:
-                return pd.DataFrame()
-        columns = ['event_id','date_time','mode','status','phase','mag','type_mag',
-                   'n_mag','azimuth','rms','lat','lon','depth','type_event','remarks']
-        return pd.DataFrame([dict(zip(columns, row)) for row in rows[1:-2]])
-    except Exception:
-        return pd.DataFrame()
 
-df = fetch_qc("http://202.90.198.41/qc.txt")
-if df.empty:
+# --- Live TOAST response (log watcher) ---
+if live:
+    st_autorefresh(interval=WATCH_REFRESH_MS, key="toast_live")
+    watcher = toast_watcher()
+    df_live = watcher.table()
+    df_live = df_live[df_live['incident_created'] >= pd.Timestamp.now('UTC').tz_localize(None) - pd.Timedelta(hours=24)]
+    st.markdown("### 🔴 Live: Respon TOAST 24 Jam Terakhir")
+    if df_live.empty:
+        st.info(f"Belum ada incident TOAST dalam 24 jam terakhir (cek terakhir {watcher.last_poll:%H:%M:%S} UTC).")
+    else:
+        latest = df_live.iloc[0]
+        col1, col2, col3 = st.columns(3)
+        col1.metric("Event Terbaru", latest['event_id'],
+                    f"M {latest['mag_final']:.2f}" if pd.notna(latest['mag_final']) else None, delta_color="off")
+        col2.metric("Respon TOAST", minutes_to_hms(latest['lapse_incident_created']))
+        col3.metric("Update Origin / Magnitude", f"{latest['n_origin_updates']} / {latest['n_magnitude_updates']}")
+        st.dataframe(df_live[['event_id', 'ot', 'incident_created', 'mag_final', 'lapse_incident_created',
+                              'lapse_final_magnitude', 'n_origin_updates', 'n_magnitude_updates', 'last_line']],
+                     hide_index=True)
+
+# --- TOAST incidents from the log index (times in UTC) ---
+df_toast = query_toast(tim_sta, tim_end)
+df_toast_errors = index_errors()
+if len(df_toast_errors):
+    with st.expander(f"⚠️ {len(df_toast_errors)} log TOAST tidak dapat dibaca"):
+        st.dataframe(df_toast_errors, hide_index=True)
+
+# 🔎 Load Earthquake Catalog (qc.txt + local year/month archive)
+df = query_qc(tim_sta, tim_end, South, North, West, East, mmin=5)
+if df is None:
     st.error("⚠️ Failed to retrieve or parse earthquake data from source.")
     st.stop()
-    
-# 🔄 Data Cleaning & Conversion
-def preprocess(df):
-    lat_num = df['lat'].str.extract(r'([\d.]+)')[0].astype(float)
-    lat_sign = df['lat'].str.contains('S').apply(lambda x: -1 if x else 1)
-    df['fixedLat'] = lat_num * lat_sign
-
-    lon_num = df['lon'].str.extract(r'([\d.]+)')[0].astype(float)
-    lon_sign = df['lon'].str.contains('W').apply(lambda x: -1 if x else 1)
-    df['fixedLon'] = lon_num * lon_sign
-
-    df['fixedDepth'] = df['depth'].str.replace('km', '').astype(float)
-    df['mag'] = df['mag'].astype(float).round(2)
-    df['sizemag'] = df['mag'] * 1000
-    df['date_time'] = pd.to_datetime(df['date_time'])
-
-    return df
 
-df = preprocess(df)
+df['mag'] = df['mag'].round(2)
 
 # --- Filter by Magnitude & Region ---
 df = df.query('mag >= 5')
@@ -225,26 +110,21 @@ import folium
 from streamlit_folium import st_folium
 
 # --- Custom Ocean Basemap ---
-tiles = 'https://services.arcgisonline.com/arcgis/rest/services/Ocean/World_Ocean_Base/MapServer/tile/{z}/{y}/{x}'
-map_obj = folium.Map(location=[-3, 115], tiles=tiles, attr='ESRI', zoom_start=4.5)
+map_obj = folium.Map(location=[-3, 115], tiles=folium_tiles(), attr=TILE_ATTR, zoom_start=4.5)
 
 # --- Add Event Markers ---
-for _, row in df_merge.iterrows():
-    popup_text = (
-        f"<b>Event ID:</b> {row['event_id']}<br>"
-        f"<b>DateTime:</b> {row['date_time'].strftime('%Y-%m-%d %H:%M:%S')}<br>"
-        f"<b>Mag:</b> {row['mag']:.2f}<br>"
-        f"<b>Delay:</b> {row['lapse_time_toast']:.2f} min"
-    )
-    folium.CircleMarker(
-        location=[row['fixedLat'], row['fixedLon']],
-        radius=row['mag'] * 2,  # scale marker size by magnitude
-        color="crimson" if row['lapse_time_toast'] > 3 else "green",
-        fill=True,
-        fill_opacity=0.7,
-        popup=folium.Popup(popup_text, max_width=300),
-        tooltip=row['event_id']
-    ).add_to(map_obj)
+df_map = df_merge.assign(
+    DateTime=df_merge['date_time'].dt.strftime('%Y-%m-%d %H:%M:%S'),
+    Delay=df_merge['lapse_time_toast'].map('{:.2f} min'.format),
+)
+EventLayer(
+    df_map, 'fixedLat', 'fixedLon',
+    color=('lapse_time_toast', [3], ['green', 'crimson']),  # crimson when delay > 3 min
+    radius=('mag', 2, 1),  # scale marker size by magnitude
+    popup=[('Event ID', 'event_id'), ('DateTime', 'DateTime'), ('Mag', 'mag'), ('Delay', 'Delay')],
+    tooltip='event_id',
+    weight=3,
+).add_to(map_obj)
 
 # --- Display Folium Map in Streamlit ---
 st.markdown("### 🌐 Peta Lokasi Gempabumi dengan TOAST M ≥5")
@@ -277,14 +157,6 @@ df_merge['date'] = df_merge['date_time'].dt.strftime('%d-%b-%y')       # Example
 df_merge['OT'] = df_merge['date_time'].dt.strftime('%H:%M:%S')          # Example: 06:38:40
 df_merge['Toast Time'] = df_merge['tstamp_toast'].dt.strftime('%H:%M:%S')   # Example: 06:41:41
 
-def minutes_to_hms(minutes):
-    if pd.isnull(minutes): return ''
-    total_seconds = int(minutes * 60)
-    hours = total_seconds // 3600
-    minutes = (total_seconds % 3600) // 60
-    seconds = total_seconds % 60
-    return f"{hours:02d}:{minutes:02d}:{seconds:02d}"
-
 df_merge['lapsetime (HH:MM:SS)'] = df_merge['lapse_time_toast'].apply(minutes_to_hms)
 
 df_merge.rename(columns={
@@ -307,3 +179,23 @@ df_show=df_merge[['Event ID','Date','OT (UTC)', 'Respon TOAST (UTC)','KECEPATAN'
                   'Depth (km)','Phase Count','Azimuth Gap','Location']]
 df_show.index = range(1, len(df_show) + 1)
 st.dataframe(df_show)
+
+# --- TOAST processing milestones per event ---
+st.markdown("### ⏱️ Tahapan Processing TOAST per Event")
+df_steps = query_toast_metrics(tim_sta, tim_end)
+df_steps = df_steps[df_steps['event_id'].isin(df_show['Event ID'])].copy()
+for col in ('lapse_incident_created', 'lapse_first_origin', 'lapse_final_magnitude'):
+    df_steps[col] = df_steps[col].apply(minutes_to_hms)
+df_steps = df_steps.rename(columns={
+    'event_id': 'Event ID',
+    'lapse_incident_created': 'Incident Created',
+    'lapse_first_origin': 'Origin Pertama',
+    'lapse_final_magnitude': 'Magnitude Final',
+    'mag_final': 'Mag Final',
+    'n_origin_updates': 'Update Origin',
+    'n_magnitude_updates': 'Update Magnitude',
+})[['Event ID', 'Incident Created', 'Origin Pertama', 'Magnitude Final', 'Mag Final',
+    'Update Origin', 'Update Magnitude']]
+df_steps.index = range(1, len(df_steps) + 1)
+st.caption("Waktu dihitung dari OT (HH:MM:SS).")
+st.dataframe(df_steps)
@@ -5,17 +5,20 @@ import datetime
 import streamlit as st
 import pandas as pd
 import numpy as np
-import geopandas as gpd
 import matplotlib.pyplot as plt
 import cartopy.crs as ccrs
-import cartopy
-from cartopy.io.shapereader import Reader
 from matplotlib.lines import Line2D
 from PIL import Image
 import folium
 from streamlit_folium import st_folium
-import requests
 from calendar import monthrange
+from monev.coords import parse_coords
+from monev.basemap import base_map, layer_colors
+from monev.geometry import ISLANDS
+from monev.regions import ISLAND_LABELS, REGION_LAYERS, region_members
+from monev.faults import fault_layer
+from monev.markers import EventLayer, depth_rule
+from monev.tiles import folium_tiles
 
 # 🌍 Page Config
 st.set_page_config(page_title='Earthquake Dashboard - Katalog QC PGN', layout='wide', page_icon='🌋')
@@ -53,19 +56,10 @@ lon_index = df.columns.get_loc("Longitude")
 lat_dir_col = df.columns[lat_index + 1]
 lon_dir_col = df.columns[lon_index + 1]
 
-df["Latitude_Combined"] = df.apply(lambda row: f"{row['Latitude']} {str(row[lat_dir_col]).strip().upper()}", axis=1)
-df["Longitude_Combined"] = df.apply(lambda row: f"{row['Longitude']} {str(row[lon_dir_col]).strip().upper()}", axis=1)
-
-def convert_coord(coord_str):
-    try:
-        value, direction = coord_str.split()
-        value = float(value)
-        return -abs(value) if direction in ["S", "W"] else abs(value)
-    except:
-        return np.nan
-
-df["LAT"] = df["Latitude_Combined"].apply(convert_coord)
-df["LON"] = df["Longitude_Combined"].apply(convert_coord)
+df["LAT"], bad_lat = parse_coords(df["Latitude"], df[lat_dir_col], axis='lat')
+df["LON"], bad_lon = parse_coords(df["Longitude"], df[lon_dir_col], axis='lon')
+if bad_lat or bad_lon:
+    st.warning(f"⚠️ {bad_lat + bad_lon} koordinat tidak valid diabaikan (Lat: {bad_lat}, Lon: {bad_lon}).")
 
 
 # 🧹 Filter by date and valid coordinates
@@ -81,14 +75,6 @@ df_filtered = df[
 #st.dataframe(df_filtered[["DATE", "Origin Time", "MAG", "DEPTH", "LAT", "LON", "Event Type", "Remark"]])
 
 # 🗺️ Folium Map Construction
-def depth_color(depth):
-    if depth < 60:
-        return 'red'
-    elif depth <= 300:
-        return 'yellow'
-    else:
-        return 'green'
-
 if not df_filtered.empty:
     y0 = df_filtered['LAT'].mean()
     x0 = df_filtered['LON'].mean()
@@ -98,39 +84,24 @@ else:
 
 m = folium.Map(location=(y0, x0), zoom_start=4.5)
 folium.TileLayer(
-    tiles="https://services.arcgisonline.com/arcgis/rest/services/Ocean/World_Ocean_Base/MapServer/tile/{z}/{y}/{x}",
+    tiles=folium_tiles(),
     attr="ESRI Ocean Basemap",
     name="ESRI Ocean",
     control=False
 ).add_to(m)
 
-for _, row in df_filtered.iterrows():
-    if pd.notnull(row['LAT']) and pd.notnull(row['LON']) and pd.notnull(row['MAG']) and pd.notnull(row['DEPTH']):
-        folium.CircleMarker(
-            location=[row['LAT'], row['LON']],
-            radius=(row['MAG'] ** 1.25),
-            color='black',
-            weight=0.4,
-            fill=True,
-            fill_color=depth_color(row['DEPTH']),
-            fill_opacity=0.5,
-            popup=folium.Popup(
-                f"<b>Date:</b> {row['DATE']}<br><b>Mag:</b> {row['MAG']}<br><b>Depth:</b> {row['DEPTH']} km",
-                max_width=250
-            )
-        ).add_to(m)
-
-try:
-    fault_geojson = requests.get(
-        "https://bmkg-content-inatews.storage.googleapis.com/indo_faults_lines.geojson"
-    ).json()
-    folium.GeoJson(
-        fault_geojson,
-        name="Fault Lines",
-        style_function=lambda feature: {"color": "orange", "weight": 1}
-    ).add_to(m)
-except Exception as e:
-    st.warning(f"⚠️ Fault line overlay failed: {e}")
+EventLayer(
+    df_filtered[df_filtered['MAG'].notna() & df_filtered['DEPTH'].notna()], 'LAT', 'LON',
+    color='black', weight=0.4, fill_color=depth_rule('DEPTH'), fillOpacity=0.5,
+    radius=('MAG', 1, 1.25), popup=[('Date', 'DATE'), ('Mag', 'MAG'), ('Depth (km)', 'DEPTH')],
+    name="Events",
+).add_to(m)
+
+faults = fault_layer(zoom=4.5)
+if faults is not None:
+    faults.add_to(m)
+else:
+    st.warning("⚠️ Fault line overlay tidak tersedia.")
 
 folium.LayerControl(collapsed=False).add_to(m)
 
@@ -142,50 +113,23 @@ df_filtered.index = range(1, len(df_filtered)+1)
 st.dataframe(df_filtered)
 
 # 🗺️ Island Setup
-list_pulau = ['Sumatra','Jawa','Bali-A','Nustra','Kalimantan','Sulawesi','Maluku','Papua']
-list_color = ['r','g','b','y','c','m','purple','orange']
-labels     = ['SUMATRA','JAWA','BALI','NUSA TENGGARA','KALIMANTAN','SULAWESI','MALUKU','PAPUA']
+list_pulau = ISLANDS
+list_color = layer_colors('island')
+labels     = ISLAND_LABELS
 projection = ccrs.PlateCarree(central_longitude=120.0)
 
-def load_clip(name):
-    return gpd.read_file(f"{name}_Area.shp")
-
-def clip_df(df, island):
-    geo_df = gpd.GeoDataFrame(df, geometry=gpd.points_from_xy(df.LON, df.LAT), crs="EPSG:4326")
-    return geo_df.clip(load_clip(island))
-
-gpd_seis = gpd.GeoDataFrame(df_filtered, geometry=gpd.points_from_xy(df_filtered.LON, df_filtered.LAT), crs="EPSG:4326")
+# 📍 Region membership per layer, one spatial pass each
+df_island = region_members(df_filtered, 'island', lon='LON', lat='LAT')
 
-def get_eq_coords(pulau_name):
-    try:
-        polygon = gpd.read_file(f"{pulau_name}_Area.shp")
-        clipped = gpd_seis.clip(polygon)
-        x, y, _ = projection.transform_points(ccrs.Geodetic(), np.array(clipped.LON), np.array(clipped.LAT)).T
-        return x, y
-    except Exception as e:
-        st.warning(f"Gagal memproses {pulau_name}: {e}")
-        return [], []
+def get_eq_coords(clipped):
+    x, y, _ = projection.transform_points(ccrs.Geodetic(), np.array(clipped.LON), np.array(clipped.LAT)).T
+    return x, y
 
-fig = plt.figure(dpi=300)
-ax = fig.add_subplot(111, projection=projection)
-ax.set_extent((85, 145, -15, 10))
+fig, ax = base_map('island', list_color)
 
-for i, pulau in enumerate(list_pulau):
-    x, y = get_eq_coords(pulau)
+for i, (pulau, clipped) in enumerate(df_island.groupby('island', observed=False)):
+    x, y = get_eq_coords(clipped)
     ax.scatter(x, y, s=5, color=list_color[i], marker="o", label=pulau, zorder=3)
-    try:
-        ax.add_geometries(
-            Reader(f"{pulau}_Area.shp").geometries(),
-            ccrs.PlateCarree(),
-            facecolor="white",
-            edgecolor=list_color[i],
-            linewidth=0.5
-        )
-    except:
-        continue
-
-ax.add_feature(cartopy.feature.BORDERS, linestyle='-', linewidth=0.5, alpha=0.5)
-ax.coastlines(resolution='10m', color='black', linestyle='-', linewidth=0.5, alpha=0.5)
 
 legend_elements = [
     Line2D([0], [0], marker='o', color='w', label=labels[i], markerfacecolor=list_color[i], markersize=8)
@@ -208,7 +152,7 @@ def stats(df):
         df.shape[0]
     ]
 
-stat_rows = [stats(clip_df(df_filtered, reg)) for reg in list_pulau]
+stat_rows = [stats(clipped) for _, clipped in df_island.groupby('island', observed=False)]
 stat_df = pd.DataFrame(stat_rows, columns=['<60 km','60–300 km','>300 km','M<4','M4–5','M≥5','Total'])
 stat_df['Wilayah'] = labels
 stat_df.set_index('Wilayah', inplace=True)
@@ -222,46 +166,16 @@ st.image(Image.open("depth_mag.png"), caption="Depth & Magnitude per Island")
 st.subheader("📋 Earthquake Summary per Island")
 st.dataframe(stat_df)
 
-list_pgr = [f'PGR{i}' for i in range(1, 12)]
-list_color = plt.cm.get_cmap('tab10', len(list_pgr)).colors
-
-def clip_df(df, pgr_name):
-    polygon = gpd.read_file(f"./pages/fileSHP/{pgr_name}.shp")
-    geo_df = gpd.GeoDataFrame(df, geometry=gpd.points_from_xy(df.LON, df.LAT), crs="EPSG:4326")
-    return geo_df.clip(polygon)
-
-def get_eq_coords(pgr_name):
-    try:
-        polygon = gpd.read_file(f"./pages/fileSHP/{pgr_name}.shp")
-        clipped = gpd_seis.clip(polygon)
-        x, y, _ = projection.transform_points(ccrs.Geodetic(), np.array(clipped.LON), np.array(clipped.LAT)).T
-        return x, y
-    except Exception as e:
-        st.warning(f"Gagal memproses {pgr_name}: {e}")
-        return [], []
+list_pgr = list(REGION_LAYERS['pgr'])
+list_color = layer_colors('pgr')
+df_pgr = region_members(df_filtered, 'pgr', lon='LON', lat='LAT')
 
 
-fig = plt.figure(dpi=300)
-ax = fig.add_subplot(111, projection=projection)
-ax.set_extent((85, 145, -15, 10))
+fig, ax = base_map('pgr', list_color)
 
-for i, pgr in enumerate(list_pgr):
-    x, y = get_eq_coords(pgr)
+for i, (pgr, clipped) in enumerate(df_pgr.groupby('pgr', observed=False)):
+    x, y = get_eq_coords(clipped)
     ax.scatter(x, y, s=5, color=list_color[i], marker="o", label=pgr, zorder=3)
-    try:
-        ax.add_geometries(
-            Reader(f"./pages/fileSHP/{pgr}.shp").geometries(),
-            ccrs.PlateCarree(),
-            facecolor="white",
-            edgecolor=list_color[i],
-            linewidth=0.5
-        )
-    except Exception as e:
-        st.warning(f"Polygon error on {pgr}: {e}")
-        continue
-
-ax.add_feature(cartopy.feature.BORDERS, linestyle='-', linewidth=0.5, alpha=0.5)
-ax.coastlines(resolution='10m', color='black', linestyle='-', linewidth=0.5, alpha=0.5)
 
 legend_elements = [
     Line2D([0], [0], marker='o', color='w', label=list_pgr[i], markerfacecolor=list_color[i], markersize=8)
@@ -272,7 +186,7 @@ ax.legend(handles=legend_elements, loc='lower center', bbox_to_anchor=(0.5, -0.2
 st.markdown("### 🗺️ Seismic Events by PGR Region")
 st.pyplot(fig)
 
-stat_rows = [stats(clip_df(df_filtered, reg)) for reg in list_pgr]
+stat_rows = [stats(clipped) for _, clipped in df_pgr.groupby('pgr', observed=False)]
 stat_df = pd.DataFrame(stat_rows, columns=['<60 km','60–300 km','>300 km','M<4','M4–5','M≥5','Total'])
 stat_df['Region'] = list_pgr
 stat_df.set_index('Region', inplace=True)
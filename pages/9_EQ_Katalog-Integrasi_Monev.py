@@ -5,17 +5,17 @@ import datetime
 import streamlit as st
 import pandas as pd
 import numpy as np
-import geopandas as gpd
 import matplotlib.pyplot as plt
 import cartopy.crs as ccrs
-import cartopy
-from cartopy.io.shapereader import Reader
 from matplotlib.lines import Line2D
 from PIL import Image
 import folium
 from streamlit_folium import st_folium
 import requests
 from calendar import monthrange
+from monev.basemap import base_map, layer_colors
+from monev.geometry import ISLANDS
+from monev.regions import ISLAND_LABELS, REGION_LAYERS, region_members
 
 # 🌍 Page Config
 st.set_page_config(page_title='Earthquake Dashboard - Katalog Integrasi', layout='wide', page_icon='🌋')
@@ -130,50 +130,23 @@ df_filtered.index = range(1, len(df_filtered)+1)
 st.dataframe(df_filtered)
 
 # 🗺️ Island Setup
-list_pulau = ['Sumatra','Jawa','Bali-A','Nustra','Kalimantan','Sulawesi','Maluku','Papua']
-list_color = ['r','g','b','y','c','m','purple','orange']
-labels     = ['SUMATRA','JAWA','BALI','NUSA TENGGARA','KALIMANTAN','SULAWESI','MALUKU','PAPUA']
+list_pulau = ISLANDS
+list_color = layer_colors('island')
+labels     = ISLAND_LABELS
 projection = ccrs.PlateCarree(central_longitude=120.0)
 
-def load_clip(name):
-    return gpd.read_file(f"{name}_Area.shp")
+# 📍 Region membership per layer, one spatial pass each
+df_island = region_members(df_filtered, 'island', lon='LON', lat='LAT')
 
-def clip_df(df, island):
-    geo_df = gpd.GeoDataFrame(df, geometry=gpd.points_from_xy(df.LON, df.LAT), crs="EPSG:4326")
-    return geo_df.clip(load_clip(island))
+def get_eq_coords(clipped):
+    x, y, _ = projection.transform_points(ccrs.Geodetic(), np.array(clipped.LON), np.array(clipped.LAT)).T
+    return x, y
 
-gpd_seis = gpd.GeoDataFrame(df_filtered, geometry=gpd.points_from_xy(df_filtered.LON, df_filtered.LAT), crs="EPSG:4326")
+fig, ax = base_map('island', list_color)
 
-def get_eq_coords(pulau_name):
-    try:
-        polygon = gpd.read_file(f"{pulau_name}_Area.shp")
-        clipped = gpd_seis.clip(polygon)
-        x, y, _ = projection.transform_points(ccrs.Geodetic(), np.array(clipped.LON), np.array(clipped.LAT)).T
-        return x, y
-    except Exception as e:
-        st.warning(f"Gagal memproses {pulau_name}: {e}")
-        return [], []
-
-fig = plt.figure(dpi=300)
-ax = fig.add_subplot(111, projection=projection)
-ax.set_extent((85, 145, -15, 10))
-
-for i, pulau in enumerate(list_pulau):
-    x, y = get_eq_coords(pulau)
+for i, (pulau, clipped) in enumerate(df_island.groupby('island', observed=False)):
+    x, y = get_eq_coords(clipped)
     ax.scatter(x, y, s=5, color=list_color[i], marker="o", label=pulau, zorder=3)
-    try:
-        ax.add_geometries(
-            Reader(f"{pulau}_Area.shp").geometries(),
-            ccrs.PlateCarree(),
-            facecolor="white",
-            edgecolor=list_color[i],
-            linewidth=0.5
-        )
-    except:
-        continue
-
-ax.add_feature(cartopy.feature.BORDERS, linestyle='-', linewidth=0.5, alpha=0.5)
-ax.coastlines(resolution='10m', color='black', linestyle='-', linewidth=0.5, alpha=0.5)
 
 legend_elements = [
     Line2D([0], [0], marker='o', color='w', label=labels[i], markerfacecolor=list_color[i], markersize=8)
@@ -196,7 +169,7 @@ def stats(df):
         df.shape[0]
     ]
 
-stat_rows = [stats(clip_df(df_filtered, reg)) for reg in list_pulau]
+stat_rows = [stats(clipped) for _, clipped in df_island.groupby('island', observed=False)]
 stat_df = pd.DataFrame(stat_rows, columns=['<60 km','60–300 km','>300 km','M<4','M4–5','M≥5','Total'])
 stat_df['Wilayah'] = labels
 stat_df.set_index('Wilayah', inplace=True)
@@ -210,46 +183,16 @@ st.image(Image.open("depth_mag.png"), caption="Depth & Magnitude per Island")
 st.subheader("📋 Earthquake Summary per Island")
 st.dataframe(stat_df)
 
-list_pgr = [f'PGR{i}' for i in range(1, 12)]
-list_color = plt.cm.get_cmap('tab10', len(list_pgr)).colors
-
-def clip_df(df, pgr_name):
-    polygon = gpd.read_file(f"./pages/fileSHP/{pgr_name}.shp")
-    geo_df = gpd.GeoDataFrame(df, geometry=gpd.points_from_xy(df.LON, df.LAT), crs="EPSG:4326")
-    return geo_df.clip(polygon)
+list_pgr = list(REGION_LAYERS['pgr'])
+list_color = layer_colors('pgr')
+df_pgr = region_members(df_filtered, 'pgr', lon='LON', lat='LAT')
 
-def get_eq_coords(pgr_name):
-    try:
-        polygon = gpd.read_file(f"./pages/fileSHP/{pgr_name}.shp")
-        clipped = gpd_seis.clip(polygon)
-        x, y, _ = projection.transform_points(ccrs.Geodetic(), np.array(clipped.LON), np.array(clipped.LAT)).T
-        return x, y
-    except Exception as e:
-        st.warning(f"Gagal memproses {pgr_name}: {e}")
-        return [], []
 
+fig, ax = base_map('pgr', list_color)
 
-fig = plt.figure(dpi=300)
-ax = fig.add_subplot(111, projection=projection)
-ax.set_extent((85, 145, -15, 10))
-
-for i, pgr in enumerate(list_pgr):
-    x, y = get_eq_coords(pgr)
+for i, (pgr, clipped) in enumerate(df_pgr.groupby('pgr', observed=False)):
+    x, y = get_eq_coords(clipped)
     ax.scatter(x, y, s=5, color=list_color[i], marker="o", label=pgr, zorder=3)
-    try:
-        ax.add_geometries(
-            Reader(f"./pages/fileSHP/{pgr}.shp").geometries(),
-            ccrs.PlateCarree(),
-            facecolor="white",
-            edgecolor=list_color[i],
-            linewidth=0.5
-        )
-    except Exception as e:
-        st.warning(f"Polygon error on {pgr}: {e}")
-        continue
-
-ax.add_feature(cartopy.feature.BORDERS, linestyle='-', linewidth=0.5, alpha=0.5)
-ax.coastlines(resolution='10m', color='black', linestyle='-', linewidth=0.5, alpha=0.5)
 
 legend_elements = [
     Line2D([0], [0], marker='o', color='w', label=list_pgr[i], markerfacecolor=list_color[i], markersize=8)
@@ -260,7 +203,7 @@ ax.legend(handles=legend_elements, loc='lower center', bbox_to_anchor=(0.5, -0.2
 st.markdown("### 🗺️ Seismic Events by PGR Region")
 st.pyplot(fig)
 
-stat_rows = [stats(clip_df(df_filtered, reg)) for reg in list_pgr]
+stat_rows = [stats(clipped) for _, clipped in df_pgr.groupby('pgr', observed=False)]
 stat_df = pd.DataFrame(stat_rows, columns=['<60 km','60–300 km','>300 km','M<4','M4–5','M≥5','Total'])
 stat_df['Region'] = list_pgr
 stat_df.set_index('Region', inplace=True)
@@ -275,46 +218,16 @@ st.subheader("📋 Earthquake Summary per PGR Region")
 st.dataframe(stat_df)
 
 
-list_pgr = [f'pgr{i}' for i in range(1, 11)]
-list_color = plt.cm.get_cmap('tab10', len(list_pgr)).colors
-
-def clip_df(df, pgr_name):
-    polygon = gpd.read_file(f"./pages/fileSHP_Lama/{pgr_name}.shp")
-    geo_df = gpd.GeoDataFrame(df, geometry=gpd.points_from_xy(df.LON, df.LAT), crs="EPSG:4326")
-    return geo_df.clip(polygon)
-
-def get_eq_coords(pgr_name):
-    try:
-        polygon = gpd.read_file(f"./pages/fileSHP_Lama/{pgr_name}.shp")
-        clipped = gpd_seis.clip(polygon)
-        x, y, _ = projection.transform_points(ccrs.Geodetic(), np.array(clipped.LON), np.array(clipped.LAT)).T
-        return x, y
-    except Exception as e:
-        st.warning(f"Gagal memproses {pgr_name}: {e}")
-        return [], []
+list_pgr = list(REGION_LAYERS['pgr_lama'])
+list_color = layer_colors('pgr_lama')
+df_pgr = region_members(df_filtered, 'pgr_lama', lon='LON', lat='LAT')
 
 
-fig = plt.figure(dpi=300)
-ax = fig.add_subplot(111, projection=projection)
-ax.set_extent((85, 145, -15, 10))
+fig, ax = base_map('pgr_lama', list_color)
 
-for i, pgr in enumerate(list_pgr):
-    x, y = get_eq_coords(pgr)
+for i, (pgr, clipped) in enumerate(df_pgr.groupby('pgr_lama', observed=False)):
+    x, y = get_eq_coords(clipped)
     ax.scatter(x, y, s=5, color=list_color[i], marker="o", label=pgr, zorder=3)
-    try:
-        ax.add_geometries(
-            Reader(f"./pages/fileSHP_Lama/{pgr}.shp").geometries(),
-            ccrs.PlateCarree(),
-            facecolor="white",
-            edgecolor=list_color[i],
-            linewidth=0.5
-        )
-    except Exception as e:
-        st.warning(f"Polygon error on {pgr}: {e}")
-        continue
-
-ax.add_feature(cartopy.feature.BORDERS, linestyle='-', linewidth=0.5, alpha=0.5)
-ax.coastlines(resolution='10m', color='black', linestyle='-', linewidth=0.5, alpha=0.5)
 
 legend_elements = [
     Line2D([0], [0], marker='o', color='w', label=list_pgr[i], markerfacecolor=list_color[i], markersize=8)
@@ -325,7 +238,7 @@ ax.legend(handles=legend_elements, loc='lower center', bbox_to_anchor=(0.5, -0.2
 st.markdown("### 🗺️ Seismic Events by PGR Region")
 st.pyplot(fig)
 
-stat_rows = [stats(clip_df(df_filtered, reg)) for reg in list_pgr]
+stat_rows = [stats(clipped) for _, clipped in df_pgr.groupby('pgr_lama', observed=False)]
 stat_df = pd.DataFrame(stat_rows, columns=['<60 km','60–300 km','>300 km','M<4','M4–5','M≥5','Total'])
 stat_df['Region'] = list_pgr
 stat_df.set_index('Region', inplace=True)
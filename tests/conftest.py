@@ -0,0 +1,5 @@
+import sys
+from pathlib import Path
+
+# the pages import ``monev`` from the repository root; do the same for the tests
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
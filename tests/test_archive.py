@@ -0,0 +1,37 @@
+import pandas as pd
+import pytest
+
+from monev import archive
+
+
+@pytest.fixture(autouse=True)
+def archive_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(archive, 'ARCHIVE_DIR', tmp_path / 'qc_archive')
+
+
+def _events(ids, times, mags):
+    return pd.DataFrame({'event_id': ids, 'date_time': pd.to_datetime(times),
+                         'fixedLat': -5.0, 'fixedLon': 120.0, 'mag': mags})
+
+
+def test_ingest_keeps_the_newest_snapshot_of_an_event():
+    archive.ingest(_events(['a', 'b'], ['2025-01-10', '2025-01-20'], [4.0, 5.0]))
+    archive.ingest(_events(['b', 'c'], ['2025-01-20', '2025-02-02'], [5.3, 3.0]))
+    df = archive.query_archive('2025-01-01', '2025-02-28').set_index('event_id')
+    assert sorted(df.index) == ['a', 'b', 'c']
+    assert df.loc['b', 'mag'] == 5.3
+
+
+def test_event_moved_across_a_month_boundary_is_returned_once():
+    archive.ingest(_events(['a'], ['2025-01-31 23:59:50'], [4.0]))
+    archive.ingest(_events(['a'], ['2025-02-01 00:00:10'], [4.1]))
+    df = archive.query_archive('2025-01-01', '2025-02-28')
+    assert list(df['event_id']) == ['a'] and df['mag'].iloc[0] == 4.1
+
+
+def test_query_filters_time_box_and_magnitude():
+    archive.ingest(_events(['a', 'b', 'c'], ['2025-03-01', '2025-03-15', '2025-04-01'], [2.0, 5.0, 5.0]))
+    df = archive.query_archive('2025-03-01', '2025-03-31', mmin=3)
+    assert list(df['event_id']) == ['b']
+    assert archive.query_archive('2025-03-01', '2025-03-31', south=0).empty
+    assert archive.query_archive('2024-01-01', '2024-01-31').empty
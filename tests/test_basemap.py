@@ -0,0 +1,30 @@
+import cartopy
+import pytest
+
+from monev import basemap
+
+
+@pytest.fixture
+def natural_earth(tmp_path, monkeypatch):
+    monkeypatch.setattr(basemap, 'NATURAL_EARTH_DIR', tmp_path)
+    monkeypatch.setitem(cartopy.config, 'pre_existing_data_dir', cartopy.config['pre_existing_data_dir'])
+    return tmp_path
+
+
+def test_missing_shapefiles_raise_with_the_fetch_command(natural_earth):
+    with pytest.raises(FileNotFoundError, match='python -m monev.basemap fetch-ne') as err:
+        basemap.use_offline_natural_earth()
+    assert 'ne_10m_coastline.shp' in str(err.value)
+    assert cartopy.config['pre_existing_data_dir'] != natural_earth
+
+
+def test_present_shapefiles_are_used_in_cartopys_layout(natural_earth):
+    downloader = cartopy.config['downloaders'][('shapefiles', 'natural_earth')]
+    for resolution, category, name in basemap.NATURAL_EARTH:
+        path = downloader.pre_downloaded_path({'config': {'pre_existing_data_dir': natural_earth},
+                                               'resolution': resolution, 'category': category, 'name': name})
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.touch()
+    assert basemap.missing_natural_earth() == []
+    basemap.use_offline_natural_earth()
+    assert cartopy.config['pre_existing_data_dir'] == natural_earth
@@ -0,0 +1,46 @@
+import numpy as np
+import pytest
+from matplotlib.path import Path
+
+from monev.beachball import _fault_vectors, beach_collections, unit_shape
+
+
+def _polarity(strike, dip, rake, points):
+    """(inside compressional, inside dilatational) of unit-disc ``points`` (east, north)."""
+    compressional, dilatational = (Path(v, c) for v, c in unit_shape(strike, dip, rake))
+    return compressional.contains_points(points), dilatational.contains_points(points)
+
+
+@pytest.mark.parametrize('mechanism', [
+    (0, 90, 0), (0, 45, 90), (30, 60, -90), (0, 90, 90), (10, 0, 0), (0, 0, 90),
+    (200, 30, 45), (120, 70, 150), (300, 20, -30), (171, 66, -90),
+])
+def test_quadrants_follow_the_p_wave_polarity(mechanism):
+    grid = np.linspace(-0.95, 0.95, 39)
+    points = np.array([(x, y) for x in grid for y in grid if x * x + y * y < 0.9])
+    # inverse of the equal-area projection: ray (north, east, down)
+    down = 1 - (points ** 2).sum(axis=1)
+    scale = np.sqrt(1 + down)
+    rays = np.column_stack([points[:, 1] * scale, points[:, 0] * scale, down])
+    normal, slip = _fault_vectors(*mechanism)
+    amplitude = (rays @ normal) * (rays @ slip)
+    clear = np.abs(amplitude) > 0.03  # away from the nodal lines
+
+    compressional, dilatational = _polarity(*mechanism, points)
+    assert (compressional == (amplitude > 0))[clear].all()
+    assert (dilatational == (amplitude < 0))[clear].all()
+
+
+def test_thrust_has_a_compressional_centre():
+    compressional, _ = _polarity(90, 30, 90, np.array([[0.0, 0.0], [0.0, 0.9]]))
+    assert list(compressional) == [True, False]
+
+
+def test_one_collection_per_polarity_and_missing_planes_are_skipped():
+    collections = beach_collections([0, 45, np.nan], [90, 30, 10], [0, 90, 0], [0, 10, 20], [0, 0, 0],
+                                    width=2, facecolor=['r', 'y', 'g'])
+    assert len(collections) == 2
+    dilatational, compressional = collections
+    assert len(dilatational.get_paths()) == len(compressional.get_paths()) == 2
+    assert compressional.get_paths()[1].vertices[:, 0].min() >= 9 - 1e-9  # placed at x = 10, radius 1
+    assert beach_collections([np.nan], [0], [0], [0], [0], width=1, facecolor='r') == []
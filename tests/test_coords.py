@@ -0,0 +1,35 @@
+import numpy as np
+import pandas as pd
+
+from monev.coords import coords, parse_coords
+
+
+def test_hemisphere_suffixes_set_the_sign():
+    values = ['3.45 S', '3.45 LS', '128.1 BT', '128.1 BB', '10 N', '-7.5 LU', '5 W']
+    np.testing.assert_allclose(coords(values), [-3.45, -3.45, 128.1, -128.1, 10.0, 7.5, -5.0])
+
+
+def test_comma_decimals_degree_sign_and_plain_numbers():
+    np.testing.assert_allclose(coords(['3,45° LS', '-2.5', ' 7 ', '.5']), [-3.45, -2.5, 7.0, 0.5])
+
+
+def test_numeric_input_is_passed_through():
+    np.testing.assert_allclose(coords(pd.Series([1.5, -2.0])), [1.5, -2.0])
+
+
+def test_direction_column_takes_precedence():
+    values, bad = parse_coords(['3.45', '3.45 LU', '2'], direction=['LS', 'S', 'N'])
+    np.testing.assert_allclose(values, [-3.45, -3.45, 2.0])
+    assert bad == 0
+
+
+def test_malformed_values_are_nan_and_counted_blanks_are_not():
+    values, bad = parse_coords(['abc', '', None, '1.0 X', '2.0'])
+    assert np.isnan(values[:4]).all() and values[4] == 2.0
+    assert bad == 2
+
+
+def test_axis_checks_direction_and_range():
+    values, bad = parse_coords(['10 BT', '95 LU', '45 LS'], axis='lat')
+    assert np.isnan(values[:2]).all() and values[2] == -45.0
+    assert bad == 2
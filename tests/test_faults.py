@@ -0,0 +1,56 @@
+import json
+
+import pytest
+
+from monev import faults
+
+LINES = {'type': 'FeatureCollection', 'features': [
+    {'type': 'Feature', 'properties': {'name': 'Sumatra'},
+     'geometry': {'type': 'LineString', 'coordinates': [[95.0, 5.0], [95.5, 4.5001], [96.0, 4.0], [97.0, 3.0]]}},
+    {'type': 'Feature', 'properties': {}, 'geometry': None},
+]}
+
+
+@pytest.fixture
+def store(tmp_path, monkeypatch):
+    monkeypatch.setattr(faults, 'FAULTS_DIR', tmp_path)
+    monkeypatch.setattr(faults, 'FAULTS_FILE', tmp_path / 'indo_faults_lines.geojson')
+    monkeypatch.setattr(faults, '_failed_at', None)
+    source = {'path': None}
+    monkeypatch.setattr(faults, 'sync_faults', lambda: source['path'])
+    faults.fault_levels.clear()
+    yield source
+    faults.fault_levels.clear()
+
+
+def _publish(source):
+    faults.FAULTS_FILE.write_text(json.dumps(LINES), encoding='utf-8')
+    source['path'] = faults.FAULTS_FILE
+
+
+def test_levels_are_simplified_per_zoom(store):
+    _publish(store)
+    coarse = json.loads(faults.fault_geojson(4))
+    full = json.loads(faults.fault_geojson(12))
+    assert len(coarse['features']) == len(full['features']) == 1
+    assert coarse['features'][0]['geometry']['coordinates'] == [[95.0, 5.0], [97.0, 3.0]]
+    assert len(full['features'][0]['geometry']['coordinates']) == 4
+    assert json.loads(faults.fault_geojson(0)) == coarse
+
+
+def test_a_failed_load_is_not_cached(store, monkeypatch):
+    assert faults.fault_geojson(5) is None
+    _publish(store)
+    assert faults.fault_geojson(5) is None  # within FAULTS_RETRY of the failure
+    monkeypatch.setattr(faults, 'FAULTS_RETRY', 0)
+    assert faults.fault_geojson(5) is not None
+    assert faults._failed_at is None
+
+
+def test_a_broken_file_is_not_cached(store, monkeypatch):
+    monkeypatch.setattr(faults, 'FAULTS_RETRY', 0)
+    faults.FAULTS_FILE.write_text('{"type": "FeatureColl', encoding='utf-8')
+    store['path'] = faults.FAULTS_FILE
+    assert faults.fault_geojson(5) is None
+    _publish(store)
+    assert faults.fault_geojson(5) is not None
@@ -0,0 +1,45 @@
+import numpy as np
+import pandas as pd
+
+from monev.matching import best_match, haversine_km, match_events
+
+
+def _catalog(times, lats, lons, mags, index=None):
+    return pd.DataFrame({'t': pd.to_datetime(times), 'lat': lats, 'lon': lons, 'mag': mags, 'depth': 10.0},
+                        index=index)
+
+
+def test_pairs_are_one_to_one_closest_first():
+    left = _catalog(['2025-01-01 00:00:00', '2025-01-01 00:00:20'], [0, 0], [0, 0], [5, 5], index=['a', 'b'])
+    right = _catalog(['2025-01-01 00:00:15', '2025-01-01 00:00:05'], [0, 0], [0, 0], [5.2, 4.9], index=['x', 'y'])
+    pairs = match_events(left, right, 't', 't', tol_s=30)
+    assert list(pairs['left']) == ['a', 'b']
+    assert list(pairs['right']) == ['y', 'x']
+    np.testing.assert_allclose(pairs['dt_s'], [5.0, -5.0])
+    np.testing.assert_allclose(pairs['dmag'], [-0.1, 0.2])
+
+
+def test_tolerances_exclude_candidates():
+    left = _catalog(['2025-01-01 00:00:00'], [0], [0], [5])
+    right = _catalog(['2025-01-01 00:00:10', '2025-01-01 00:02:00'], [3, 0], [0, 0], [5, 5])
+    assert match_events(left, right, 't', 't', tol_s=60, max_km=100).empty
+    assert len(match_events(left, right, 't', 't', tol_s=60)) == 1
+    assert match_events(left, right, 't', 't', tol_s=5).empty
+
+
+def test_nat_never_matches_and_empty_result_has_columns():
+    left = _catalog([None], [0], [0], [5])
+    right = _catalog(['2025-01-01'], [0], [0], [5])
+    pairs = match_events(left, right, 't', 't')
+    assert pairs.empty and list(pairs.columns) == ['left', 'right', 'dt_s', 'dist_km', 'dmag', 'ddepth']
+
+
+def test_tz_aware_and_naive_utc_times_compare_as_instants():
+    right = _catalog(['2025-07-14 05:35:10'], [0], [0], [5])
+    t_ref = pd.Timestamp('2025-07-14 12:34:56', tz='Asia/Jakarta')
+    row = best_match(right, t_ref, time_column='t')
+    assert row is not None and row['t'] == pd.Timestamp('2025-07-14 05:35:10')
+
+
+def test_haversine_one_degree_on_the_equator():
+    assert abs(haversine_km(0, 0, 0, 1) - 111.19) < 0.01
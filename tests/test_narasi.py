@@ -0,0 +1,113 @@
+import threading
+import time
+
+import pandas as pd
+import pytest
+
+from monev import narasi
+from monev.narasi import PARAM_COLUMNS, html_to_text, parse_narratives
+
+SIMEULUE = ("<p>Hari Jumat, 31 Januari 2025, pukul 18:03:43 WIB wilayah Simeulue diguncang gempa "
+            "tektonik. Hasil analisis BMKG menunjukkan gempa bumi ini memiliki parameter update dengan "
+            "magnitudo M6,0. Episenter gempa bumi terletak pada koordinat <strong>3,16° LU ; 96,96° BT"
+            "</strong>, atau tepatnya berlokasi di laut pada jarak 60 km arah Barat Daya Sinabang, "
+            "pada kedalaman 29 km.</p><p>Gempa bumi ini dirasakan di daerah Simeulue III - IV MMI.</p>"
+            "<p>Hasil pemodelan menunjukkan bahwa gempa bumi ini <strong>TIDAK BERPOTENSI TSUNAMI"
+            "</strong>.</p>")
+SELATAN_JAWA = ("<p>Gempa bumi ini memiliki magnitudo M 5,2 dengan episenter pada koordinat "
+                "8,72° LS dan 110,36° BT, pada kedalaman 22 km.</p>"
+                "<p>Gempa bumi ini berpotensi tsunami.</p>")
+
+
+@pytest.fixture(autouse=True)
+def store(monkeypatch, tmp_path):
+    monkeypatch.setattr(narasi, 'NARASI_DB', tmp_path / 'narasi.sqlite')
+    monkeypatch.setattr(narasi, '_parsed', type(narasi._parsed)())
+
+
+def test_fetch_downloads_only_what_is_not_stored(monkeypatch):
+    requested = []
+
+    def fake_get(session, key):
+        requested.append(key)
+        return None if key == '20250101000000' else f'<p>{key}</p>'
+
+    monkeypatch.setattr(narasi, '_get', fake_get)
+    keys = ['20250131180343', '20250101000000', '20250131180343', None]
+    assert narasi.fetch_narratives(keys) == {'20250131180343': '<p>20250131180343</p>'}
+    assert sorted(requested) == ['20250101000000', '20250131180343']
+
+    requested.clear()
+    narasi.fetch_narratives(keys)
+    assert requested == ['20250101000000']  # unpublished ones are retried
+
+    df = narasi.narasi_archive('2025-01-31', '2025-02-01')
+    assert list(df['time_narasi']) == ['20250131180343']
+    assert df['timesent'].iloc[0] == pd.Timestamp('2025-01-31 18:03:43', tz=narasi.WIB)
+
+
+def test_requests_in_flight_are_bounded(monkeypatch):
+    monkeypatch.setattr(narasi, 'NARASI_CONCURRENCY', 3)
+    lock, state = threading.Lock(), {'now': 0, 'max': 0}
+
+    def fake_get(session, key):
+        with lock:
+            state['now'] += 1
+            state['max'] = max(state['max'], state['now'])
+        time.sleep(0.02)
+        with lock:
+            state['now'] -= 1
+        return key
+
+    monkeypatch.setattr(narasi, '_get', fake_get)
+    keys = [f'202501311803{i:02d}' for i in range(12)]
+    assert narasi.fetch_narratives(keys) == {k: k for k in keys}
+    assert state['max'] == 3
+
+
+def test_archive_bounds_accept_tz_aware_times(monkeypatch):
+    monkeypatch.setattr(narasi, '_get', lambda session, key: key)
+    narasi.fetch_narratives(['20250131180343', '20250131190000'])
+    df = narasi.narasi_archive(pd.Timestamp('2025-01-31 11:00', tz='UTC'), pd.Timestamp('2025-01-31 11:30', tz='UTC'))
+    assert list(df['time_narasi']) == ['20250131180343']
+
+
+def test_parameters_of_a_narrative():
+    row = parse_narratives(pd.Series([SIMEULUE])).iloc[0]
+    assert (row['lat'], row['lon'], row['depth'], row['mag']) == (3.16, 96.96, 29.0, 6.0)
+    assert (row['mmi'], row['tsunami'], row['parsed']) == ('III-IV', 'Tidak berpotensi', True)
+    assert '<' not in row['narasi_text']
+
+
+def test_southern_latitude_and_tsunami_potential():
+    row = parse_narratives(pd.Series([SELATAN_JAWA])).iloc[0]
+    assert (row['lat'], row['lon'], row['mag']) == (-8.72, 110.36, 5.2)
+    assert row['tsunami'] == 'Berpotensi' and row['parsed']
+
+
+def test_missing_or_unparseable_narratives_are_flagged():
+    df = parse_narratives(pd.Series([None, '<p>Informasi gempa belum tersedia.</p>', SIMEULUE], index=[5, 6, 7]))
+    assert list(df.columns) == ['narasi_text'] + PARAM_COLUMNS
+    assert list(df.index) == [5, 6, 7]
+    assert list(df['parsed']) == [False, False, True]
+    assert pd.isna(df.loc[5, 'narasi_text']) and df.loc[6, 'narasi_text'] == 'Informasi gempa belum tersedia.'
+    assert df[['lat', 'lon', 'depth', 'mag']].iloc[:2].isna().all().all()
+
+
+def test_cached_results_match_fresh_ones():
+    series = pd.Series([SIMEULUE, SELATAN_JAWA, SIMEULUE])
+    first = parse_narratives(series)
+    assert len(narasi._parsed) == 2
+    pd.testing.assert_frame_equal(parse_narratives(series), first)
+
+
+def test_html_to_text_keeps_missing_values():
+    text = html_to_text(pd.Series(['<p>a &amp; b</p><p>c</p>', None]))
+    assert list(text) == ['a & b\nc', None]
+
+
+def test_parse_cache_is_bounded(monkeypatch):
+    monkeypatch.setattr(narasi, 'PARSE_CACHE_SIZE', 2)
+    parse_narratives(pd.Series([SIMEULUE, SELATAN_JAWA, SIMEULUE.replace('M6,0', 'M6,1')]))
+    assert len(narasi._parsed) == 2
+    assert parse_narratives(pd.Series([SIMEULUE]))['mag'].iloc[0] == 6.0
@@ -0,0 +1,41 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from monev.ndk import parse_ndk
+
+EVENT = [
+    "PDE  2005/01/01 01:20:05.4  13.78  -88.78 193.1 5.0 0.0 EL SALVADOR".ljust(80),
+    "C200501010120A   B:  4    4  40 S: 27   33  50 M:  0    0   0 CMT: 1 TRIHD:  0.6",
+    "CENTROID:     -0.3 0.9  13.76 0.06  -89.08 0.09 162.8 12.5 FREE S-20050322125201",
+    "23  0.838 0.201 -0.005 0.231 -0.833 0.270  1.050 0.121 -0.369 0.161  0.044 0.240",
+    "V10   1.581 56  12  -0.537 23 140  -1.044 24 241   1.312   9 29  142 133 72   66",
+]
+
+
+def test_fields_of_one_event():
+    row = parse_ndk("\n".join(EVENT) + "\n").iloc[0]
+    assert row['Datetime'] == pd.Timestamp('2005-01-01 01:20:05.4')
+    assert (row['Lat'], row['Lon'], row['Depth'], row['Mag_mb']) == (13.78, -88.78, 193.1, 5.0)
+    assert (row['Catalog'], row['Region'], row['Event'], row['DepthType']) == \
+        ('PDE', 'EL SALVADOR', 'C200501010120A', 'FREE')
+    assert row['CentroidTime'] == pd.Timestamp('2005-01-01 01:20:05.1')
+    assert (row['CentroidLat'], row['CentroidLon'], row['CentroidDepth']) == (13.76, -89.08, 162.8)
+    assert [row[c] for c in ('Mrr', 'Mtt', 'Mpp', 'Mrt', 'Mrp', 'Mtp')] == [0.838, -0.005, -0.833, 1.05, -0.369, 0.044]
+    assert [row[c] for c in ('S1', 'D1', 'R1', 'S2', 'D2', 'R2')] == [9, 29, 142, 133, 72, 66]
+    assert row['M0'] == pytest.approx(1.312e23)
+    assert row['Mw'] == pytest.approx(2 / 3 * (np.log10(1.312e23) - 16.1))
+
+
+def test_ragged_lines_parse_like_fixed_width():
+    fixed = parse_ndk("\n".join(EVENT * 3) + "\n")
+    ragged = parse_ndk("\n\n".join(line.rstrip() for line in EVENT * 3) + "\n")
+    assert len(fixed) == 3
+    pd.testing.assert_frame_equal(fixed, ragged)
+
+
+def test_blank_numeric_field_becomes_nan():
+    event = list(EVENT)
+    event[0] = event[0][:48] + "   " + event[0][51:]  # no mb
+    df = parse_ndk("\n".join(event + EVENT) + "\n")
+    assert np.isnan(df['Mag_mb'].iloc[0]) and df['Mag_mb'].iloc[1] == 5.0
@@ -0,0 +1,53 @@
+import pandas as pd
+import pytest
+
+from monev import rtsp
+
+
+def _page(*times):
+    cells = ''.join(
+        f'<td class="txt11pxarialb"><div>{t[:10]}</div><div>{t[11:]}</div><div>5.1</div><div>10</div>'
+        '<div>3.45 LS</div><div>128.10 BT</div><div>auto</div><div>1</div><div>A</div></td>'
+        for t in times)
+    return f'<html><body><table><tr>{cells}</tr></table></body></html>'
+
+
+@pytest.fixture
+def pages(monkeypatch):
+    served = {}
+    requested = []
+
+    def fake_fetch(page):
+        requested.append(page)
+        return served.get(page)
+
+    monkeypatch.setattr(rtsp, '_fetch', fake_fetch)
+    return served, requested
+
+
+def test_paging_stops_at_the_start_date(pages):
+    served, requested = pages
+    for page in range(1, 7):
+        served[page] = _page(f'2025-01-{20 - page:02d} 10:00:00')
+    df = rtsp.fetch_bulletins(since=pd.Timestamp('2025-01-16'), workers=2)
+    assert sorted(requested) == [1, 2, 3, 4, 5, 6]
+    assert len(df) == 6 and list(df.columns) == rtsp.RTSP_COLUMNS
+    assert df['lat'].iloc[0] == -3.45
+
+    requested.clear()
+    rtsp.fetch_bulletins(since=pd.Timestamp('2025-01-18 12:00'), workers=2)
+    assert sorted(requested) == [1, 2]
+
+
+def test_a_failed_page_keeps_the_others_and_stops_paging(pages):
+    served, requested = pages
+    served.update({1: _page('2025-01-19 10:00:00'), 3: _page('2025-01-17 10:00:00'),
+                   4: _page('2025-01-16 10:00:00')})
+    df = rtsp.fetch_bulletins(since=pd.Timestamp('2025-01-01'), workers=2)
+    assert sorted(requested) == [1, 2]
+    assert list(df['date_time']) == ['2025-01-19 10:00:00']
+
+
+def test_nothing_fetched_gives_an_empty_frame(pages):
+    df = rtsp.fetch_bulletins()
+    assert df.empty and list(df.columns) == rtsp.RTSP_COLUMNS
@@ -0,0 +1,68 @@
+import pandas as pd
+import pytest
+
+from monev import seiscomp
+
+GOOD = "2025-01-31 11:05:12|1.48|origin\n2025-01-31 11:06:00|2.28|magnitude\n"
+
+
+@pytest.fixture
+def server(tmp_path, monkeypatch):
+    monkeypatch.setattr(seiscomp, 'HISTORY_DIR', tmp_path)
+    served, requested = {}, []
+
+    def fake_download(event_id):
+        requested.append(event_id)
+        if event_id not in served:
+            raise OSError("404")
+        return served[event_id]
+
+    monkeypatch.setattr(seiscomp, '_download', fake_download)
+    return served, requested
+
+
+def _events(*ids, age=pd.Timedelta(days=30)):
+    t = pd.Timestamp.now('UTC').tz_localize(None) - age
+    return pd.DataFrame({'event_id': list(ids), 'date_time': t})
+
+
+def test_final_histories_are_downloaded_once(server, tmp_path):
+    served, requested = server
+    served['bmg2025cdqz'] = GOOD
+    out = seiscomp.load_history(_events('bmg2025cdqz'))
+    assert out['time_process (minutes)'].iloc[0] == 1.48
+    assert out['tstamp_process'].iloc[0] == pd.Timestamp('2025-01-31 11:05:12')
+    assert out['error'].isna().all()
+    seiscomp.load_history(_events('bmg2025cdqz'))
+    assert requested == ['bmg2025cdqz']
+    assert (tmp_path / 'bmg2025cdqz.txt').read_text() == GOOD
+
+
+def test_recent_histories_are_not_stored(server, tmp_path):
+    served, requested = server
+    served['bmg2025cdqz'] = GOOD
+    seiscomp.load_history(_events('bmg2025cdqz', age=pd.Timedelta(hours=1)))
+    assert not (tmp_path / 'bmg2025cdqz.txt').exists()
+
+
+def test_unparseable_history_is_not_stored_and_is_fetched_again(server, tmp_path):
+    served, requested = server
+    served['bmg2025cdqz'] = "<html>error</html>"
+    out = seiscomp.load_history(_events('bmg2025cdqz', '../etc', 'bmg2025none'))
+    assert list(out['error']) == ["no 'timestamp|elapse' row in history file", "invalid event_id",
+                                  "download failed: 404"]
+    assert out['time_process (minutes)'].isna().all()
+    assert not list(tmp_path.iterdir())
+
+    served['bmg2025cdqz'] = GOOD
+    out = seiscomp.load_history(_events('bmg2025cdqz'))
+    assert out['time_process (minutes)'].iloc[0] == 1.48
+    assert requested.count('bmg2025cdqz') == 2
+
+
+def test_bad_copy_on_disk_is_dropped(server, tmp_path):
+    served, requested = server
+    (tmp_path / 'bmg2025cdqz.txt').write_text("truncated")
+    assert seiscomp.load_history(_events('bmg2025cdqz'))['error'].notna().all()
+    served['bmg2025cdqz'] = GOOD
+    assert seiscomp.load_history(_events('bmg2025cdqz'))['error'].isna().all()
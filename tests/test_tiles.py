@@ -0,0 +1,60 @@
+import os
+
+import pytest
+
+from monev import tiles
+
+
+class _Response:
+    def __init__(self, content):
+        self.content = content
+
+    def raise_for_status(self):
+        pass
+
+
+@pytest.fixture
+def store(tmp_path, monkeypatch):
+    monkeypatch.setattr(tiles, 'TILE_DIR', tmp_path)
+    monkeypatch.setattr(tiles, '_usage', None)
+    fetched = []
+
+    def fake_get(url, timeout):
+        fetched.append(url)
+        return _Response(b'x' * 100)
+
+    monkeypatch.setattr(tiles.requests, 'get', fake_get)
+    return fetched
+
+
+def test_tiles_are_fetched_once_and_counted_once(store):
+    assert tiles.get_tile(5, 1, 2) == b'x' * 100
+    assert tiles._usage == 100
+    assert tiles.get_tile(5, 1, 2) == b'x' * 100
+    tiles.get_tile(5, 1, 3)
+    assert len(store) == 2
+    assert tiles._usage == 200
+
+
+def test_usage_is_primed_from_disk(store, tmp_path):
+    (tmp_path / '4' / '0').mkdir(parents=True)
+    (tmp_path / '4' / '0' / '0.png').write_bytes(b'y' * 50)
+    tiles.get_tile(5, 1, 2)
+    assert tiles._usage == 150
+
+
+def test_least_recently_used_tiles_are_evicted(store, tmp_path, monkeypatch):
+    monkeypatch.setattr(tiles, 'TILE_CAP_BYTES', 250)
+    for y in range(3):
+        tiles.get_tile(5, 1, y)
+        os.utime(tiles._path(5, 1, y), (y, y))
+    tiles.get_tile(5, 1, 9)
+    assert not tiles._path(5, 1, 0).exists() and not tiles._path(5, 1, 1).exists()
+    assert tiles._path(5, 1, 9).exists()
+    assert tiles._usage == 200
+
+
+def test_tiles_in_bbox_covers_the_seed_area():
+    assert tiles.tiles_in_bbox(*tiles.SEED_BBOX, 0) == [(0, 0, 0)]
+    found = tiles.tiles_in_bbox(*tiles.SEED_BBOX, 3)
+    assert {x for _, x, _ in found} == {6, 7} and {y for _, _, y in found} == {3, 4}
@@ -0,0 +1,34 @@
+import pandas as pd
+
+from monev.timeparse import WIB, combine_date_time, parse_times
+
+
+def test_zone_suffix_and_default_zone():
+    out = parse_times(['14/07/2025 12:34:56 WIB', '2025-07-14 05:34:56 UTC', '14-07-25 12:34:56'])
+    assert str(out.dt.tz) == 'UTC'
+    assert (out == pd.Timestamp('2025-07-14 05:34:56', tz='UTC')).all()
+
+
+def test_default_tz_and_target_tz():
+    out = parse_times(['2025-07-14 05:34:56'], default_tz='UTC', tz=WIB)
+    assert out.iloc[0] == pd.Timestamp('2025-07-14 12:34:56', tz=WIB)
+
+
+def test_fractional_seconds_fall_back_per_element():
+    out = parse_times(['2025-07-14 05:34:56.250'], default_tz='UTC')
+    assert out.iloc[0] == pd.Timestamp('2025-07-14 05:34:56.250', tz='UTC')
+
+
+def test_impossible_dates_and_garbage_become_nat():
+    out = parse_times(['31/02/2025 10:00:00', 'not a time', None, ''])
+    assert out.isna().all()
+
+
+def test_day_first_formats_are_not_confused_with_month_first():
+    out = parse_times(['03/04/2025 00:00:00 UTC'])
+    assert out.iloc[0] == pd.Timestamp('2025-04-03', tz='UTC')
+
+
+def test_combine_date_time():
+    out = combine_date_time(['14-07-25', '01-01-25'], ['12:34:56 WIB', '07:00:00 WIB'], tz=WIB)
+    assert list(out) == [pd.Timestamp('2025-07-14 12:34:56', tz=WIB), pd.Timestamp('2025-01-01 07:00:00', tz=WIB)]
@@ -0,0 +1,125 @@
+from contextlib import closing
+
+import pandas as pd
+import pytest
+
+from monev import toast
+
+CREATED = ("2025/01/31 18:04:56.093521 [Incident:Info:toast@toast-new:Incident created] Incident created "
+           "based on event received from messaging: OT: 2025-01-31 11:03:43,  Lat/Lon: 3.16°/96.96°, "
+           "Depth: 28.95, Mag: 6.13 (M)\n")
+SIMULATION = ("2025/01/31 18:04:56.094508 [Simulation:Info:toast@toast-new:Simulation not generated] "
+              "Magnitude 6.13 of event bmg2025cdqz is smaller than triggerMinMagnitude: no automatic simulation\n")
+ORIGIN = ("2025/01/31 18:05:10.110886 [Incident:Info:toast@toast-new:Origin updated] Origin updated: "
+          "OT: 2025-01-31 11:03:44,  Lat/Lon: 3.16369°/96.9636°, Depth: 28.9476\n")
+MAGNITUDE = ("2025/01/31 18:07:43.500000 [Incident:Info:toast@toast-new:Magnitude updated] "
+             "Magnitude updated: 6.04 (M)\n")
+
+
+def _write(root, name, *lines, mode='w'):
+    with open(root / name, mode, encoding='utf-8') as f:
+        f.writelines(lines)
+
+
+@pytest.fixture
+def logs(tmp_path, monkeypatch):
+    monkeypatch.setattr(toast, 'TOAST_DIR', tmp_path / 'logs')
+    monkeypatch.setattr(toast, 'TOAST_INDEX', tmp_path / 'index.sqlite')
+    toast.query_toast.clear()
+    (tmp_path / 'logs' / '2025').mkdir(parents=True)
+    return tmp_path / 'logs'
+
+
+def test_index_is_refreshed_incrementally(logs):
+    _write(logs, 'bmg2025cdqz.log', CREATED, ORIGIN)
+    _write(logs / '2025', 'bmg2025cery.log', SIMULATION.replace('18:04', '19:00'), CREATED)
+    assert toast.refresh_index() == 2
+    assert toast.refresh_index() == 0
+
+    _write(logs, 'bmg2025cdqz.log', MAGNITUDE, mode='a')
+    assert toast.refresh_index() == 1
+    (logs / '2025' / 'bmg2025cery.log').unlink()
+    assert toast.refresh_index() == 0
+    with closing(toast._connect()) as con:
+        assert con.execute("SELECT path FROM logs").fetchall() == [('bmg2025cdqz.log',)]
+
+
+def test_query_toast_returns_the_first_incident_in_utc(logs):
+    _write(logs, 'bmg2025cdqz.log', CREATED, ORIGIN)
+    _write(logs / '2025', 'bmg2025cery.log', CREATED.replace('2025/01/31', '2025/03/01'))
+    df = toast.query_toast(pd.Timestamp('2025-01-31'), pd.Timestamp('2025-02-01'))
+    assert list(df['event_id']) == ['bmg2025cdqz']
+    assert df['tstamp_toast'].iloc[0] == pd.Timestamp('2025-01-31 11:04:56.093521')  # log is WIB
+    assert df['remark_toast'].iloc[0] == '[Incident:Info:toast@toast-new:Incident'
+
+
+def test_timeline_metrics_of_one_event(logs):
+    _write(logs, 'bmg2025cdqz.log', CREATED, SIMULATION, ORIGIN, MAGNITUDE)
+    timeline = toast.build_timeline([logs / 'bmg2025cdqz.log'])
+    assert list(timeline.columns) == toast.TIMELINE_COLUMNS and len(timeline) == 4
+    assert timeline['tstamp'].iloc[0] == pd.Timestamp('2025-01-31 11:04:56.093521')
+    assert timeline['mag'].iloc[[0, 3]].tolist() == [6.13, 6.04] and timeline['mag'].iloc[1:3].isna().all()
+    assert (timeline['lat'].iloc[2], timeline['depth'].iloc[2]) == (3.16369, 28.9476)
+
+    row = toast.timeline_metrics(timeline).iloc[0]
+    assert row['ot'] == pd.Timestamp('2025-01-31 11:03:43')
+    assert (row['mag_final'], row['n_origin_updates'], row['n_magnitude_updates']) == (6.04, 1, 1)
+    assert row['first_origin'] == pd.Timestamp('2025-01-31 11:05:10.110886')
+    assert row['final_magnitude'] == pd.Timestamp('2025-01-31 11:07:43.5')
+    assert row['lapse_incident_created'] == pytest.approx(73.093521 / 60)
+    assert row['lapse_final_magnitude'] == pytest.approx(240.5 / 60)
+
+
+def test_empty_logs_give_an_empty_timeline(logs):
+    _write(logs, 'bmg2025cdqz.log')
+    timeline = toast.build_timeline([logs / 'bmg2025cdqz.log'])
+    assert timeline.empty and list(timeline.columns) == toast.TIMELINE_COLUMNS
+    assert toast.timeline_metrics(timeline).empty
+
+
+def test_query_toast_metrics_selects_logs_by_first_incident(logs):
+    toast.query_toast_metrics.clear()
+    _write(logs, 'bmg2025cdqz.log', CREATED, ORIGIN)
+    _write(logs / '2025', 'bmg2025cery.log', CREATED.replace('2025/01/31', '2025/03/01'))
+    df = toast.query_toast_metrics(pd.Timestamp('2025-01-31'), pd.Timestamp('2025-02-01'))
+    assert list(df['event_id']) == ['bmg2025cdqz'] and df['n_origin_updates'].iloc[0] == 1
+
+
+def test_unparseable_logs_are_recorded_until_fixed(logs):
+    _write(logs, 'bmg2025cdqz.log', CREATED, ORIGIN)
+    _write(logs, 'bmg2025cery.log')  # created, nothing written yet
+    _write(logs, 'bmg2025cjyj.log', 'Info\n')
+    assert toast.refresh_index() == 3
+    errors = toast.index_errors()
+    assert list(errors['event_id']) == ['bmg2025cery', 'bmg2025cjyj']
+    assert errors['error'].iloc[0] == 'tidak ada baris incident'
+    assert errors['error'].iloc[1].startswith('baris incident tidak lengkap')
+
+    _write(logs, 'bmg2025cery.log', CREATED, mode='a')
+    assert toast.refresh_index() == 1
+    assert list(toast.index_errors()['event_id']) == ['bmg2025cjyj']
+    (logs / 'bmg2025cjyj.log').unlink()
+    toast.refresh_index()
+    assert toast.index_errors().empty
+
+
+def test_pool_scan_matches_the_inline_scan(logs, monkeypatch):
+    for i in range(12):
+        _write(logs, f'bmg2025x{i:03d}.log', CREATED.replace('18:04:56', f'18:{i:02d}:00') if i % 5 else '')
+    paths = sorted(toast.list_logs(str(logs)))
+    inline, _ = toast.scan_logs(str(logs), paths)
+
+    monkeypatch.setattr(toast, 'SCAN_WORKERS', 2)
+    monkeypatch.setattr(toast, 'SCAN_INLINE', 1)
+    monkeypatch.setattr(toast, 'SCAN_CHUNK', 5)
+    monkeypatch.setattr(toast, '_pool', None)
+    try:
+        pooled, unreadable = toast.scan_logs(str(logs), paths)
+        assert toast._pool is not None  # did not fall back to reading in-process
+    finally:
+        if toast._pool is not None:
+            toast._pool.shutdown()
+    assert unreadable == []
+    for col in inline:
+        assert pooled[col].tolist() == inline[col].tolist(), col
+    assert sum(bool(e) for e in pooled['error']) == 3
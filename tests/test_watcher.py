@@ -0,0 +1,72 @@
+import time
+
+import pandas as pd
+
+from monev.toast import build_timeline, timeline_metrics
+from monev.watcher import ToastWatcher
+
+CREATED = ("2025/01/31 18:04:56.093521 [Incident:Info:toast@toast-new:Incident created] Incident created "
+           "based on event received from messaging: OT: 2025-01-31 11:03:43,  Lat/Lon: 3.16°/96.96°, "
+           "Depth: 28.95, Mag: 6.13 (M)\n")
+SIMULATION = ("2025/01/31 18:04:56.094508 [Simulation:Info:toast@toast-new:Simulation not generated] "
+              "Magnitude 6.13 of event bmg2025cdqz is smaller than triggerMinMagnitude: no automatic simulation\n")
+ORIGIN = ("2025/01/31 18:05:10.110886 [Incident:Info:toast@toast-new:Origin updated] Origin updated: "
+          "OT: 2025-01-31 11:03:44,  Lat/Lon: 3.16369°/96.9636°, Depth: 28.9476\n")
+MAGNITUDE = ("2025/01/31 18:07:43.500000 [Incident:Info:toast@toast-new:Magnitude updated] "
+             "Magnitude updated: 6.04 (M)\n")
+
+
+def _write(root, name, *lines, mode='w'):
+    with open(root / name, mode, encoding='utf-8') as f:
+        f.writelines(lines)
+
+
+def _assert_matches_batch(watcher, root):
+    expected = timeline_metrics(build_timeline(sorted(root.glob('*.log'))))
+    live = watcher.table().drop(columns='last_line')[list(expected.columns)]
+    pd.testing.assert_frame_equal(live.set_index('event_id').sort_index(),
+                                  expected.set_index('event_id').sort_index(), check_dtype=False)
+
+
+def test_watcher_matches_the_batch_metrics_while_logs_grow(tmp_path):
+    _write(tmp_path, 'bmg2025cdqz.log', CREATED, SIMULATION)
+    _write(tmp_path, 'bmg2025cery.log', CREATED.replace('11:03:43', '12:00:00'))
+    watcher = ToastWatcher(tmp_path)
+    assert watcher.poll() == 3
+    _assert_matches_batch(watcher, tmp_path)
+    assert watcher.poll() == 0
+
+    _write(tmp_path, 'bmg2025cdqz.log', ORIGIN, MAGNITUDE[:40], mode='a')  # last line still being written
+    assert watcher.poll() == 1
+    _write(tmp_path, 'bmg2025cdqz.log', MAGNITUDE[40:], mode='a')
+    assert watcher.poll() == 1
+    _assert_matches_batch(watcher, tmp_path)
+    assert watcher.table()['last_line'].max() == pd.Timestamp('2025-01-31 11:07:43.5')
+
+    (tmp_path / 'bmg2025cery.log').unlink()
+    watcher.poll()
+    assert list(watcher.table()['event_id']) == ['bmg2025cdqz']
+
+
+def test_watcher_restarts_a_truncated_log(tmp_path):
+    _write(tmp_path, 'bmg2025cdqz.log', CREATED, SIMULATION, ORIGIN, MAGNITUDE)
+    watcher = ToastWatcher(tmp_path)
+    watcher.poll()
+    _write(tmp_path, 'bmg2025cdqz.log', CREATED)
+    watcher.poll()
+    assert watcher.table()['n_origin_updates'].iloc[0] == 0
+    _assert_matches_batch(watcher, tmp_path)
+
+
+def test_background_thread_picks_up_new_logs(tmp_path):
+    watcher = ToastWatcher(tmp_path, interval=0.05)
+    watcher.start()
+    try:
+        version = watcher.version
+        _write(tmp_path, 'bmg2025cdqz.log', CREATED)
+        deadline = time.monotonic() + 5
+        while watcher.version == version and time.monotonic() < deadline:
+            time.sleep(0.05)
+    finally:
+        watcher.stop()
+    assert list(watcher.table()['event_id']) == ['bmg2025cdqz']